@@ -0,0 +1,63 @@
+import numpy as np
+from typing import List, Optional
+from model.Coordinates import Coordinates
+from model.DinnerInstance import DinnerInstance
+from model.Group import Group
+from model.Location import Location
+from model.TravelTimeProvider import HaversineTravelTimeProvider, TravelTimeProvider
+from model.TravelTimes import TravelTimes
+
+
+def synthetic_instance(num_groups: int,
+                       num_events: int = 3,
+                       after_party: bool = True,
+                       seed: int = 0,
+                       center: Coordinates = Coordinates(52.02, 8.53),
+                       radius: float = 0.03,
+                       provider: Optional[TravelTimeProvider] = None) -> DinnerInstance:
+    """
+    Generates a synthetic instance without any geocoding or travel time requests.
+
+    The groups live at uniformly random coordinates around a center and the
+    hosts are spread evenly across the main events. The travel time matrix is
+    estimated offline and injected with ``TravelTimes.from_matrix``.
+
+    Args:
+        num_groups (int): The number of groups.
+        num_events (int): The number of main events. Default is 3.
+        after_party (bool): Whether there is an after party at the center. Default is True.
+        seed (int): The seed of the random coordinates. Default is 0.
+        center (Coordinates): The center of the city. Default is Bielefeld.
+        radius (float): The maximum deviation of the coordinates from the center in degrees.
+            Default is 0.03.
+        provider (Optional[TravelTimeProvider]): The offline source of the travel times.
+            Defaults to a walking HaversineTravelTimeProvider.
+
+    Returns:
+        DinnerInstance: The generated instance.
+
+    Raises:
+        ValueError: If there are fewer groups than main events.
+    """
+    if num_groups < num_events:
+        raise ValueError(f"Expected at least one group per main event, got {num_groups} groups for {num_events} events.")
+    random = np.random.default_rng(seed)
+    lat = center.lat + random.uniform(-radius, radius, num_groups)
+    lon = center.lon + random.uniform(-radius, radius, num_groups)
+    host_events = random.permutation(np.arange(num_groups) % num_events + 1)
+    groups = [Group(f"Group {g + 1}", Location(Coordinates(float(lat[g]), float(lon[g]))), int(host_events[g]))
+              for g in range(num_groups)]
+    party = Location(center) if after_party else None
+
+    locations: List[Location] = list(dict.fromkeys(group.location for group in groups))
+    if party is not None and party not in locations:
+        locations.append(party)
+    matrix = np.full((len(locations), len(locations)), np.nan, dtype=np.float32)
+    provider = provider if provider is not None else HaversineTravelTimeProvider()
+    provider.fill(matrix, [location.coordinates for location in locations])
+
+    events = ["Home"] + [f"Course {e}" for e in range(1, num_events + 1)] + ["Party"]
+    travel_times = TravelTimes.from_matrix(locations, matrix, provider.transport_mode, provider.measurement)
+    # the provider fetches the profiles of other transport modes, if groups use them
+    travel_times.provider = provider
+    return DinnerInstance.from_data(events, groups, travel_times, party)
@@ -0,0 +1,155 @@
+"""
+Benchmarks the solver pipeline on synthetic instances.
+
+Every combination of group count, event count, after party and backend is
+run in a fresh process, so that the peak memory of each run is measured on
+its own. The results are appended to a JSON Lines file together with the
+commit and platform, e.g. to compare versions::
+
+    python -m benchmarks.run --groups 10 20 40 --backends highs pulp heuristic --time-limit 60
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import product
+from multiprocessing import get_context
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+try:
+    from resource import getrusage, RUSAGE_CHILDREN, RUSAGE_SELF
+except ImportError:
+    getrusage = None
+
+BACKENDS = ("highs", "pulp", "full", "heuristic")
+
+
+def _peak_memory(children: bool = False) -> Optional[float]:
+    """
+    Returns the peak resident memory of this process or of its largest terminated child
+    process, e.g. the CBC process of the PuLP backend, in MB, None if unknown.
+    """
+    if getrusage is None:
+        return None
+    peak = getrusage(RUSAGE_CHILDREN if children else RUSAGE_SELF).ru_maxrss
+    return round(peak / 2**20 if sys.platform == "darwin" else peak / 2**10, 1)
+
+
+def run_benchmark(num_groups: int,
+                  num_events: int,
+                  after_party: bool,
+                  seed: int,
+                  backend: str,
+                  time_limit: Optional[float],
+                  penalties: List[float]) -> Dict[str, Any]:
+    """
+    Generates an instance and solves it once with a backend.
+
+    Args:
+        num_groups (int): The number of groups.
+        num_events (int): The number of main events.
+        after_party (bool): Whether there is an after party.
+        seed (int): The seed of the instance.
+        backend (str): One of "highs" and "pulp" for the compact formulation, "full" for
+            the full formulation solved through PuLP or "heuristic".
+        time_limit (Optional[float]): The time limit of the solver in seconds.
+        penalties (List[float]): The three penalties of the objective.
+
+    Returns:
+        Dict[str, Any]: The measurements of the run.
+    """
+    from benchmarks.instances import synthetic_instance
+    from model.DinnerModel import DinnerModel
+    from model.HeuristicSolver import HeuristicSolver
+    from model.HighsSolver import HighsSolver
+
+    start = perf_counter()
+    instance = synthetic_instance(num_groups, num_events, after_party, seed)
+    result = {"groups": num_groups, "events": num_events, "after_party": after_party, "seed": seed,
+              "backend": backend, "time_limit": time_limit, "generate_time": perf_counter() - start,
+              "baseline_memory_mb": _peak_memory()}
+
+    if backend == "heuristic":
+        start = perf_counter()
+        heuristic = HeuristicSolver(instance, *penalties, seed=seed)
+        heuristic.solve(time_limit if time_limit is not None else 10.0)
+        result.update(status="Feasible", objective=heuristic.objective, solver="heuristic",
+                      solve_time=perf_counter() - start)
+    else:
+        model = DinnerModel(instance, "full" if backend == "full" else "compact")
+        model.set_objective(*penalties)
+        if backend == "highs":
+            solver = HighsSolver(time_limit=time_limit)
+        else:
+            solver = DinnerModel.get_solver(None, **({"timeLimit": time_limit} if time_limit is not None else {}))
+        model.solve(solver)
+        model.extract_solution()
+        stats = model.stats
+        result.update(status=stats.status, objective=model.objective, bound=stats.bound, gap=stats.gap,
+                      solver=solver.name,
+                      variables=stats.num_variables, constraints=stats.num_constraints,
+                      nonzeros=stats.num_nonzeros,
+                      build_time=stats.timings["variables"] + stats.timings["constraints"],
+                      **{f"{phase}_time": stats.timings[phase] for phase in stats.PHASES})
+    # the solver of the PuLP backend runs in a child process, so the peak is the larger one
+    process_memory, solver_memory = _peak_memory(), _peak_memory(children=True)
+    result.update(process_memory_mb=process_memory, solver_process_memory_mb=solver_memory,
+                  peak_memory_mb=max(process_memory, solver_memory) if process_memory is not None else None)
+    return result
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(arguments: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description="Benchmark the solver pipeline on synthetic instances.")
+    parser.add_argument("--groups", type=int, nargs="+", default=[12, 24, 48], help="group counts")
+    parser.add_argument("--events", type=int, nargs="+", default=[3], help="main event counts")
+    parser.add_argument("--party", choices=("on", "off", "both"), default="on", help="after party")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0], help="instance seeds")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=["highs", "heuristic"], help="backends")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="time limit per run in seconds")
+    parser.add_argument("--penalties", type=float, nargs=3, default=[600, 600, 600],
+                        help="penalties for too few guests, too many guests and multiple encounters")
+    parser.add_argument("--output", default="benchmark-results.jsonl", help="JSON Lines file to append to")
+    args = parser.parse_args(arguments)
+
+    parties = {"on": [True], "off": [False], "both": [True, False]}[args.party]
+    metadata = {"commit": _commit(), "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(), "platform": platform.platform()}
+    results = list()
+    for num_groups, num_events, after_party, seed in product(args.groups, args.events, parties, args.seeds):
+        runs = list()
+        for backend in args.backends:
+            # a fresh process per run, so that the peak memory is not inherited from earlier runs
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                result = executor.submit(run_benchmark, num_groups, num_events, after_party, seed, backend,
+                                         args.time_limit, args.penalties).result()
+            runs.append(result)
+            print(f"{num_groups:>5} groups, {num_events} events, party {'on' if after_party else 'off'}, "
+                  f"{backend:<9}: {result['status']:<10} objective {result['objective']}, "
+                  f"solve {result['solve_time']:.2f}s, peak {result['peak_memory_mb']} MB", flush=True)
+        objectives = [run["objective"] for run in runs if run["objective"] is not None]
+        for run in runs:
+            best = min(objectives) if objectives else None
+            run["gap_to_best"] = (run["objective"] - best) / max(abs(best), 1e-9) \
+                if run["objective"] is not None and best is not None else None
+            results.append({**metadata, **run})
+
+    with open(args.output, "a") as file:
+        for result in results:
+            file.write(json.dumps(result) + "\n")
+    return results
+
+
+if __name__ == "__main__":
+    main()
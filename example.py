@@ -1,9 +1,13 @@
 from model.DinnerInstance import DinnerInstance
+from model.Geocoder import OrsGeocoder
+from model.GeocodingCache import SQLiteGeocodingCache
+from model.TravelTimeCache import SQLiteTravelTimeCache
 
+ors_auth_key = "your-ors-key"
 
 print("Getting locations and distances...")
 instance = DinnerInstance(
-    ors_auth_key = "your-ors-key",
+    ors_auth_key = ors_auth_key,
     country_code = "DE",
     city_address= "33602 Bielefeld",
     events = ["zu Hause", "Vorspeise", "Hauptspeise", "Nachspeise", "After Party"],
@@ -19,7 +23,9 @@ instance = DinnerInstance(
         ("Group 9", "Detmolder Straße 1", 3),
         ("Group 10", "Elsa-Brändström-Strasse 12", 3)
     ],
-party_address="Jahnplatz")
+party_address="Jahnplatz",
+geocoder=OrsGeocoder(ors_auth_key, cache=SQLiteGeocodingCache("geocoding-cache.sqlite")),
+travel_time_cache=SQLiteTravelTimeCache("travel-time-cache.sqlite"))
 
 print("Solving...")
 solution = instance.solve(
@@ -0,0 +1,103 @@
+import re
+from threading import Event, Thread
+from time import perf_counter
+from types import TracebackType
+from typing import Callable, Optional, Type
+from model.SolveStats import SolveProgress, relative_gap
+
+
+class CbcLog:
+    """
+    Follows the log file of a running CBC process, e.g. written by PuLP's
+    ``PULP_CBC_CMD(logPath=...)``, and reports new incumbents and bounds.
+
+    CBC prints a line for every new integer solution and regularly the best
+    solution and best possible objective, and finally the objective and lower
+    bound when it stops early. The log is read on a background thread while
+    the solver is running. CBC writes its log to the file in blocks, so the
+    progress may arrive with some delay.
+    """
+
+    INCUMBENT = re.compile(r"Integer solution of (\S+) found")
+    PROGRESS = re.compile(r"(\S+) best solution, best possible (\S+)")
+    OBJECTIVE = re.compile(r"^Objective value:\s+(\S+)")
+    BOUND = re.compile(r"^Lower bound:\s+(\S+)")
+    NO_SOLUTION = 1e50
+
+    def __init__(self,
+                 path: str,
+                 progress: Optional[Callable[[SolveProgress], None]] = None,
+                 interval: float = 0.2) -> None:
+        """
+        Initializes the CbcLog.
+
+        Args:
+            path (str): The path of the log file.
+            progress (Optional[Callable[[SolveProgress], None]]): Optional callback that is
+                called whenever the incumbent or the bound improves. Default is None.
+            interval (float): The time in seconds between checks for new lines. Default is 0.2.
+        """
+        self.path = path
+        self.progress = progress
+        self.interval = interval
+        self.incumbent: Optional[float] = None
+        self.bound: Optional[float] = None
+        self._start = perf_counter()
+        self._stop = Event()
+        self._thread = Thread(target=self._follow, daemon=True)
+
+    def __enter__(self) -> "CbcLog":
+        self._start = perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _follow(self) -> None:
+        with open(self.path) as file:
+            pending = ""
+            while True:
+                stopping = self._stop.is_set()
+                pending += file.read()
+                *lines, pending = pending.split("\n")
+                for line in lines:
+                    self._parse(line)
+                if stopping:
+                    self._parse(pending)
+                    return
+                self._stop.wait(self.interval)
+
+    def _parse(self, line: str) -> None:
+        incumbent, bound = self.incumbent, self.bound
+        match = self.INCUMBENT.search(line)
+        if match:
+            incumbent = self._number(match.group(1))
+        match = self.PROGRESS.search(line)
+        if match:
+            incumbent = self._number(match.group(1))
+            bound = self._number(match.group(2))
+        match = self.OBJECTIVE.search(line)
+        if match:
+            incumbent = self._number(match.group(1))
+        match = self.BOUND.search(line)
+        if match:
+            bound = self._number(match.group(1))
+        incumbent = incumbent if incumbent is not None else self.incumbent
+        bound = bound if bound is not None else self.bound
+        if (incumbent, bound) != (self.incumbent, self.bound):
+            self.incumbent, self.bound = incumbent, bound
+            if self.progress is not None:
+                self.progress(SolveProgress(perf_counter() - self._start, self.incumbent, self.bound,
+                                            relative_gap(self.incumbent, self.bound)))
+
+    def _number(self, text: str) -> Optional[float]:
+        try:
+            number = float(text.rstrip(","))
+        except ValueError:
+            return None
+        return number if abs(number) < self.NO_SOLUTION else None
@@ -0,0 +1,195 @@
+import numpy as np
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from time import perf_counter
+from typing import Dict, List, Optional, TYPE_CHECKING
+from model.Group import Group
+from model.HeuristicSolver import HeuristicSolver
+
+if TYPE_CHECKING:
+    from model.DinnerInstance import DinnerInstance
+
+
+def _solve_cluster(instance: "DinnerInstance", solve_arguments: dict) -> List[List[int]]:
+    """
+    Solves a subinstance in a worker process.
+
+    Returns:
+        List[List[int]]: The positions of the hosts of each group in ``instance.groups``.
+    """
+    solution = instance.solve(**solve_arguments)
+    position = {group: i for i, group in enumerate(instance.groups)}
+    return [[position[host] for host in solution[group]] for group in instance.groups]
+
+
+class DecompositionSolver:
+    """
+    Solves large running dinner instances by decomposition.
+
+    The groups are partitioned into geographically compact clusters. Each
+    cluster receives about the same share of the hosts of every main event, so
+    that the ratio of hosts to guests stays valid. The clusters are solved
+    independently in a process pool and their solutions are merged. An optional
+    repair pass with the HeuristicSolver then improves the merged solution
+    across cluster boundaries.
+    """
+
+    def __init__(self, instance: "DinnerInstance", cluster_size: int = 60, seed: Optional[int] = None) -> None:
+        """
+        Initializes the DecompositionSolver.
+
+        Args:
+            instance (DinnerInstance): The instance to solve.
+            cluster_size (int): The targeted number of groups per cluster. Default is 60.
+            seed (Optional[int]): The seed for the initial cluster centers. Default is None.
+        """
+        self.instance = instance
+        self.cluster_size = cluster_size
+        self.random = Random(seed)
+
+    def clusters(self, iterations: int = 10) -> List[List[Group]]:
+        """
+        Partitions the groups into clusters. Initial centers are found by k-means on
+        the coordinates of the groups. Then groups are assigned to the nearest
+        cluster medoid by travel time, separately for the hosts of each event and
+        with capacities that spread the hosts of each event evenly.
+
+        Args:
+            iterations (int): The maximum number of reassignments. Default is 10.
+
+        Returns:
+            List[List[Group]]: The groups of each cluster.
+        """
+        groups = self.instance.groups
+        hosts_by_events = self.instance.hosts_by_events
+        num_clusters = max(1, round(len(groups) / self.cluster_size))
+        num_clusters = min(num_clusters, min(len(hosts) for hosts in hosts_by_events.values()))
+        if num_clusters <= 1:
+            return [list(groups)]
+
+        # planar approximation of the coordinates for the initial k-means
+        lat = np.array([group.location.coordinates.lat for group in groups])
+        lon = np.array([group.location.coordinates.lon for group in groups])
+        points = np.column_stack((lat, lon * np.cos(np.radians(lat.mean()))))
+        centers = points[self.random.sample(range(len(groups)), num_clusters)]
+        for _ in range(iterations):
+            labels = np.argmin(((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2), axis=1)
+            centers = np.array([points[labels == c].mean(axis=0) if (labels == c).any() else centers[c]
+                                for c in range(num_clusters)])
+        medoids = np.argmin(((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2), axis=0)
+
+        location_indices = self.instance.travel_times.indices(group.location for group in groups)
+        times = self.instance.travel_times.matrix[np.ix_(location_indices, location_indices)].astype(np.float64)
+        times = (times + times.T) / 2
+        position = {group: g for g, group in enumerate(groups)}
+        labels = np.full(len(groups), -1)
+        for _ in range(iterations):
+            new_labels = np.full(len(groups), -1)
+            for hosts in hosts_by_events.values():
+                members = np.array([position[host] for host in hosts])
+                distances = times[np.ix_(members, medoids)]
+                counts = np.zeros(num_clusters, dtype=np.int64)
+                extra = np.zeros(num_clusters, dtype=bool)
+                base = len(members) // num_clusters
+                # greedily assign the closest pairs, first up to the even share, then one more per cluster
+                for first_pass in (True, False):
+                    for flat in np.argsort(distances, axis=None):
+                        m, c = np.unravel_index(flat, distances.shape)
+                        if new_labels[members[m]] >= 0:
+                            continue
+                        if first_pass and counts[c] < base:
+                            counts[c] += 1
+                        elif not first_pass and not extra[c]:
+                            extra[c] = True
+                        else:
+                            continue
+                        new_labels[members[m]] = c
+            if (new_labels == labels).all():
+                break
+            labels = new_labels
+            medoids = np.array([np.flatnonzero(labels == c)[np.argmin(times[np.ix_(labels == c, labels == c)].sum(axis=1))]
+                                for c in range(num_clusters)])
+        return [[group for g, group in enumerate(groups) if labels[g] == c] for c in range(num_clusters)]
+
+    def solve(self,
+              penalty_too_few_guests: int = 600,
+              penalty_too_many_guests: int = 600,
+              penalty_multiple_encounters: int = 600,
+              method: str = "mip",
+              formulation: str = "compact",
+              prioritized_solver_str: Optional[str] = None,
+              time_limit: Optional[float] = None,
+              processes: Optional[int] = None,
+              repair_time_limit: float = 10.0) -> Dict[Group, List[Group]]:
+        """
+        Solves the clusters in parallel, merges their solutions and repairs the result.
+
+        Args:
+            penalty_too_few_guests (int): The penalty for having fewer than two guests. Default is 600.
+            penalty_too_many_guests (int): The penalty for having more than two guests. Default is 600.
+            penalty_multiple_encounters (int): The penalty for multiple encounters. Default is 600.
+            method (str): The method to solve each cluster, "mip" or "heuristic". Default is "mip".
+            formulation (str): The MIP formulation of each cluster. Default is "compact".
+            prioritized_solver_str (Optional[str]): The prioritized PuLP solver. Default is None.
+            time_limit (Optional[float]): The time limit of each cluster. Default is None.
+            processes (Optional[int]): The number of worker processes. Default is None (number of CPUs).
+            repair_time_limit (float): The time budget of the heuristic repair pass across
+                cluster boundaries, 0 disables it. Default is 10.0.
+
+        Returns:
+            Dict[Group, List[Group]]: A dictionary mapping each group to a sorted list
+            of the hosts that the group visits (including itself if it is hosting).
+
+        Raises:
+            ValueError: If the solution does not visit one host per main event with every group
+                or has hosts with fewer than two or more than four groups, e.g. because a cluster
+                was not solved within the time limit and the repair pass is disabled.
+        """
+        start_perf_counter = perf_counter()
+        subinstances = [self.instance.subinstance(cluster) for cluster in self.clusters()]
+        solve_arguments = dict(penalty_too_few_guests=penalty_too_few_guests,
+                               penalty_too_many_guests=penalty_too_many_guests,
+                               penalty_multiple_encounters=penalty_multiple_encounters,
+                               prioritized_solver_str=prioritized_solver_str,
+                               formulation=formulation,
+                               method=method,
+                               time_limit=time_limit)
+        if len(subinstances) == 1 or processes == 1:
+            results = [_solve_cluster(subinstance, solve_arguments) for subinstance in subinstances]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = list(executor.map(_solve_cluster, subinstances, [solve_arguments] * len(subinstances)))
+
+        solution = dict()
+        for subinstance, result in zip(subinstances, results):
+            for group, hosts in zip(subinstance.groups, result):
+                solution[group] = [subinstance.groups[host] for host in hosts]
+        print(f"Merged {len(subinstances)} clusters in {round(perf_counter() - start_perf_counter, 2)} seconds.")
+
+        if repair_time_limit > 0 and len(subinstances) > 1:
+            heuristic = HeuristicSolver(self.instance, penalty_too_few_guests, penalty_too_many_guests, penalty_multiple_encounters)
+            solution = heuristic.solve(repair_time_limit, initial_solution=solution)
+            print(f"Objective {round(heuristic.objective, 2)} after repair in {round(perf_counter() - start_perf_counter, 2)} seconds.")
+        self._check(solution)
+        return {group: solution[group] for group in self.instance.groups}
+
+    def _check(self, solution: Dict[Group, List[Group]]) -> None:
+        """
+        Checks that a merged solution satisfies the host rows of the mixed-integer program.
+
+        Raises:
+            ValueError: If a group misses a host or a host has fewer than two or more than four groups.
+        """
+        events = list(range(1, len(self.instance.events) - 1))
+        incomplete = [group for group in self.instance.groups
+                      if sorted(host.host_event_id for host in solution.get(group, ())) != events]
+        if incomplete:
+            raise ValueError(f"The merged solution misses hosts of {len(incomplete)} groups, "
+                             f"e.g. {incomplete[0].name}.")
+        counts = Counter(host for hosts in solution.values() for host in hosts)
+        infeasible = [host for host in self.instance.groups
+                      if not HeuristicSolver.MIN_MEMBERS <= counts[host] <= HeuristicSolver.MAX_MEMBERS]
+        if infeasible:
+            raise ValueError(f"The merged solution has {len(infeasible)} hosts without two to four groups, "
+                             f"e.g. {infeasible[0].name}.")
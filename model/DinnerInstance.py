@@ -1,26 +1,51 @@
-from typing import Dict, List, Tuple, Optional
+import csv
+import numpy as np
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Optional, Union, TYPE_CHECKING
+from typing_extensions import Self
 from time import perf_counter
-import folium
-from folium.plugins import TagFilterButton
-from model.Group import Group
+from model.Geocoder import Geocoder, OrsGeocoder
+from model.Group import Address, Group
+from model.Coordinates import Coordinates
 from model.Location import Location
 from model.TravelTimes import TravelTimes
-from pulp import LpVariable, LpBinary, LpInteger, LpContinuous, LpProblem, LpMinimize, LpStatus, lpSum, listSolvers, getSolver, PULP_CBC_CMD
+from model.TravelTimeCache import TravelTimeCache
+from model.TravelTimeProvider import TravelTimeProvider
+from model.SolveStats import SolveProgress, SolveStats
+from model.SolutionExporter import SolutionExporter
+from model.Snapshot import Snapshot
+
+# The solvers import PuLP and highspy, the maps folium. They are imported by the methods
+# that use them, so that loading, exporting or geocoding instances starts quickly.
+if TYPE_CHECKING:
+    from model.DinnerModel import DinnerModel
+    from model.HighsSolver import HighsSolver
+    from model.ParameterSweep import SweepResult
+    from model.SolutionEvaluator import Evaluation
+    from pulp import LpSolver
 
 class DinnerInstance:
 
+    METHODS = ("mip", "heuristic")
+    BACKENDS = ("highs", "pulp")
+
     def __init__(self,
                  ors_auth_key: str,
                  country_code: str,
                  city_address: str,
                  events: List[str],
-                 addresses: List[Tuple[str, str, int]],
-                 party_address: Optional[str] = None) -> None:
+                 addresses: List[Address],
+                 party_address: Optional[str] = None,
+                 geocoder: Optional[Geocoder] = None,
+                 travel_time_cache: Optional[TravelTimeCache] = None,
+                 travel_time_provider: Optional[TravelTimeProvider] = None,
+                 defer_travel_times: bool = False) -> None:
         """
         Sets up a DinnerInstance by geocoding the main city address and optional
         party address, validating the event list, and creating group objects from
         the given addresses. Each address tuple consists of the group’s name,
-        the local address, and the event ID that group wants to host.
+        the local address, and the event ID that group wants to host, optionally
+        followed by the transport mode of the group, e.g. "cycling-regular".
+        Travel times are only fetched for the transport modes in use.
 
         At least three events are required (e.g., a start event, at least one
         main event, and a final event), and each event must have at least one
@@ -32,15 +57,30 @@ class DinnerInstance:
             country_code (str): The country code (alpha-2 or alpha-3) for geocoding.
             city_address (str): The primary city address where the dinner event is centered.
             events (List[str]): Ordered list of event names, with at least three entries.
-            addresses (List[Tuple[str, str, int]]): A list of (group name, address, event ID).
+            addresses (List[Address]): A list of (group name, address, event ID), optionally with
+                the transport mode of the group as fourth element. Defaults to the transport mode
+                of the travel time provider.
             party_address (Optional[str]): Optional address for an after-party. Defaults to None.
+            geocoder (Optional[Geocoder]): Optional geocoder, e.g. an OrsGeocoder with a persistent
+                SQLiteGeocodingCache to avoid geocoding the same addresses in every run. Defaults to
+                an uncached OrsGeocoder.
+            travel_time_cache (Optional[TravelTimeCache]): Optional cache for travel times, e.g. a
+                SQLiteTravelTimeCache to only fetch the travel times of new locations in later runs.
+                Defaults to None.
+            travel_time_provider (Optional[TravelTimeProvider]): Optional source of travel times, e.g.
+                a HaversineTravelTimeProvider or GraphTravelTimeProvider to work offline. Defaults to
+                the OpenRouteService matrix API.
+            defer_travel_times (bool): Whether to only geocode the addresses and leave the travel
+                times to a later call of ``fetch_travel_times``, e.g. to run both stages separately.
+                Default is False.
 
         Raises:
             ValueError: If fewer than three events are given or if any event has no groups hosting it.
         """
         self.country_code = country_code
         self.city_address = city_address
-        self.city_location = Location.from_address(auth_key=ors_auth_key, country_code=country_code, address=city_address)
+        self.geocoder = geocoder if geocoder is not None else OrsGeocoder(ors_auth_key)
+        self.city_location = Location.from_address(auth_key=ors_auth_key, country_code=country_code, address=city_address, geocoder=self.geocoder)
         if len(events) < 3:
             raise ValueError("There must be a starting and ending event and at least one main event in between.")
         self.events = events
@@ -48,24 +88,243 @@ class DinnerInstance:
         self.groups = Group.from_dict(ors_auth_key,
                                       country_code,
                                       self.city_location,
-                                      map(lambda address: (address[0], city_address + ", " + address[1], address[2]), addresses))
-        self.hosts_by_events = {e: list() for e in range(1, len(events)-1)}
+                                      map(lambda address: (address[0], city_address + ", " + address[1], *address[2:]), addresses),
+                                      geocoder=self.geocoder)
+        self._index_hosts()
+        self.after_party = Location.from_address(ors_auth_key, country_code, city_address + ", " + party_address, self.city_location.coordinates, self.geocoder) if party_address is not None else None
+        self.all_locations = Group.get_locations(self.groups)
+        if self.after_party:
+            self.all_locations.append(self.after_party)
+        self.travel_times: Optional[TravelTimes] = None
+        if not defer_travel_times:
+            self.fetch_travel_times(ors_auth_key, travel_time_cache, travel_time_provider)
+
+    def fetch_travel_times(self,
+                           ors_auth_key: str,
+                           travel_time_cache: Optional[TravelTimeCache] = None,
+                           travel_time_provider: Optional[TravelTimeProvider] = None) -> None:
+        """
+        Fetches the travel times between all locations in the profiles of the
+        transport modes of the groups.
+
+        Args:
+            ors_auth_key (str): The authentication key for the OpenRouteService API.
+            travel_time_cache (Optional[TravelTimeCache]): Optional cache for travel times. Defaults to None.
+            travel_time_provider (Optional[TravelTimeProvider]): Optional source of travel times. Defaults
+                to the OpenRouteService matrix API.
+        """
+        self.travel_times = TravelTimes(auth_key=ors_auth_key, locations=self.all_locations,
+                                        cache=travel_time_cache, provider=travel_time_provider,
+                                        transport_modes=Group.get_transport_modes(self.groups))
+
+    @classmethod
+    def from_data(cls,
+                  events: List[str],
+                  groups: List[Group],
+                  travel_times: TravelTimes,
+                  after_party: Optional[Location] = None) -> Self:
+        """
+        Creates a DinnerInstance from groups with known locations and travel times
+        without any geocoding or travel time requests, e.g. for subproblems,
+        synthetic benchmarks or instances restored from files.
+
+        Args:
+            events (List[str]): Ordered list of event names, with at least three entries.
+            groups (List[Group]): The groups, whose locations must be known to the travel times.
+            travel_times (TravelTimes): The travel times between the locations of the groups
+                and the after party.
+            after_party (Optional[Location]): Optional location of an after-party. Defaults to None.
+
+        Returns:
+            DinnerInstance: The created DinnerInstance.
+
+        Raises:
+            ValueError: If fewer than three events are given or if any event has no groups hosting it.
+        """
+        if len(events) < 3:
+            raise ValueError("There must be a starting and ending event and at least one main event in between.")
+        instance = cls.__new__(cls)
+        instance.country_code = None
+        instance.city_address = None
+        instance.city_location = None
+        instance.geocoder = None
+        instance.events = events
+        instance.groups = sorted(groups, key=lambda group: group.host_event_id)
+        instance._index_hosts()
+        instance.after_party = after_party
+        instance.all_locations = Group.get_locations(instance.groups)
+        if after_party:
+            instance.all_locations.append(after_party)
+        instance.travel_times = travel_times
+        return instance
+
+    def subinstance(self, groups: List[Group]) -> Self:
+        """
+        Creates an instance with a subset of the groups, the same events and after
+        party and a copy of the relevant part of the travel times.
+
+        Args:
+            groups (List[Group]): The groups of the subinstance.
+
+        Returns:
+            DinnerInstance: The created DinnerInstance.
+
+        Raises:
+            ValueError: If any event has no groups hosting it.
+        """
+        locations = Group.get_locations(groups)
+        if self.after_party:
+            locations.append(self.after_party)
+        travel_times = TravelTimes.from_matrix(locations, self.travel_times.submatrix(locations, locations),
+                                               self.travel_times.transport_mode, self.travel_times.measurement)
+        for transport_mode in Group.get_transport_modes(groups):
+            travel_times.set_profile(transport_mode, self.travel_times.submatrix(locations, locations, transport_mode))
+        return self.from_data(self.events, groups, travel_times, self.after_party)
+
+    def group_travel_times(self, groups: Optional[List[Group]] = None) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Returns the travel times between the locations of groups in the profiles of
+        their transport modes, e.g. as coefficients of a model. Only the profiles of
+        the transport modes in use are fetched, concurrently, and kept.
+
+        Args:
+            groups (Optional[List[Group]]): The groups. Defaults to all groups of the instance.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]: The profile of each group, the
+            travel times ``times[profile, origin, destination]`` between the positions of the
+            groups and the travel times ``final_times[profile, origin]`` to the after party,
+            None if there is none. The travel time of a leg of group g is read from its profile.
+        """
+        groups = self.groups if groups is None else groups
+        default = self.travel_times.transport_mode
+        transport_modes, profile = np.unique([group.transport_mode or default for group in groups], return_inverse=True)
+        matrices = self.travel_times.load_profiles(transport_modes.tolist())
+        location_indices = self.travel_times.indices(group.location for group in groups)
+        times = np.stack([matrix[np.ix_(location_indices, location_indices)] for matrix in matrices])
+        if self.after_party is None:
+            final_times = None
+        else:
+            party = self.travel_times.index[self.after_party]
+            final_times = np.stack([matrix[location_indices, party] for matrix in matrices])
+        return profile.reshape(-1), times, final_times
+
+    def _index_hosts(self) -> None:
+        """
+        Collects the hosts of each main event.
+
+        Raises:
+            ValueError: If any event has no groups hosting it.
+        """
+        self.hosts_by_events = {e: list() for e in range(1, len(self.events)-1)}
         for group in self.groups:
             self.hosts_by_events[group.host_event_id].append(group)
-        for e in range(1, len(events)-1):
+        for e in range(1, len(self.events)-1):
             if len(self.hosts_by_events[e]) == 0:
-                raise ValueError(f"There must be at least one host for event {events[e]}.")
-        self.after_party = Location.from_address(ors_auth_key, country_code, city_address + ", " + party_address, self.city_location.coordinates) if party_address is not None else None
+                raise ValueError(f"There must be at least one host for event {self.events[e]}.")
+
+    def add_groups(self, addresses: List[Address]) -> List[Group]:
+        """
+        Adds late registrations in place. Only the new addresses are geocoded and
+        only the travel times from and to new locations are fetched.
+
+        Args:
+            addresses (List[Address]): A list of (group name, address, event ID), optionally
+                with the transport mode of the group.
+
+        Returns:
+            List[Group]: The added groups.
+
+        Raises:
+            ValueError: If the instance has no geocoder, e.g. if it was created by ``from_data``.
+        """
+        if self.geocoder is None:
+            raise ValueError("Groups can only be added by address to instances with a geocoder, use insert_groups instead.")
+        addresses = list(addresses)
+        coordinates = self.geocoder.geocode_many((self.city_address + ", " + address, self.country_code, self.city_location.coordinates)
+                                                 for (_, address, _, *_) in addresses)
+        locations = {group.location: group.location for group in self.groups}
+        groups = list()
+        for (name, _, host_event_id, *transport_mode), group_coordinates in zip(addresses, coordinates):
+            location = Location(group_coordinates)
+            location = locations.setdefault(location, location)
+            groups.append(Group(name, location, host_event_id, *transport_mode))
+        self.insert_groups(groups)
+        return groups
+
+    def insert_groups(self, groups: List[Group]) -> None:
+        """
+        Adds groups with known locations in place and fetches only the travel
+        times from and to their locations if these are new, and the profiles of
+        their transport modes if no other group uses them yet.
+
+        Args:
+            groups (List[Group]): The groups to add.
+
+        Raises:
+            ValueError: If a group hosts an unknown event or a group name is already taken.
+        """
+        names = {group.name for group in self.groups}
+        for group in groups:
+            if not 1 <= group.host_event_id <= len(self.events) - 2:
+                raise ValueError(f"Group {group.name} hosts the unknown event {group.host_event_id}.")
+            if group.name in names:
+                raise ValueError(f"There is already a group named {group.name}.")
+            names.add(group.name)
+        self.travel_times.load_profiles(Group.get_transport_modes(groups))
+        self.travel_times.add_locations(Group.get_locations(groups))
+        self.groups = sorted(self.groups + list(groups), key=lambda group: group.host_event_id)
+        self._index_hosts()
         self.all_locations = Group.get_locations(self.groups)
         if self.after_party:
             self.all_locations.append(self.after_party)
-        self.travel_times = TravelTimes(auth_key=ors_auth_key, locations=self.all_locations)
+
+    def remove_groups(self, groups: List[Union[Group, str]]) -> List[Group]:
+        """
+        Removes cancelled groups in place. The travel times of their locations are
+        kept, so they are available again if a group re-registers.
+
+        Args:
+            groups (List[Union[Group, str]]): The groups or names of the groups to remove.
+
+        Returns:
+            List[Group]: The removed groups.
+
+        Raises:
+            ValueError: If a group is unknown or if an event would have no groups hosting it.
+        """
+        groups_by_name = {group.name: group for group in self.groups}
+        removed = list()
+        for group in groups:
+            name = group if isinstance(group, str) else group.name
+            if name not in groups_by_name:
+                raise ValueError(f"There is no group named {name}.")
+            removed.append(groups_by_name[name])
+        remaining = [group for group in self.groups if group not in removed]
+        for e in range(1, len(self.events)-1):
+            if not any(group.host_event_id == e for group in remaining):
+                raise ValueError(f"There must be at least one host for event {self.events[e]}.")
+        self.groups = remaining
+        self._index_hosts()
+        self.all_locations = Group.get_locations(self.groups)
+        if self.after_party:
+            self.all_locations.append(self.after_party)
+        return removed
 
     def solve(self,
               penalty_too_few_guests: int = 600,
               penalty_too_many_guests: int = 600,
               penalty_multiple_encounters: int = 600,
-              prioritized_solver_str: Optional[str] = None) -> Dict[Group, List[Group]]:
+              prioritized_solver_str: Optional[str] = None,
+              formulation: str = "full",
+              method: str = "mip",
+              time_limit: Optional[float] = None,
+              initial_solution: Optional[Union[Dict[Group, List[Group]], str]] = None,
+              return_stats: bool = False,
+              backend: Optional[str] = None,
+              gap_rel: Optional[float] = None,
+              threads: Optional[int] = None,
+              progress: Optional[Callable[[SolveProgress], None]] = None) -> Union[Dict[Group, List[Group]], Tuple[Dict[Group, List[Group]], SolveStats]]:
         """
         Solves the dinner instance optimization problem by assigning each group
         to hosting and visiting other groups according to the specified events.
@@ -74,8 +333,15 @@ class DinnerInstance:
         are applied if there are fewer or more than two guests, and additional
         penalties apply if the same groups meet more than once.
 
-        If a specific solver is requested and available in PuLP, that solver will
-        be used; otherwise, the default solver is used.
+        By default, the mixed-integer program is solved. It is passed in-process to
+        HiGHS if highspy is installed. If a specific solver is requested and
+        available in PuLP, that solver will be used; otherwise, the default solver
+        of PuLP is used. Alternatively, a construction and local search
+        heuristic finds good solutions of large instances within seconds.
+
+        A time limit and a relative gap stop the solver early with the best
+        solution found so far, whose status, lower bound and gap are part of the
+        returned SolveStats.
 
         Args:
             penalty_too_few_guests (int): The penalty for having fewer than two guests
@@ -86,114 +352,339 @@ class DinnerInstance:
                 between the same groups. Default is 600.
             prioritized_solver_str (Optional[str]): If provided and recognized by PuLP,
                 the corresponding solver will be prioritized. Default is None.
+            formulation (str): The MIP formulation, either "full" or "compact". The compact
+                formulation only creates variables for feasible group-host pairs, needs far
+                fewer constraints and is generated in bulk from arrays, which makes large
+                instances tractable. Only the compact formulation is solved by HiGHS without PuLP,
+                see ``backend``. Default is "full".
+            method (str): Either "mip" to solve the mixed-integer program or "heuristic" to
+                run the HeuristicSolver. Default is "mip".
+            time_limit (Optional[float]): The time limit in seconds, which includes building the model
+                and the heuristic start. Command line solvers may exceed it while writing and reading
+                their files and before they first check it, e.g. in the presolve of large full models.
+                The heuristic uses it as time budget. Default is None, i.e. no limit for the solver
+                and 10 seconds for the heuristic.
+            initial_solution (Optional[Union[Dict[Group, List[Group]], str]]): A previous solution,
+                or the name of a csv file written by ``save_csv``, to start from. The mixed-integer
+                program passes it as MIP start to the solver unless a host has fewer than two or more
+                than four groups, the heuristic uses it instead of its construction. "heuristic" runs
+                the heuristic for a quarter of the time limit, at most 10 seconds, first and starts the
+                solver from its solution, the heuristic method ignores it. Default is None.
+            return_stats (bool): Whether to also return the model size and the time spent in
+                each phase. Default is False.
+            backend (Optional[str]): Either "highs" to pass the arrays of the compact formulation
+                directly to HiGHS without writing a model file, or "pulp" to solve through PuLP.
+                Default is None, i.e. "highs" if highspy is installed, no PuLP solver is
+                prioritized and the formulation is compact, otherwise "pulp".
+            gap_rel (Optional[float]): The relative gap between solution and lower bound at which
+                the solver stops. Default is None, i.e. the default of the solver.
+            threads (Optional[int]): The number of threads of the solver. Default is None, i.e.
+                the default of the solver.
+            progress (Optional[Callable[[SolveProgress], None]]): Optional callback that receives
+                the elapsed time, incumbent objective, bound and gap whenever the solver finds a
+                better solution or bound, and once with the final result. Default is None.
 
         Returns:
             Dict[Group, List[Group]]: A dictionary mapping each group to a sorted list
-            of the hosts that the group visits (including itself if it is hosting).
+            of the hosts that the group visits (including itself if it is hosting). If
+            return_stats is True, a tuple of the solution and its SolveStats.
 
         Raises:
+            ValueError: If the method, formulation or backend is unknown.
+            ImportError: If the HiGHS backend is requested but highspy is not installed.
             PuLPError: If an error occurs while solving with the selected solver.
         """
-        # Assignment variables
-        x = dict()
-        for group in self.groups:
-            for host in self.groups:
-                x[group, host] = LpVariable(f"x[{group.name},{host.name}]", cat=LpBinary)
-
-        # Maximum travel time variables
-        t = dict()
-        for e in range(len(self.events) - 1):
-            t[e] = LpVariable(f"t[{e}]", lowBound=0, cat=LpContinuous)
-
-        # auxiliary variable to check if two teams meet at one location
-        y = dict()
-        for g1 in range(len(self.groups)-1):
-            for g2 in range(g1+1, len(self.groups)):
-                for host in self.groups:
-                    y[self.groups[g1], self.groups[g2], host] = LpVariable("y[{0},{1},{2}]".format(self.groups[g1].name, self.groups[g2].name, host.name), cat=LpBinary)
-
-        # auxiliary variable for penalties
-        z = dict()
-        for host in self.groups:
-            z[1, host] = LpVariable("z[1,{0}]".format(host.name), cat=LpBinary)
-        for host in self.groups:
-            z[2, host] = LpVariable("z[2,{0}]".format(host.name), cat=LpBinary)
-        for g1 in range(len(self.groups)-1):
-            for g2 in range(g1+1, len(self.groups)):
-                z[3, self.groups[g1], self.groups[g2]] = LpVariable("z[3,{0},{1}]".format(self.groups[g1].name, self.groups[g2].name), cat=LpInteger)
-
-        # initialize problem
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method {method}, expected one of {', '.join(self.METHODS)}.")
+        if backend is not None and backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {backend}, expected one of {', '.join(self.BACKENDS)}.")
+        from model.DinnerModel import DinnerModel
+        from model.HeuristicSolver import HeuristicSolver
+
         start_perf_counter = perf_counter()
-        prob = LpProblem("Running-Dinner", LpMinimize)
+        if isinstance(initial_solution, str) and initial_solution != "heuristic":
+            initial_solution = self.load_csv(initial_solution)
+        if method == "heuristic":
+            heuristic = HeuristicSolver(self, penalty_too_few_guests, penalty_too_many_guests, penalty_multiple_encounters)
+            solution = heuristic.solve(time_limit if time_limit is not None else 10.0,
+                                       initial_solution if isinstance(initial_solution, dict) else None)
+            elapsed = perf_counter() - start_perf_counter
+            print(f"Objective {round(heuristic.objective, 2)} in {round(elapsed, 2)} seconds by heuristic.")
+            if progress is not None:
+                progress(SolveProgress(elapsed, heuristic.objective, None, None))
+            if return_stats:
+                stats = SolveStats()
+                stats.add_time("solve", elapsed)
+                stats.solver = "heuristic"
+                stats.status = "Feasible"
+                stats.objective = heuristic.objective
+                return solution, stats
+            return solution
+
+        if initial_solution == "heuristic":
+            heuristic = HeuristicSolver(self, penalty_too_few_guests, penalty_too_many_guests, penalty_multiple_encounters)
+            initial_solution = heuristic.solve(min(10.0, time_limit / 4) if time_limit is not None else 10.0)
+        model = DinnerModel(self, formulation)
+        model.set_objective(penalty_too_few_guests, penalty_too_many_guests, penalty_multiple_encounters)
+        warm_start = initial_solution is not None and model.set_initial_solution(initial_solution)
+
+        # check for solvers, the time limit includes building the model and the heuristic
+        selected_solver = self._select_solver(model, backend, prioritized_solver_str, warm_start, time_limit,
+                                              start_perf_counter, gap_rel, threads)
+        model.solve(selected_solver, progress)
+
+        self._print_status(model.stats, perf_counter() - start_perf_counter)
+
+        solution = model.extract_solution()
+        if return_stats:
+            return solution, model.stats
+        return solution
+    
+    def evaluate(self,
+                 solution: Dict[Group, List[Group]],
+                 penalty_too_few_guests: int = 600,
+                 penalty_too_many_guests: int = 600,
+                 penalty_multiple_encounters: int = 600) -> "Evaluation":
+        """
+        Scores a solution on the objective of ``solve`` without solving anything,
+        e.g. to check a plan loaded by ``load_csv`` or edited by hand.
 
-        # objective function
-        prob += lpSum(t[e] for e in range(len(self.events)-1)) +\
-                + penalty_too_few_guests * lpSum(z[1, host] for host in self.groups) +\
-                + penalty_too_many_guests * lpSum(z[2, host] for host in self.groups) +\
-                + penalty_multiple_encounters * lpSum(z[3, self.groups[g1], self.groups[g2]] for g1 in range(len(self.groups)-1) for g2 in range(g1+1, len(self.groups)))
+        Args:
+            solution (Dict[Group, List[Group]]): The solution containing groups and their hosts.
+            penalty_too_few_guests (int): The penalty for having fewer than two guests
+                at a hosted event. Default is 600.
+            penalty_too_many_guests (int): The penalty for having more than two guests
+                at a hosted event. Default is 600.
+            penalty_multiple_encounters (int): The penalty for multiple encounters
+                between the same groups. Default is 600.
+
+        Returns:
+            Evaluation: The objective, the maximum travel times between consecutive events,
+            the numbers of missing and additional guests and of repeated encounters.
+
+        Raises:
+            ValueError: If the solution is incomplete or invalid.
+        """
+        from model.SolutionEvaluator import SolutionEvaluator
+
+        evaluator = SolutionEvaluator(self, penalty_too_few_guests, penalty_too_many_guests, penalty_multiple_encounters)
+        return evaluator.evaluate(solution)
+
+    @staticmethod
+    def _select_solver(model: "DinnerModel",
+                       backend: Optional[str],
+                       prioritized_solver_str: Optional[str],
+                       warm_start: bool,
+                       time_limit: Optional[float] = None,
+                       start_perf_counter: Optional[float] = None,
+                       gap_rel: Optional[float] = None,
+                       threads: Optional[int] = None) -> Union["LpSolver", "HighsSolver"]:
+        """
+        Selects the solver of a model. The time limit started at ``start_perf_counter``, so
+        the solver receives the time that is left after building the model, including the
+        PuLP objects of the compact formulation if it is solved through PuLP, but at least
+        one second.
+        """
+        from model.DinnerModel import DinnerModel
+        from model.HighsSolver import HighsSolver
+
+        if backend is None:
+            use_highs = HighsSolver.available() and prioritized_solver_str is None and model.formulation == "compact"
+            backend = "highs" if use_highs else "pulp"
+        if backend == "pulp":
+            model.prob  # creates the PuLP objects of the compact formulation
+        if time_limit is not None and start_perf_counter is not None:
+            # PuLP ignores a time limit of 0, so the solver gets at least a second
+            time_limit = max(1.0, time_limit - (perf_counter() - start_perf_counter))
+        if backend == "highs":
+            return HighsSolver(time_limit=time_limit, gap_rel=gap_rel, threads=threads)
+        options = {"timeLimit": time_limit, "gapRel": gap_rel, "threads": threads}
+        return DinnerModel.get_solver(prioritized_solver_str, warmStart=warm_start,
+                                      **{option: value for option, value in options.items() if value is not None})
+
+    @staticmethod
+    def _print_status(stats: SolveStats, elapsed: float) -> None:
+        gap = f", gap {stats.gap:.2%}" if stats.gap is not None and stats.status != "Optimal" else ""
+        print(f"{stats.status} in {round(elapsed, 2)} seconds by {stats.solver}{gap}.")
+
+    def replan(self,
+               previous_solution: Dict[Group, List[Group]],
+               penalty_too_few_guests: int = 600,
+               penalty_too_many_guests: int = 600,
+               penalty_multiple_encounters: int = 600,
+               penalty_change: int = 60,
+               free_nearby: int = 5,
+               time_limit: Optional[float] = None,
+               prioritized_solver_str: Optional[str] = None,
+               backend: Optional[str] = None,
+               return_stats: bool = False) -> Union[Dict[Group, List[Group]], Tuple[Dict[Group, List[Group]], SolveStats]]:
+        """
+        Re-optimizes a previous solution with minimal disruption after groups were
+        added by ``add_groups`` or removed by ``remove_groups``.
+
+        Groups affected by the change are re-planned: new groups, groups that lost
+        one of their hosts and hosts that lost a guest, each together with its
+        nearest groups. The routes of all other groups are fixed. Every host of a
+        re-planned group that differs from the previous solution costs
+        penalty_change, so that routes only change where it pays off.
+
+        Args:
+            previous_solution (Dict[Group, List[Group]]): The solution before the change.
+            penalty_too_few_guests (int): The penalty for having fewer than two guests
+                at a hosted event. Default is 600.
+            penalty_too_many_guests (int): The penalty for having more than two guests
+                at a hosted event. Default is 600.
+            penalty_multiple_encounters (int): The penalty for multiple encounters
+                between the same groups. Default is 600.
+            penalty_change (int): The penalty for each changed host of a group. Default is 60.
+            free_nearby (int): The number of nearest groups of each affected group whose
+                routes may change as well. Default is 5.
+            time_limit (Optional[float]): The time limit in seconds, which includes building the model.
+                Default is None.
+            prioritized_solver_str (Optional[str]): The prioritized PuLP solver, see ``solve``.
+                Default is None.
+            backend (Optional[str]): The solver backend, see ``solve``. Default is None.
+            return_stats (bool): Whether to also return the SolveStats. Default is False.
+
+        Returns:
+            Dict[Group, List[Group]]: A dictionary mapping each group to a sorted list
+            of the hosts that the group visits (including itself if it is hosting). If
+            return_stats is True, a tuple of the solution and its SolveStats.
+
+        Raises:
+            ValueError: If the backend is unknown.
+        """
+        if backend is not None and backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {backend}, expected one of {', '.join(self.BACKENDS)}.")
+        start_perf_counter = perf_counter()
+        num_main_events = len(self.events) - 2
+        current = set(self.groups)
+        previous = {group: [host for host in hosts if host in current]
+                    for group, hosts in previous_solution.items() if group in current}
+        affected = {group for group in self.groups if len(previous.get(group, ())) != num_main_events}
+        for group, hosts in previous_solution.items():
+            if group not in current:
+                affected.update(host for host in hosts if host in current and host is not group)
+
+        free = set(affected)
+        if affected and free_nearby > 0:
+            location_indices = self.travel_times.indices(group.location for group in self.groups)
+            times = self.travel_times.matrix[np.ix_(location_indices, location_indices)]
+            times = times + times.T
+            position = {group: g for g, group in enumerate(self.groups)}
+            for group in affected:
+                nearest = np.argsort(times[position[group]], kind="stable")[:free_nearby + 1]
+                free.update(self.groups[g] for g in nearest.tolist())
+
+        from model.DinnerModel import DinnerModel
+
+        model = DinnerModel(self, "compact")
+        model.fix_assignments({group: hosts for group, hosts in previous.items() if group not in free})
+        model.set_reference_solution({group: hosts for group, hosts in previous.items() if group in free}, penalty_change)
+        model.set_objective(penalty_too_few_guests, penalty_too_many_guests, penalty_multiple_encounters)
+        warm_start = model.set_initial_solution(previous)
+        selected_solver = self._select_solver(model, backend, prioritized_solver_str, warm_start, time_limit,
+                                              start_perf_counter)
+        model.solve(selected_solver)
+
+        self._print_status(model.stats, perf_counter() - start_perf_counter)
+        print(f"{len(free)} of {len(self.groups)} groups re-planned.")
+
+        solution = model.extract_solution()
+        if return_stats:
+            return solution, model.stats
+        return solution
+
+    def solve_decomposed(self,
+                         penalty_too_few_guests: int = 600,
+                         penalty_too_many_guests: int = 600,
+                         penalty_multiple_encounters: int = 600,
+                         cluster_size: int = 60,
+                         method: str = "mip",
+                         formulation: str = "compact",
+                         prioritized_solver_str: Optional[str] = None,
+                         time_limit: Optional[float] = None,
+                         processes: Optional[int] = None,
+                         repair_time_limit: float = 10.0) -> Dict[Group, List[Group]]:
+        """
+        Solves very large instances by splitting the groups into geographically
+        compact clusters that keep the host ratio of every event, solving the
+        clusters in parallel worker processes and merging their solutions with a
+        repair pass across the cluster boundaries.
+
+        Args:
+            penalty_too_few_guests (int): The penalty for having fewer than two guests
+                at a hosted event. Default is 600.
+            penalty_too_many_guests (int): The penalty for having more than two guests
+                at a hosted event. Default is 600.
+            penalty_multiple_encounters (int): The penalty for multiple encounters
+                between the same groups. Default is 600.
+            cluster_size (int): The targeted number of groups per cluster. Default is 60.
+            method (str): The method to solve each cluster, see ``solve``. Default is "mip".
+            formulation (str): The MIP formulation of each cluster. Default is "compact".
+            prioritized_solver_str (Optional[str]): The prioritized PuLP solver. Default is None.
+            time_limit (Optional[float]): The time limit of each cluster. Default is None.
+            processes (Optional[int]): The number of worker processes. Default is None (number of CPUs).
+            repair_time_limit (float): The time budget of the repair pass, 0 disables it. Default is 10.0.
+
+        Returns:
+            Dict[Group, List[Group]]: A dictionary mapping each group to a sorted list
+            of the hosts that the group visits (including itself if it is hosting).
+
+        Raises:
+            ValueError: If the merged solution violates the host rows of the mixed-integer
+                program, e.g. because a cluster was not solved and the repair pass is disabled.
+        """
+        from model.DecompositionSolver import DecompositionSolver
+
+        return DecompositionSolver(self, cluster_size).solve(penalty_too_few_guests,
+                                                             penalty_too_many_guests,
+                                                             penalty_multiple_encounters,
+                                                             method=method,
+                                                             formulation=formulation,
+                                                             prioritized_solver_str=prioritized_solver_str,
+                                                             time_limit=time_limit,
+                                                             processes=processes,
+                                                             repair_time_limit=repair_time_limit)
+
+    def sweep(self,
+              penalties_too_few_guests: Iterable[float] = (600,),
+              penalties_too_many_guests: Iterable[float] = (600,),
+              penalties_multiple_encounters: Iterable[float] = (600,),
+              solvers: Iterable[Optional[str]] = (None,),
+              formulation: str = "compact",
+              time_limit: Optional[float] = None,
+              processes: Optional[int] = None) -> List["SweepResult"]:
+        """
+        Solves the instance for every combination of the given penalties and
+        solvers in parallel worker processes, e.g. to tune the penalties. The
+        instance is sent to each worker once and each worker builds the model
+        once, only the objective changes between the runs.
+
+        Args:
+            penalties_too_few_guests (Iterable[float]): The penalties for too few guests. Default is (600,).
+            penalties_too_many_guests (Iterable[float]): The penalties for too many guests. Default is (600,).
+            penalties_multiple_encounters (Iterable[float]): The penalties for multiple encounters. Default is (600,).
+            solvers (Iterable[Optional[str]]): PuLP solver names, None for the default PuLP solver,
+                "highs" for the in-process HighsSolver or "heuristic" for the HeuristicSolver.
+                Default is (None,).
+            formulation (str): The MIP formulation. Default is "compact".
+            time_limit (Optional[float]): The time limit of each run in seconds, which includes
+                building the model in the first run of a solver in a worker. Default is None.
+            processes (Optional[int]): The number of worker processes. Default is None (number of CPUs).
+
+        Returns:
+            List[SweepResult]: The objective components, status and runtime of each run.
+        """
+        from model.ParameterSweep import ParameterSweep
+
+        return ParameterSweep(self, formulation).run(penalties_too_few_guests,
+                                                     penalties_too_many_guests,
+                                                     penalties_multiple_encounters,
+                                                     solvers=solvers,
+                                                     time_limit=time_limit,
+                                                     processes=processes)
 
-        # link from assignment to travel time variables
-        for group in self.groups:
-            # travel times after start event: each group start from its home
-            prob += lpSum(self.travel_times.travel_times[group.location][host.location] * x[group, host]
-                        for host in self.hosts_by_events[1]
-                        ) <= t[0]
-            # travel times between main events
-            for e in range(1, len(self.events)-2):
-                for host1 in self.hosts_by_events[e]:
-                    for host2 in self.hosts_by_events[e+1]:
-                        prob += self.travel_times.travel_times[host1.location][host2.location] * (x[group, host1] + x[group, host2] - 1) <= t[e]
-            # travel times to end event
-            if self.after_party is None:
-                # each group travels to its home
-                prob += lpSum(self.travel_times.travel_times[host.location][group.location] * x[group, host]
-                        for host in self.hosts_by_events[len(self.events)-2]
-                        ) <= t[len(self.events)-2]
-            else:
-                # each group travels to the party location
-                prob += lpSum(self.travel_times.travel_times[host.location][self.after_party]
-                        for host in self.hosts_by_events[len(self.events)-2]
-                        ) <= t[len(self.events)-2]
-        
-        # each group must visit exactly one group for each main event
-        for group in self.groups:
-            for e in range(1, len(self.events)-1):
-                prob += lpSum(x[group, host]
-                            for host in self.hosts_by_events[e]
-                            ) == 1
-        
-        # each group visits itself when it hosts
-        for group in self.groups:
-            prob += x[group, group] == 1
-
-        # if a group is hosting an event, three groups must be present. Deviations are penalized.
-        for host in self.groups:
-            prob += lpSum(x[group, host] for group in self.groups) == 3 - z[1, host] + z[2, host]
-
-        # count how often teams meet during the main events
-        for g1 in range(len(self.groups)-1):
-            for g2 in range(g1+1, len(self.groups)):
-                for host in self.groups:
-                    prob += x[self.groups[g1], host] + x[self.groups[g2], host] <= 1 + y[self.groups[g1], self.groups[g2], host]
-
-        # teams may only meet up to once. More meetings are penalized.
-        for g1 in range(len(self.groups)-1):
-            for g2 in range(g1+1, len(self.groups)):
-                for host in self.groups:
-                    prob += lpSum(y[self.groups[g1], self.groups[g2], host] for host in self.groups) <= 1 + z[3, self.groups[g1], self.groups[g2]]
-
-        # check for solvers
-        selected_solver = PULP_CBC_CMD(msg=0)
-        if prioritized_solver_str is not None and prioritized_solver_str in listSolvers():
-            prioritized_solver = getSolver(prioritized_solver_str, msg=0)
-            if prioritized_solver.available:
-                selected_solver = prioritized_solver
-        status = prob.solve(selected_solver)
-
-        print(f"{LpStatus[status]} in {round(perf_counter() - start_perf_counter, 2)} seconds by {selected_solver.name}.")
-
-        return {group: sorted([host for host in self.groups if x[group, host].value() > 0.99], key=lambda host: host.host_event_id) for group in self.groups}
-    
     def save_csv(self, filename: str, solution: Dict[Group, List[Group]]) -> None:
         """
         Saves the solution to a CSV file.
@@ -207,14 +698,172 @@ class DinnerInstance:
             for group, hosts in solution.items():
                 file.write('"{0}";"{1}"\n'.format(group.name, '";"'.join(host.name for host in hosts)))
     
-    def save_map(self, filename: str, solution: Dict[Group, List[Group]]) -> None:
+    def load_csv(self, filename: str) -> Dict[Group, List[Group]]:
+        """
+        Loads a solution from a CSV file written by ``save_csv``, e.g. to warm start
+        a re-plan. Rows of unknown groups and unknown hosts are skipped, so the
+        solution of an instance from which groups have dropped out can be loaded.
+
+        Args:
+            filename (str): The name of the CSV file.
+
+        Returns:
+            Dict[Group, List[Group]]: The solution containing groups and their hosts.
+        """
+        groups_by_name = {group.name: group for group in self.groups}
+        solution = dict()
+        with open(filename, newline="") as file:
+            rows = csv.reader(file, delimiter=";")
+            next(rows, None)
+            for row in rows:
+                if not row or row[0] not in groups_by_name:
+                    continue
+                solution[groups_by_name[row[0]]] = [groups_by_name[name] for name in row[1:] if name in groups_by_name]
+        return solution
+
+    def save_snapshot(self, filename: str) -> None:
+        """
+        Saves the prepared instance, i.e. the events, the groups with their
+        coordinates and transport modes in the order of ``hosts_by_events``, the
+        after party and the travel time matrices of all fetched profiles, to a
+        compact binary file that ``load_snapshot`` reads without any geocoding or
+        travel time requests.
+
+        Args:
+            filename (str): The name of the file.
+        """
+        locations = self.travel_times.locations
+        index = self.travel_times.index
+        header = {
+            "version": 1,
+            "events": self.events,
+            "country_code": self.country_code,
+            "city_address": self.city_address,
+            "city_location": list(self.city_location.coordinates) if self.city_location is not None else None,
+            "group_names": [group.name for group in self.groups],
+            "after_party": index[self.after_party] if self.after_party is not None else None,
+            "group_transport_modes": [group.transport_mode for group in self.groups],
+            "transport_mode": self.travel_times.transport_mode,
+            "measurement": self.travel_times.measurement,
+            "profiles": list(),
+        }
+        arrays = {
+            "coordinates": np.array([location.coordinates for location in locations], dtype=np.float64).reshape(-1, 2),
+            "group_locations": np.array([index[group.location] for group in self.groups], dtype=np.int32),
+            "group_host_events": np.array([group.host_event_id for group in self.groups], dtype=np.int32),
+            "travel_times": np.asarray(self.travel_times.matrix, dtype=np.float32),
+        }
+        for (transport_mode, measurement), matrix in self.travel_times.profiles.items():
+            if matrix is not self.travel_times.matrix:
+                name = f"travel_times_{len(header['profiles'])}"
+                header["profiles"].append([transport_mode, measurement, name])
+                arrays[name] = np.asarray(matrix, dtype=np.float32)
+        Snapshot.save(filename, header, arrays)
+
+    @classmethod
+    def load_snapshot(cls,
+                      filename: str,
+                      mmap: bool = True,
+                      geocoder: Optional[Geocoder] = None,
+                      travel_time_provider: Optional[TravelTimeProvider] = None) -> Self:
+        """
+        Loads an instance saved by ``save_snapshot``.
+
+        The travel time matrices are memory-mapped read-only by default, so loading
+        takes milliseconds even for thousands of locations and worker processes
+        of sweeps and decompositions map the same file instead of copying it.
+
+        Args:
+            filename (str): The name of the file.
+            mmap (bool): Whether to memory-map the travel time matrices. Default is True.
+            geocoder (Optional[Geocoder]): Optional geocoder for ``add_groups``. Default is None.
+            travel_time_provider (Optional[TravelTimeProvider]): Optional source of the travel
+                times of locations added later, e.g. by ``add_groups``. Default is None.
+
+        Returns:
+            DinnerInstance: The loaded DinnerInstance.
+
+        Raises:
+            ValueError: If the file is not a snapshot.
+        """
+        header, arrays = Snapshot.load(filename, mmap)
+        if header.get("version") != 1:
+            raise ValueError(f"Unsupported snapshot version {header.get('version')}.")
+        locations = [Location(Coordinates(lat, lon)) for lat, lon in arrays["coordinates"].tolist()]
+        transport_modes = header.get("group_transport_modes") or [None] * len(header["group_names"])
+        groups = [Group(name, locations[location], host_event_id, transport_mode)
+                  for name, location, host_event_id, transport_mode
+                  in zip(header["group_names"], arrays["group_locations"].tolist(),
+                         arrays["group_host_events"].tolist(), transport_modes)]
+        travel_times = TravelTimes.from_matrix(locations, arrays["travel_times"],
+                                               header.get("transport_mode", TravelTimeProvider.transport_mode),
+                                               header.get("measurement", TravelTimeProvider.measurement))
+        for transport_mode, measurement, name in header.get("profiles", list()):
+            travel_times.set_profile(transport_mode, arrays[name], measurement)
+        travel_times.provider = travel_time_provider
+        after_party = locations[header["after_party"]] if header["after_party"] is not None else None
+        instance = cls.from_data(header["events"], groups, travel_times, after_party)
+        instance.country_code = header["country_code"]
+        instance.city_address = header["city_address"]
+        if header["city_location"] is not None:
+            instance.city_location = Location(Coordinates(*header["city_location"]))
+        instance.geocoder = geocoder
+        return instance
+
+    def itineraries(self, solution: Dict[Group, List[Group]]) -> Iterator[Dict[str, Any]]:
+        """
+        Generates the itinerary of every group of a solution leg by leg, e.g. to
+        pipe it into other tools without keeping all legs in memory.
+
+        Args:
+            solution (Dict[Group, List[Group]]): The solution containing groups and their hosts.
+
+        Yields:
+            Dict[str, Any]: One row per leg with the origin, destination, their coordinates,
+            the travel time and the guests met at the destination, see ``SolutionExporter``.
+        """
+        return SolutionExporter(self).legs(solution)
+
+    def export(self,
+               filename: str,
+               solution: Dict[Group, List[Group]],
+               format: Optional[str] = None) -> int:
+        """
+        Writes the itineraries of a solution incrementally as CSV, JSON Lines or Parquet file.
+
+        Args:
+            filename (str): The name of the file.
+            solution (Dict[Group, List[Group]]): The solution containing groups and their hosts.
+            format (Optional[str]): One of "csv", "jsonl" and "parquet". Defaults to the
+                extension of the filename.
+
+        Returns:
+            int: The number of written legs.
+
+        Raises:
+            ValueError: If the format is unknown.
+            ImportError: If the format is Parquet and pyarrow is not installed.
+        """
+        return SolutionExporter(self).export(filename, solution, format)
+
+    def save_map(self, filename: str, solution: Dict[Group, List[Group]], compact: bool = False) -> None:
         """
         Saves a map with the locations of the groups and the after party.
 
+        By default every group gets its own markers and lines, which can be shown
+        with a tag filter button. The compact map emits every location and every
+        route once and filters them in the browser, so that it stays small for
+        large instances.
+
         Args:
             filename (str): The name of the file to save the map to.
             solution (Dict[Group, List[Group]]): The solution containing groups and their hosts.
+            compact (bool): Whether to save the compact map. Default is False.
         """
+        import folium
+        from folium.plugins import TagFilterButton
+        from model.RouteMap import RouteMap
+
         # Find the center of the map
         min_lat, min_lon, max_lat, max_lon = None, None, None, None
         for location in self.all_locations:
@@ -231,6 +880,11 @@ class DinnerInstance:
         # Create a map
         mymap = folium.Map(location=map_center, zoom_start=15, tiles='OpenStreetMap')
 
+        if compact:
+            RouteMap(self.events, solution, self.groups, self.after_party).add_to(mymap)
+            mymap.save(filename)
+            return
+
         party_event = ["Party"] if self.after_party is not None else list()
 
         # Add markers for each address
@@ -0,0 +1,746 @@
+import os
+import warnings
+import numpy as np
+from tempfile import mkstemp
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+from model.Group import Group
+from model.HighsSolver import HighsSolver
+from model.CbcLog import CbcLog
+from model.SolveStats import SolveProgress, SolveStats, relative_gap
+from model.SparseModel import SparseModel, ragged_arange
+from pulp import LpVariable, LpBinary, LpInteger, LpContinuous, LpProblem, LpMinimize, LpSolver, LpStatus, \
+    LpAffineExpression, lpSum, listSolvers, getSolver, value, PULP_CBC_CMD, COIN_CMD, LpSolutionOptimal, \
+    LpSolutionIntegerFeasible, LpSolutionInfeasible, LpSolutionUnbounded, LpSolutionNoSolutionFound
+
+try:
+    from resource import getrusage, RUSAGE_CHILDREN
+except ImportError:
+    getrusage = None
+
+if TYPE_CHECKING:
+    from model.DinnerInstance import DinnerInstance
+
+
+class DinnerModel:
+    """
+    Mixed-integer programming model of a running dinner instance, built with PuLP.
+
+    Two formulations are available:
+
+    - ``"full"``: the original model with an assignment variable for every
+      group-host pair and an encounter variable for every pair of groups and
+      every host.
+    - ``"compact"``: assignment variables only for feasible (group, host) pairs,
+      i.e. a group either visits itself or a host of another event, encounter
+      variables only for hosts both groups can visit, one meet-at-most-once row
+      per pair of groups and aggregated travel time constraints that need
+      O(G²) instead of O(G³) rows. It is generated in bulk from integer-indexed
+      arrays into a ``SparseModel``.
+
+    Both formulations share the same objective and yield the same optimum.
+    The time spent in each phase of building and solving is collected in ``stats``.
+    """
+
+    FORMULATIONS = ("full", "compact")
+    SOLUTION_STATUSES = {LpSolutionOptimal: "Optimal",
+                         LpSolutionIntegerFeasible: "Feasible",
+                         LpSolutionInfeasible: "Infeasible",
+                         LpSolutionUnbounded: "Unbounded",
+                         LpSolutionNoSolutionFound: "Not Solved"}
+
+    def __init__(self, instance: "DinnerInstance", formulation: str = "full") -> None:
+        """
+        Builds the variables and constraints of the model. The objective is set
+        separately by calling ``set_objective``.
+
+        Args:
+            instance (DinnerInstance): The instance to build the model for.
+            formulation (str): Either "full" or "compact". Default is "full".
+
+        Raises:
+            ValueError: If the formulation is unknown.
+        """
+        if formulation not in self.FORMULATIONS:
+            raise ValueError(f"Unknown formulation {formulation}, expected one of {', '.join(self.FORMULATIONS)}.")
+        self.instance = instance
+        self.formulation = formulation
+        self.stats = SolveStats()
+        self.sparse: Optional[SparseModel] = None
+        self.penalties: Optional[Tuple[float, float, float]] = None
+        self.start: Optional[np.ndarray] = None
+        self._change_cost: Optional[np.ndarray] = None
+        self.values: Optional[np.ndarray] = None
+        self.objective: Optional[float] = None
+        self.groups = instance.groups
+        self.num_events = len(instance.events)
+        self._prob: Optional[LpProblem] = None
+        self.x = dict()
+        self.y = dict()
+        self.z = dict()
+        self.t = dict()
+
+        # travel time coefficients between the group locations, read by the profile of the travelling
+        # group and the positions of the origin and destination
+        self.position = {group: i for i, group in enumerate(self.groups)}
+        self.location_indices = instance.travel_times.indices(group.location for group in self.groups)
+        self.profile, self.times, self.final_times = instance.group_travel_times()
+
+        if formulation == "full":
+            self._prob = LpProblem("Running-Dinner", LpMinimize)
+            self._build_full()
+            self.stats.num_variables = self._prob.numVariables()
+            self.stats.num_constraints = self._prob.numConstraints()
+            self.stats.num_nonzeros = sum(len(constraint) for constraint in self._prob.constraints.values())
+        else:
+            self._build_compact()
+            self.stats.num_variables = self.sparse.num_columns
+            self.stats.num_constraints = self.sparse.num_rows
+            self.stats.num_nonzeros = self.sparse.num_nonzeros
+
+    def _travel_time(self, group: Group, origin: Group, destination: Group) -> float:
+        return float(self.times[self.profile[self.position[group]], self.position[origin], self.position[destination]])
+
+    def _destination_time(self, group: Group, host: Group) -> float:
+        if self.final_times is None:
+            return self._travel_time(group, host, group)
+        return float(self.final_times[self.profile[self.position[group]], self.position[host]])
+
+    def _build_common_variables(self) -> None:
+        # Maximum travel time variables
+        for e in range(self.num_events - 1):
+            self.t[e] = LpVariable(f"t[{e}]", lowBound=0, cat=LpContinuous)
+
+        # auxiliary variable for penalties
+        for host in self.groups:
+            self.z[1, host] = LpVariable("z[1,{0}]".format(host.name), cat=LpBinary)
+        for host in self.groups:
+            self.z[2, host] = LpVariable("z[2,{0}]".format(host.name), cat=LpBinary)
+
+    def _build_full(self) -> None:
+        groups = self.groups
+        hosts_by_events = self.instance.hosts_by_events
+        x, y, z, t = self.x, self.y, self.z, self.t
+        prob = self._prob
+        last_event = self.num_events - 2
+        start_perf_counter = perf_counter()
+
+        # Assignment variables
+        for group in groups:
+            for host in groups:
+                x[group, host] = LpVariable(f"x[{group.name},{host.name}]", cat=LpBinary)
+
+        self._build_common_variables()
+
+        # auxiliary variable to check if two teams meet at one location
+        for g1 in range(len(groups)-1):
+            for g2 in range(g1+1, len(groups)):
+                for host in groups:
+                    y[groups[g1], groups[g2], host] = LpVariable("y[{0},{1},{2}]".format(groups[g1].name, groups[g2].name, host.name), cat=LpBinary)
+        for g1 in range(len(groups)-1):
+            for g2 in range(g1+1, len(groups)):
+                z[3, groups[g1], groups[g2]] = LpVariable("z[3,{0},{1}]".format(groups[g1].name, groups[g2].name), lowBound=0, cat=LpInteger)
+        self.stats.add_time("variables", perf_counter() - start_perf_counter)
+        start_perf_counter = perf_counter()
+
+        # link from assignment to travel time variables
+        for group in groups:
+            # travel times after start event: each group start from its home
+            prob += lpSum(self._travel_time(group, group, host) * x[group, host]
+                          for host in hosts_by_events[1]
+                          ) <= t[0]
+            # travel times between main events
+            for e in range(1, last_event):
+                for host1 in hosts_by_events[e]:
+                    for host2 in hosts_by_events[e+1]:
+                        prob += self._travel_time(group, host1, host2) * (x[group, host1] + x[group, host2] - 1) <= t[e]
+            # travel times to end event: each group travels to its home or to the party location
+            prob += lpSum(self._destination_time(group, host) * x[group, host]
+                          for host in hosts_by_events[last_event]
+                          ) <= t[last_event]
+
+        # each group must visit exactly one group for each main event
+        for group in groups:
+            for e in range(1, last_event+1):
+                prob += lpSum(x[group, host]
+                              for host in hosts_by_events[e]
+                              ) == 1
+
+        # each group visits itself when it hosts
+        for group in groups:
+            prob += x[group, group] == 1
+
+        # if a group is hosting an event, three groups must be present. Deviations are penalized.
+        for host in groups:
+            prob += lpSum(x[group, host] for group in groups) == 3 - z[1, host] + z[2, host]
+
+        # count how often teams meet during the main events
+        for g1 in range(len(groups)-1):
+            for g2 in range(g1+1, len(groups)):
+                for host in groups:
+                    prob += x[groups[g1], host] + x[groups[g2], host] <= 1 + y[groups[g1], groups[g2], host]
+
+        # teams may only meet up to once. More meetings are penalized.
+        for g1 in range(len(groups)-1):
+            for g2 in range(g1+1, len(groups)):
+                for host in groups:
+                    prob += lpSum(y[groups[g1], groups[g2], host] for host in groups) <= 1 + z[3, groups[g1], groups[g2]]
+        self.stats.add_time("constraints", perf_counter() - start_perf_counter)
+
+    def _build_compact(self) -> None:
+        groups = self.groups
+        G = len(groups)
+        n = self.num_events - 2
+        sparse = self.sparse = SparseModel()
+        times = self.times.astype(np.float64)
+        profile = self.profile
+
+        # integer indexing: host event of each group, hosts of each event and rank of each host among them
+        host_event = np.array([group.host_event_id for group in groups], dtype=np.int64)
+        hosts = {e: np.flatnonzero(host_event == e) for e in range(1, n+1)}
+        rank = np.zeros(G, dtype=np.int64)
+        for e in range(1, n+1):
+            rank[hosts[e]] = np.arange(len(hosts[e]))
+
+        start_perf_counter = perf_counter()
+        # Assignment variables, grouped by event and group: a group stays at home for its own event
+        # and can visit every host of the other events. Hosts visit themselves by their lower bound.
+        x_start = np.zeros((n+2, G), dtype=np.int64)
+        x_count = np.zeros((n+2, G), dtype=np.int64)
+        xg, xh, xe = list(), list(), list()
+        offset = 0
+        for e in range(1, n+1):
+            count = np.where(host_event == e, 1, len(hosts[e]))
+            event_groups = np.repeat(np.arange(G), count)
+            event_hosts = np.empty_like(event_groups)
+            home = host_event[event_groups] == e
+            event_hosts[home] = event_groups[home]
+            event_hosts[~home] = np.tile(hosts[e], G - len(hosts[e]))
+            x_count[e] = count
+            x_start[e] = offset + np.cumsum(count) - count
+            offset += len(event_groups)
+            xg.append(event_groups)
+            xh.append(event_hosts)
+            xe.append(np.full(len(event_groups), e))
+        xg, xh, xe = np.concatenate(xg), np.concatenate(xh), np.concatenate(xe)
+        x_columns = sparse.add_columns("x", len(xg), lower=(xg == xh).astype(np.float64), upper=1, integer=True)
+        t_columns = sparse.add_columns("t", n+1)
+        z1_columns = sparse.add_columns("z1", G, upper=1, integer=True)
+        z2_columns = sparse.add_columns("z2", G, upper=1, integer=True)
+
+        # encounter variables for each host and pair of groups that can both visit it: the pairs of
+        # guests of its event and the pairs of the host with one of the guests
+        yg1, yg2, yh = list(), list(), list()
+        for e in range(1, n+1):
+            guests = np.flatnonzero(host_event != e)
+            first, second = np.triu_indices(len(guests), k=1)
+            yg1.append(np.tile(guests[first], len(hosts[e])))
+            yg2.append(np.tile(guests[second], len(hosts[e])))
+            yh.append(np.repeat(hosts[e], len(first)))
+            guest = np.tile(guests, len(hosts[e]))
+            host = np.repeat(hosts[e], len(guests))
+            yg1.append(np.minimum(guest, host))
+            yg2.append(np.maximum(guest, host))
+            yh.append(host)
+        yg1, yg2, yh = np.concatenate(yg1), np.concatenate(yg2), np.concatenate(yh)
+        # Since the encounter variables are only bounded from below and penalized through z3, they can be continuous.
+        y_columns = sparse.add_columns("y", len(yh), upper=1)
+        pair_first, pair_second = np.triu_indices(G, k=1)
+        z3_columns = sparse.add_columns("z3", len(pair_first))
+        self._columns = dict(x=x_columns, t=t_columns, z1=z1_columns, z2=z2_columns, y=y_columns, z3=z3_columns)
+        self._host_event = host_event
+        self._x_groups, self._x_hosts, self._x_events = xg, xh, xe
+        self._y_groups, self._y_hosts = (yg1, yg2), yh
+        self._pairs = (pair_first, pair_second)
+        self.stats.add_time("variables", perf_counter() - start_perf_counter)
+
+        start_perf_counter = perf_counter()
+        # travel times after start event: each group start from its home
+        first = np.flatnonzero(xe == 1)
+        sparse.add_rows("leg0", G,
+                        np.concatenate((xg[first], np.arange(G))),
+                        np.concatenate((x_columns[first], np.full(G, t_columns[0]))),
+                        np.concatenate((times[profile[xg[first]], xg[first], xh[first]], np.full(G, -1.0))),
+                        upper=0)
+        # travel times between main events: the leg from host1 is only binding if host1 is visited
+        for e in range(1, n):
+            origins = np.flatnonzero(xe == e)
+            origin_groups = xg[origins]
+            counts = x_count[e+1][origin_groups]
+            rows = np.repeat(np.arange(len(origins)), counts)
+            destinations = ragged_arange(x_start[e+1][origin_groups], counts)
+            legs = times[profile[origin_groups][rows], xh[origins][rows], xh[destinations]]
+            max_legs = np.maximum.reduceat(legs, np.cumsum(counts) - counts)
+            sparse.add_rows(f"leg{e}", len(origins),
+                            np.concatenate((rows, np.arange(len(origins)), np.arange(len(origins)))),
+                            np.concatenate((x_columns[destinations], x_columns[origins], np.full(len(origins), t_columns[e]))),
+                            np.concatenate((legs, max_legs, np.full(len(origins), -1.0))),
+                            upper=max_legs)
+        # travel times to end event: each group travels to its home or to the party location
+        last = np.flatnonzero(xe == n)
+        if self.final_times is None:
+            last_legs = times[profile[xg[last]], xh[last], xg[last]]
+        else:
+            last_legs = self.final_times.astype(np.float64)[profile[xg[last]], xh[last]]
+        sparse.add_rows(f"leg{n}", G,
+                        np.concatenate((xg[last], np.arange(G))),
+                        np.concatenate((x_columns[last], np.full(G, t_columns[n]))),
+                        np.concatenate((last_legs, np.full(G, -1.0))),
+                        upper=0)
+
+        # each group must visit exactly one group for each main event
+        visits = np.flatnonzero(host_event[xg] != xe)
+        keys, rows = np.unique(xe[visits] * G + xg[visits], return_inverse=True)
+        sparse.add_rows("visit", len(keys), rows, x_columns[visits], np.ones(len(visits)), lower=1, upper=1)
+
+        # if a group is hosting an event, three groups must be present. Deviations are penalized.
+        sparse.add_rows("host", G,
+                        np.concatenate((xh, np.arange(G), np.arange(G))),
+                        np.concatenate((x_columns, z1_columns, z2_columns)),
+                        np.concatenate((np.ones(len(xh)), np.ones(G), np.full(G, -1.0))),
+                        lower=3, upper=3)
+
+        # count how often teams meet at hosts both teams can visit
+        def x_column(group: np.ndarray, host: np.ndarray) -> np.ndarray:
+            return x_columns[x_start[host_event[host], group] + np.where(group == host, 0, rank[host])]
+
+        num_y = len(yh)
+        sparse.add_rows("meet", num_y,
+                        np.tile(np.arange(num_y), 3),
+                        np.concatenate((x_column(yg1, yh), x_column(yg2, yh), y_columns)),
+                        np.concatenate((np.ones(2 * num_y), np.full(num_y, -1.0))),
+                        upper=1)
+
+        # teams may only meet up to once. More meetings are penalized. Pairs with a single
+        # common host cannot meet twice and need no row.
+        pairs = yg1 * G - yg1 * (yg1 + 1) // 2 + yg2 - yg1 - 1
+        repeated = np.flatnonzero(np.bincount(pairs, minlength=len(pair_first)) >= 2)
+        row_of_pair = np.full(len(pair_first), -1)
+        row_of_pair[repeated] = np.arange(len(repeated))
+        in_rows = np.flatnonzero(row_of_pair[pairs] >= 0)
+        sparse.add_rows("once", len(repeated),
+                        np.concatenate((row_of_pair[pairs[in_rows]], np.arange(len(repeated)))),
+                        np.concatenate((y_columns[in_rows], z3_columns[repeated])),
+                        np.concatenate((np.ones(len(in_rows)), np.full(len(repeated), -1.0))),
+                        upper=1)
+
+        self.stats.add_time("constraints", perf_counter() - start_perf_counter)
+
+
+    @property
+    def prob(self) -> LpProblem:
+        """
+        LpProblem: The PuLP problem. The compact formulation creates it from its arrays on first access.
+        """
+        if self._prob is None:
+            self._to_pulp()
+        return self._prob
+
+    def _to_pulp(self) -> None:
+        """
+        Creates the PuLP problem of the compact formulation from its arrays,
+        together with its objective and initial values if they are set.
+        """
+        groups = self.groups
+        self._prob = LpProblem("Running-Dinner", LpMinimize)
+        start_perf_counter = perf_counter()
+        variables = self.variables = self.sparse.pulp_variables()
+        self.stats.add_time("variables", perf_counter() - start_perf_counter)
+        start_perf_counter = perf_counter()
+        self.sparse.add_pulp_constraints(self._prob, variables)
+        self.stats.add_time("constraints", perf_counter() - start_perf_counter)
+
+        start_perf_counter = perf_counter()
+        columns = self._columns
+        self.x.update(zip(zip([groups[g] for g in self._x_groups.tolist()], [groups[h] for h in self._x_hosts.tolist()]),
+                          [variables[c] for c in columns["x"].tolist()]))
+        self.y.update(zip(zip([groups[g] for g in self._y_groups[0].tolist()], [groups[g] for g in self._y_groups[1].tolist()],
+                              [groups[h] for h in self._y_hosts.tolist()]),
+                          [variables[c] for c in columns["y"].tolist()]))
+        self.t.update((e, variables[c]) for e, c in enumerate(columns["t"].tolist()))
+        self.z.update(((1, host), variables[c]) for host, c in zip(groups, columns["z1"].tolist()))
+        self.z.update(((2, host), variables[c]) for host, c in zip(groups, columns["z2"].tolist()))
+        self.z.update(((3, groups[g1], groups[g2]), variables[c])
+                      for g1, g2, c in zip(self._pairs[0].tolist(), self._pairs[1].tolist(), columns["z3"].tolist()))
+        if self.penalties is not None:
+            self._set_pulp_objective(*self.penalties)
+        if self.start is not None:
+            for c in np.flatnonzero(~np.isnan(self.start)).tolist():
+                variables[c].setInitialValue(float(self.start[c]))
+        self.stats.add_time("variables", perf_counter() - start_perf_counter)
+
+    def set_objective(self,
+                      penalty_too_few_guests: float,
+                      penalty_too_many_guests: float,
+                      penalty_multiple_encounters: float) -> None:
+        """
+        Sets or replaces the objective of the model.
+
+        Args:
+            penalty_too_few_guests (float): The penalty for having fewer than two guests at a hosted event.
+            penalty_too_many_guests (float): The penalty for having more than two guests at a hosted event.
+            penalty_multiple_encounters (float): The penalty for multiple encounters between the same groups.
+        """
+        self.penalties = (penalty_too_few_guests, penalty_too_many_guests, penalty_multiple_encounters)
+        if self.sparse is not None:
+            columns = self._columns
+            self.sparse.cost[:] = 0
+            self.sparse.cost[columns["t"]] = 1
+            self.sparse.cost[columns["z1"]] = penalty_too_few_guests
+            self.sparse.cost[columns["z2"]] = penalty_too_many_guests
+            self.sparse.cost[columns["z3"]] = penalty_multiple_encounters
+            if self._change_cost is not None:
+                self.sparse.cost += self._change_cost
+        if self._prob is not None:
+            self._set_pulp_objective(*self.penalties)
+
+    def _set_pulp_objective(self,
+                            penalty_too_few_guests: float,
+                            penalty_too_many_guests: float,
+                            penalty_multiple_encounters: float) -> None:
+        penalties = {1: penalty_too_few_guests, 2: penalty_too_many_guests, 3: penalty_multiple_encounters}
+        change_terms = list()
+        if self._change_cost is not None:
+            change_terms = [(self.variables[c], self._change_cost[c]) for c in np.flatnonzero(self._change_cost).tolist()]
+        self._prob.setObjective(LpAffineExpression(
+            [(self.t[e], 1) for e in range(self.num_events-1)]
+            + [(variable, penalties[key[0]]) for key, variable in self.z.items()]
+            + change_terms))
+
+    def set_initial_solution(self, solution: Dict[Group, List[Group]]) -> bool:
+        """
+        Sets the initial values of the variables from a solution, to be passed
+        to the solver as MIP start. Groups and hosts that are not part of the
+        instance are ignored. If the solution does not assign every group to one
+        host per event, e.g. after a group dropped out, only the assignment
+        variables of the known groups are set and the solver completes the start.
+        A solution with fewer than two or more than four groups at a host violates
+        the host rows, would be discarded by the solver and is therefore not used,
+        with a warning.
+
+        Args:
+            solution (Dict[Group, List[Group]]): The solution mapping each group to its hosts.
+
+        Returns:
+            bool: Whether the solution is used as MIP start.
+        """
+        groups = self.groups
+        num_main_events = self.num_events - 2
+        solution = self._restrict(solution)
+        infeasible = self._infeasible_hosts(solution)
+        if infeasible:
+            warnings.warn(f"The initial solution is not used as MIP start, since {len(infeasible)} hosts, e.g. "
+                          f"{infeasible[0].name}, do not have two to four groups.", RuntimeWarning, stacklevel=2)
+            return False
+        if self.sparse is not None:
+            self.start = self._start_values(solution)
+            if self._prob is not None:
+                for c in np.flatnonzero(~np.isnan(self.start)).tolist():
+                    self.variables[c].setInitialValue(float(self.start[c]))
+            return True
+        for (group, host), variable in self.x.items():
+            if group in solution:
+                variable.setInitialValue(1 if host in solution[group] else 0)
+        if len(solution) < len(groups) or any(len(hosts) != num_main_events for hosts in solution.values()):
+            return True
+
+        # maximum travel times between the events
+        legs = [[self._travel_time(group, group, hosts[0]) for group, hosts in solution.items()]]
+        for e in range(num_main_events - 1):
+            legs.append([self._travel_time(group, hosts[e], hosts[e+1]) for group, hosts in solution.items()])
+        legs.append([self._destination_time(group, hosts[-1]) for group, hosts in solution.items()])
+        for e, event_legs in enumerate(legs):
+            self.t[e].setInitialValue(max(event_legs))
+
+        # penalties for too few or too many guests
+        counts = {host: 0 for host in groups}
+        for hosts in solution.values():
+            for host in hosts:
+                counts[host] += 1
+        for host in groups:
+            self.z[1, host].setInitialValue(1 if counts[host] < 3 else 0)
+            self.z[2, host].setInitialValue(1 if counts[host] > 3 else 0)
+
+        # encounters of pairs of groups
+        visited = {group: set(hosts) for group, hosts in solution.items()}
+        for (group1, group2, host), variable in self.y.items():
+            variable.setInitialValue(1 if host in visited[group1] and host in visited[group2] else 0)
+        for g1 in range(len(groups)-1):
+            for g2 in range(g1+1, len(groups)):
+                group1, group2 = groups[g1], groups[g2]
+                self.z[3, group1, group2].setInitialValue(max(0, len(visited[group1] & visited[group2]) - 1))
+        return True
+
+    def _infeasible_hosts(self, solution: Dict[Group, List[Group]]) -> List[Group]:
+        """
+        Returns the hosts of a solution of known groups and hosts that violate the host rows,
+        i.e. that have more than four groups or, if the solution is complete, fewer than two.
+        """
+        assign, known = self._assignment(solution)
+        counts = np.bincount(assign[:, 1:][assign[:, 1:] >= 0], minlength=len(self.groups))
+        infeasible = counts > 4
+        if known.all() and (assign[:, 1:] >= 0).all():
+            infeasible |= counts < 2
+        return [self.groups[h] for h in np.flatnonzero(infeasible).tolist()]
+
+    def _assignment(self, solution: Dict[Group, List[Group]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Converts a solution of known groups and hosts to integer indices.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The position of the host of each group (rows) at
+            each main event (columns 1 to n), -1 if unknown, and whether each group is part
+            of the solution.
+        """
+        assign = np.full((len(self.groups), self.num_events - 1), -1, dtype=np.int64)
+        known = np.zeros(len(self.groups), dtype=bool)
+        for group, hosts in solution.items():
+            known[self.position[group]] = True
+            for host in hosts:
+                assign[self.position[group], host.host_event_id] = self.position[host]
+        return assign, known
+
+    def _restrict(self, solution: Dict[Group, List[Group]]) -> Dict[Group, List[Group]]:
+        return {group: [host for host in hosts if host in self.position]
+                for group, hosts in solution.items() if group in self.position}
+
+    def fix_assignments(self, solution: Dict[Group, List[Group]]) -> None:
+        """
+        Fixes the hosts of the groups of a (partial) solution in the compact
+        formulation, e.g. to keep the routes of groups unaffected by a change.
+        Groups and hosts that are not part of the instance are ignored.
+
+        Args:
+            solution (Dict[Group, List[Group]]): The groups to fix and their hosts.
+
+        Raises:
+            ValueError: If the formulation is not compact.
+        """
+        if self.sparse is None:
+            raise ValueError("Fixing assignments requires the compact formulation.")
+        assign, known = self._assignment(self._restrict(solution))
+        xg, xh, xe = self._x_groups, self._x_hosts, self._x_events
+        fixed = np.flatnonzero(known[xg] & (assign[xg, xe] >= 0))
+        values = (assign[xg[fixed], xe[fixed]] == xh[fixed]).astype(np.float64)
+        columns = self._columns["x"][fixed]
+        self.sparse.set_column_bounds(columns, values, values)
+        if self._prob is not None:
+            for c, fixed_value in zip(columns.tolist(), values.tolist()):
+                self.variables[c].lowBound = self.variables[c].upBound = fixed_value
+
+    def set_reference_solution(self, solution: Dict[Group, List[Group]], penalty_change: float) -> None:
+        """
+        Penalizes every host of a group of the compact formulation that differs
+        from a reference solution, e.g. to re-plan with minimal disruption.
+
+        Args:
+            solution (Dict[Group, List[Group]]): The reference hosts of some groups.
+            penalty_change (float): The penalty for each changed host of a group.
+
+        Raises:
+            ValueError: If the formulation is not compact.
+        """
+        if self.sparse is None:
+            raise ValueError("A reference solution requires the compact formulation.")
+        assign, known = self._assignment(self._restrict(solution))
+        xg, xh, xe = self._x_groups, self._x_hosts, self._x_events
+        changed = known[xg] & (assign[xg, xe] >= 0) & (assign[xg, xe] != xh)
+        self._change_cost = np.zeros(self.sparse.num_columns)
+        self._change_cost[self._columns["x"][changed]] = penalty_change
+        if self.penalties is not None:
+            self.set_objective(*self.penalties)
+
+    def _start_values(self, solution: Dict[Group, List[Group]]) -> np.ndarray:
+        """
+        Computes the initial values of the columns of the compact formulation.
+
+        Args:
+            solution (Dict[Group, List[Group]]): The solution restricted to known groups and hosts.
+
+        Returns:
+            np.ndarray: The initial value of each column, NaN if unknown.
+        """
+        G = len(self.groups)
+        n = self.num_events - 2
+        columns = self._columns
+        host_event = self._host_event
+        start = np.full(self.sparse.num_columns, np.nan)
+        assign, known = self._assignment(solution)
+        xg, xh, xe = self._x_groups, self._x_hosts, self._x_events
+        start[columns["x"][known[xg]]] = (assign[xg, xe] == xh)[known[xg]]
+        if not known.all() or (assign[:, 1:] < 0).any():
+            return start
+
+        # maximum travel times between the events
+        times, profile = self.times, self.profile
+        everyone = np.arange(G)
+        legs = [times[profile, everyone, assign[:, 1]]]
+        for e in range(1, n):
+            legs.append(times[profile, assign[:, e], assign[:, e+1]])
+        legs.append(times[profile, assign[:, n], everyone] if self.final_times is None
+                    else self.final_times[profile, assign[:, n]])
+        start[columns["t"]] = [float(np.max(event_legs)) for event_legs in legs]
+
+        # penalties for too few or too many guests
+        counts = np.bincount(assign[:, 1:].ravel(), minlength=G)
+        start[columns["z1"]] = counts < 3
+        start[columns["z2"]] = counts > 3
+
+        # encounters of pairs of groups
+        (yg1, yg2), yh = self._y_groups, self._y_hosts
+        start[columns["y"]] = (assign[yg1, host_event[yh]] == yh) & (assign[yg2, host_event[yh]] == yh)
+        first, second = self._pairs
+        common = (assign[first, 1:] == assign[second, 1:]).sum(axis=1)
+        start[columns["z3"]] = np.maximum(common - 1, 0)
+        return start
+
+    @staticmethod
+    def get_solver(prioritized_solver_str: Optional[str] = None, **options: Any) -> LpSolver:
+        """
+        Returns the prioritized solver if it is known to PuLP and available, otherwise CBC.
+
+        Args:
+            prioritized_solver_str (Optional[str]): The name of the prioritized PuLP solver. Default is None.
+            **options (Any): Further solver options, e.g. warmStart, timeLimit, gapRel or threads.
+
+        Returns:
+            LpSolver: The selected solver.
+        """
+        selected_solver = PULP_CBC_CMD(msg=0, **options)
+        if prioritized_solver_str is not None and prioritized_solver_str in listSolvers():
+            prioritized_solver = getSolver(prioritized_solver_str, msg=0, **options)
+            if prioritized_solver.available:
+                selected_solver = prioritized_solver
+        return selected_solver
+
+    def solve(self,
+              solver: Union[LpSolver, HighsSolver],
+              progress: Optional[Callable[[SolveProgress], None]] = None) -> int:
+        """
+        Solves the model and records the solver I/O and solve time, the status,
+        the lower bound and the gap in ``stats``.
+
+        A HighsSolver receives the arrays of the compact formulation directly.
+        PuLP command line solvers write the model to a file, run in a child
+        process and write the solution back, so the CPU time of the child
+        processes is counted as solve time and the remaining wall time as solver I/O.
+        The log of CBC is followed to report progress and read the final bound,
+        other PuLP solvers only report the final result.
+
+        Args:
+            solver (Union[LpSolver, HighsSolver]): The solver, e.g. from ``get_solver``.
+            progress (Optional[Callable[[SolveProgress], None]]): Optional callback for new
+                incumbents and bounds while solving and the final result. Default is None.
+
+        Returns:
+            int: The PuLP status code, which is optimal whenever a solution was found. Use
+            ``stats.status`` to distinguish optimal from feasible solutions.
+
+        Raises:
+            ValueError: If a HighsSolver is used with the full formulation.
+        """
+        if isinstance(solver, HighsSolver):
+            if self.sparse is None:
+                raise ValueError("The HiGHS backend requires the compact formulation.")
+            status, self.values, self.objective = solver.solve(self.sparse, self.start, self.stats, progress)
+        else:
+            prob = self.prob
+            children_time = self._children_time()
+            start_perf_counter = perf_counter()
+            log, log_path = None, None
+            if isinstance(solver, COIN_CMD) and not solver.msg and solver.optionsDict.get("logPath") is None:
+                descriptor, log_path = mkstemp(suffix=".log")
+                os.close(descriptor)
+                solver.optionsDict["logPath"] = log_path
+                log = CbcLog(log_path, progress)
+            try:
+                if log is not None:
+                    with log:
+                        status = prob.solve(solver)
+                else:
+                    status = prob.solve(solver)
+            finally:
+                if log_path is not None:
+                    del solver.optionsDict["logPath"]
+                    os.remove(log_path)
+            elapsed = perf_counter() - start_perf_counter
+            solve_time = self._children_time() - children_time
+            if solve_time <= 0:
+                solve_time = elapsed
+            solve_time = min(solve_time, elapsed)
+            self.stats.add_time("solver_io", elapsed - solve_time)
+            self.stats.add_time("solve", solve_time)
+            self.objective = value(prob.objective)
+            if self.sparse is not None:
+                self.values = np.array([variable.varValue or 0.0 for variable in self.variables])
+            self.stats.status = self.SOLUTION_STATUSES.get(prob.sol_status, LpStatus[status])
+            if self.stats.status not in ("Optimal", "Feasible"):
+                self.objective = None
+            # CBC only prints its final bound when it stops early, optimal means within the gap tolerance
+            bound = log.bound if log is not None else None
+            if self.stats.status == "Optimal":
+                bound = self.objective
+            self.stats.bound = bound
+            self.stats.gap = relative_gap(self.objective, bound)
+            if progress is not None:
+                progress(SolveProgress(elapsed, self.objective, self.stats.bound, self.stats.gap))
+        self.stats.solver = solver.name
+        self.stats.objective = self.objective
+        return status
+
+    @staticmethod
+    def _children_time() -> float:
+        if getrusage is None:
+            return 0.0
+        usage = getrusage(RUSAGE_CHILDREN)
+        return usage.ru_utime + usage.ru_stime
+
+    def objective_components(self) -> Tuple[List[float], int, int, int]:
+        """
+        Reads the components of the objective from the solved model.
+
+        Returns:
+            Tuple[List[float], int, int, int]: The maximum travel time between each pair of
+            consecutive events, the numbers of missing and of additional guests at hosts
+            and the number of repeated encounters.
+        """
+        if self.sparse is not None:
+            values = self.values if self.values is not None else np.zeros(self.sparse.num_columns)
+            columns = self._columns
+            return (values[columns["t"]].tolist(),
+                    int(round(values[columns["z1"]].sum())),
+                    int(round(values[columns["z2"]].sum())),
+                    int(round(values[columns["z3"]].sum())))
+
+        def total(variables):
+            return int(round(sum(variable.value() or 0 for variable in variables)))
+
+        return ([self.t[e].value() or 0.0 for e in range(self.num_events - 1)],
+                total(self.z[1, host] for host in self.groups),
+                total(self.z[2, host] for host in self.groups),
+                total(variable for key, variable in self.z.items() if key[0] == 3))
+
+    def extract_solution(self) -> Dict[Group, List[Group]]:
+        """
+        Reads the assignment from the solved model.
+
+        Returns:
+            Dict[Group, List[Group]]: A dictionary mapping each group to a sorted list
+            of the hosts that the group visits (including itself if it is hosting).
+        """
+        start_perf_counter = perf_counter()
+        solution = {group: list() for group in self.groups}
+        if self.sparse is not None:
+            # the columns are ordered by event, so the hosts of each group are added in event order
+            if self.values is not None:
+                chosen = np.flatnonzero(self.values[self._columns["x"]] > 0.99)
+                for g, h in zip(self._x_groups[chosen].tolist(), self._x_hosts[chosen].tolist()):
+                    solution[self.groups[g]].append(self.groups[h])
+        else:
+            for (group, host), variable in self.x.items():
+                if (variable.value() or 0) > 0.99:
+                    solution[group].append(host)
+            for hosts in solution.values():
+                hosts.sort(key=lambda host: host.host_event_id)
+        self.stats.add_time("extraction", perf_counter() - start_perf_counter)
+        return solution
@@ -0,0 +1,157 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from model.Coordinates import Coordinates
+from model.GeocodingCache import GeocodingCache
+from model.OrsSession import OrsSession
+
+
+class Geocoder(ABC):
+    """
+    Interface for geocoding services that turn addresses into coordinates,
+    optionally backed by a cache.
+    """
+
+    def __init__(self, cache: Optional[GeocodingCache] = None) -> None:
+        """
+        Initializes the Geocoder.
+
+        Args:
+            cache (Optional[GeocodingCache]): Optional cache for geocoding results. Default is None.
+        """
+        self.cache = cache
+
+    def geocode(self, address: str, country_code: str, focus: Optional[Coordinates] = None) -> Coordinates:
+        """
+        Geocodes an address, answering from the cache if possible.
+
+        Args:
+            address (str): The address to geocode.
+            country_code (str): The country code.
+            focus (Optional[Coordinates]): Optional focus coordinates to bias the geocoding.
+
+        Returns:
+            Coordinates: The coordinates of the address.
+        """
+        if self.cache is None:
+            return self._geocode(address, country_code, focus)
+        key = GeocodingCache.make_key(address, country_code, focus)
+        coordinates = self.cache.get(key)
+        if coordinates is None:
+            coordinates = self._geocode(address, country_code, focus)
+            self.cache.set(key, coordinates)
+        return coordinates
+
+    def geocode_many(self, queries: Iterable[Tuple[str, str, Optional[Coordinates]]]) -> List[Coordinates]:
+        """
+        Geocodes a batch of addresses. Cached and repeated queries are only
+        resolved once and the remaining ones are passed to ``_geocode_many``.
+
+        Args:
+            queries (Iterable[Tuple[str, str, Optional[Coordinates]]]): Tuples of address,
+                country code and optional focus coordinates.
+
+        Returns:
+            List[Coordinates]: The coordinates of the addresses in the order of the queries.
+        """
+        queries = list(queries)
+        keys = [GeocodingCache.make_key(*query) for query in queries]
+        results: Dict[str, Coordinates] = dict()
+        missing: Dict[str, Tuple[str, str, Optional[Coordinates]]] = dict()
+        for key, query in zip(keys, queries):
+            if key in results or key in missing:
+                continue
+            coordinates = self.cache.get(key) if self.cache is not None else None
+            if coordinates is None:
+                missing[key] = query
+            else:
+                results[key] = coordinates
+        for key, coordinates in zip(missing, self._geocode_many(list(missing.values()))):
+            if self.cache is not None:
+                self.cache.set(key, coordinates)
+            results[key] = coordinates
+        return [results[key] for key in keys]
+
+    def _geocode_many(self, queries: List[Tuple[str, str, Optional[Coordinates]]]) -> List[Coordinates]:
+        """
+        Geocodes a batch of addresses without using the cache, one after another.
+        Subclasses may override this to send requests concurrently.
+
+        Args:
+            queries (List[Tuple[str, str, Optional[Coordinates]]]): Tuples of address,
+                country code and optional focus coordinates.
+
+        Returns:
+            List[Coordinates]: The coordinates of the addresses in the order of the queries.
+        """
+        return [self._geocode(*query) for query in queries]
+
+    @abstractmethod
+    def _geocode(self, address: str, country_code: str, focus: Optional[Coordinates]) -> Coordinates:
+        """
+        Geocodes an address without using the cache.
+
+        Args:
+            address (str): The address to geocode.
+            country_code (str): The country code.
+            focus (Optional[Coordinates]): Optional focus coordinates to bias the geocoding.
+
+        Returns:
+            Coordinates: The coordinates of the address.
+        """
+
+
+class OrsGeocoder(Geocoder):
+    """
+    Geocoder using the OpenRouteService geocoding API. Batches are geocoded
+    concurrently over a pooled and rate limited session.
+    """
+
+    def __init__(self,
+                 auth_key: str,
+                 cache: Optional[GeocodingCache] = None,
+                 session: Optional[OrsSession] = None,
+                 max_workers: int = 8) -> None:
+        """
+        Initializes the OrsGeocoder.
+
+        Args:
+            auth_key (str): The authentication key for the OpenRouteService API.
+            cache (Optional[GeocodingCache]): Optional cache for geocoding results. Default is None.
+            session (Optional[OrsSession]): Optional session, e.g. with another base URL or rate
+                limit. Defaults to a session limited to the 100 requests per minute of the free plan.
+            max_workers (int): The number of concurrent requests of a batch. Default is 8.
+        """
+        super().__init__(cache)
+        self.auth_key = auth_key
+        self.session = session if session is not None else OrsSession(auth_key, requests_per_minute=100)
+        self.max_workers = max_workers
+
+    def _geocode_many(self, queries: List[Tuple[str, str, Optional[Coordinates]]]) -> List[Coordinates]:
+        if len(queries) <= 1:
+            return super()._geocode_many(queries)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(lambda query: self._geocode(*query), queries))
+
+    def _geocode(self, address: str, country_code: str, focus: Optional[Coordinates]) -> Coordinates:
+        """
+        Geocodes an address with the OpenRouteService API.
+
+        Raises:
+            RuntimeError: If there is an error in the geocoding response.
+        """
+        params = {
+            'api_key': self.auth_key,
+            'text': address,
+            'boundary.country': country_code,
+            'size': 1
+        }
+        if focus:
+            params['focus.point.lon'] = focus.lon
+            params['focus.point.lat'] = focus.lat
+        result = self.session.get('/geocode/search', params=params).json()
+        if "error" in result:
+            raise RuntimeError(f"Openrouteservice: {result['error']}")
+        lon_lat = result["features"][0]["geometry"]["coordinates"]
+        lat_lon = list(reversed(lon_lat))
+        return Coordinates(*lat_lon)
@@ -0,0 +1,171 @@
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from time import time
+from typing import Optional, Tuple
+from model.Coordinates import Coordinates
+
+
+class GeocodingCache(ABC):
+    """
+    Interface for caches of geocoding results, keyed by the normalized address,
+    the country code and the focus point of the query.
+    """
+
+    @staticmethod
+    def make_key(address: str, country_code: str, focus: Optional[Coordinates] = None) -> str:
+        """
+        Builds the cache key of a geocoding query. Addresses are compared case
+        insensitively and independent of surrounding or repeated whitespace.
+
+        Args:
+            address (str): The address to geocode.
+            country_code (str): The country code.
+            focus (Optional[Coordinates]): Optional focus coordinates of the query.
+
+        Returns:
+            str: The cache key.
+        """
+        normalized_address = ", ".join(" ".join(part.split()) for part in address.casefold().split(","))
+        normalized_focus = f"{focus.lat:.6f},{focus.lon:.6f}" if focus else ""
+        return f"{normalized_address}|{country_code.casefold()}|{normalized_focus}"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Coordinates]:
+        """
+        Looks up the coordinates for a key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[Coordinates]: The cached coordinates or None if the key is missing or expired.
+        """
+
+    @abstractmethod
+    def set(self, key: str, coordinates: Coordinates) -> None:
+        """
+        Stores the coordinates for a key.
+
+        Args:
+            key (str): The cache key.
+            coordinates (Coordinates): The coordinates to store.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Removes all entries from the cache.
+        """
+
+
+class MemoryGeocodingCache(GeocodingCache):
+    """
+    Geocoding cache that keeps its entries in memory, evicting the least recently used ones.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None) -> None:
+        """
+        Initializes an empty in-memory cache.
+
+        Args:
+            ttl (Optional[float]): Time to live of an entry in seconds. Default is None (no expiry).
+            max_entries (Optional[int]): Maximum number of entries. Default is None (unbounded).
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Coordinates, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Coordinates]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            coordinates, created = self._entries[key]
+            if self.ttl is not None and time() - created > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return coordinates
+
+    def set(self, key: str, coordinates: Coordinates) -> None:
+        with self._lock:
+            self._entries[key] = (coordinates, time())
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteGeocodingCache(GeocodingCache):
+    """
+    Persistent geocoding cache stored in a local SQLite file, evicting expired
+    entries and the least recently used ones if the cache grows too large.
+    """
+
+    def __init__(self,
+                 filename: str,
+                 ttl: Optional[float] = 90 * 24 * 60 * 60,
+                 max_entries: Optional[int] = 100000) -> None:
+        """
+        Opens or creates the cache file.
+
+        Args:
+            filename (str): The name of the SQLite file.
+            ttl (Optional[float]): Time to live of an entry in seconds. Default is 90 days,
+                None disables the expiry.
+            max_entries (Optional[int]): Maximum number of entries. Default is 100000,
+                None disables the size limit.
+        """
+        self.filename = filename
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS geocodes ("
+                "key TEXT PRIMARY KEY, lat REAL NOT NULL, lon REAL NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS geocodes_accessed ON geocodes (accessed)")
+            if ttl is not None:
+                self._connection.execute("DELETE FROM geocodes WHERE created < ?", (time() - ttl,))
+
+    def get(self, key: str) -> Optional[Coordinates]:
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT lat, lon, created FROM geocodes WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            lat, lon, created = row
+            now = time()
+            if self.ttl is not None and now - created > self.ttl:
+                self._connection.execute("DELETE FROM geocodes WHERE key = ?", (key,))
+                return None
+            self._connection.execute("UPDATE geocodes SET accessed = ? WHERE key = ?", (now, key))
+            return Coordinates(lat, lon)
+
+    def set(self, key: str, coordinates: Coordinates) -> None:
+        with self._lock, self._connection:
+            now = time()
+            self._connection.execute("INSERT OR REPLACE INTO geocodes VALUES (?, ?, ?, ?, ?)",
+                                     (key, coordinates.lat, coordinates.lon, now, now))
+            if self.max_entries is not None:
+                self._connection.execute(
+                    "DELETE FROM geocodes WHERE key IN ("
+                    "SELECT key FROM geocodes ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,))
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM geocodes")
+
+    def close(self) -> None:
+        """
+        Closes the connection to the cache file.
+        """
+        self._connection.close()
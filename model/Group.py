@@ -1,14 +1,19 @@
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Tuple, Union
 from typing_extensions import Self
+from model.Geocoder import Geocoder, OrsGeocoder
 from model.Location import Location
 
+# name, address and host event ID, optionally followed by the transport mode of the group
+Address = Union[Tuple[str, str, int], Tuple[str, str, int, Optional[str]]]
+
 
 class Group:
     """
     Represents a group with a name, location, and an event ID indicating which event the group hosts.
+    Groups may travel by another transport mode than the default one of the travel times.
     """
     
-    def __init__(self, name: str, location: Location, host_event_id: int):
+    def __init__(self, name: str, location: Location, host_event_id: int, transport_mode: Optional[str] = None):
         """
         Initializes the Group with a name, location, and host event ID.
 
@@ -16,13 +21,17 @@ class Group:
             name (str): The name of the group.
             location (Location): The location of the group.
             host_event_id (int): The ID of the event that this group is hosting.
+            transport_mode (Optional[str]): The transport mode of the group, e.g. "cycling-regular".
+                Defaults to the default profile of the travel times.
         """
         self.name = name
         self.location = location
         self.host_event_id = host_event_id
+        self.transport_mode = transport_mode
 
     @classmethod
-    def from_address(cls, name: str, auth_key: str, country_code: str, address: str, host_event_id: int) -> Self:
+    def from_address(cls, name: str, auth_key: str, country_code: str, address: str, host_event_id: int,
+                     geocoder: Optional[Geocoder] = None, transport_mode: Optional[str] = None) -> Self:
         """
         Creates a Group instance from an address.
 
@@ -32,36 +41,49 @@ class Group:
             country_code (str): The country code.
             address (str): The address to geocode.
             host_event_id (int): The ID of the event that this group is hosting.
+            geocoder (Optional[Geocoder]): Optional geocoder to use instead of an uncached
+                OpenRouteService geocoder.
+            transport_mode (Optional[str]): The transport mode of the group. Defaults to the
+                default profile of the travel times.
 
         Returns:
             Group: The created Group instance.
         """
-        location = Location.from_address(auth_key, country_code, address)
-        return cls(name, location, host_event_id)
+        location = Location.from_address(auth_key, country_code, address, geocoder=geocoder)
+        return cls(name, location, host_event_id, transport_mode)
 
     @classmethod
     def from_dict(cls, auth_key: str, country_code: str, city: Location,
-                  addresses: List[Tuple[str, str, int]]) -> List[Self]:
+                  addresses: Iterable[Address],
+                  geocoder: Optional[Geocoder] = None) -> List[Self]:
         """
-        Creates a list of Group instances from a list of addresses.
+        Creates a list of Group instances from a list of addresses. The addresses
+        are geocoded as one batch and groups at the same coordinates share a location.
 
         Args:
             auth_key (str): The authentication key for the geocoding service.
             country_code (str): The country code.
             city (Location): The city location to use as a focus for geocoding.
-            addresses (List[Tuple[str, str, int]]): A list of tuples containing name,
-                address, and ...
+            addresses (Iterable[Address]): Tuples of name, address and host event ID,
+                optionally followed by the transport mode.
+            geocoder (Optional[Geocoder]): Optional geocoder to use instead of an uncached
+                OpenRouteService geocoder.
 
         Returns:
             List[Group]: A list of created Group instances.
         """
+        if geocoder is None:
+            geocoder = OrsGeocoder(auth_key)
+        addresses = list(addresses)
+        coordinates = geocoder.geocode_many((grp_address, country_code, city.coordinates)
+                                            for (_, grp_address, _, *_) in addresses)
         groups = list()
         locations = dict()
-        for (grp_name, grp_address, grp_host_event_id) in addresses:
-            location = Location.from_address(auth_key, country_code, grp_address, focus=city.coordinates)
+        for (grp_name, _, grp_host_event_id, *grp_mode), grp_coordinates in zip(addresses, coordinates):
+            location = Location(grp_coordinates)
             if location not in locations:
                 locations[location] = location
-            groups.append(cls(grp_name, locations[location], grp_host_event_id))
+            groups.append(cls(grp_name, locations[location], grp_host_event_id, *grp_mode))
         return groups
 
     @classmethod
@@ -75,4 +97,17 @@ class Group:
         Returns:
             List[Location]: The list of unique locations.
         """
-        return list({group.location for group in groups})
\ No newline at end of file
+        return list({group.location for group in groups})
+
+    @classmethod
+    def get_transport_modes(cls, groups: List[Self]) -> List[str]:
+        """
+        Gets the unique transport modes that are set for a list of groups.
+
+        Args:
+            groups (List[Group]): The list of groups.
+
+        Returns:
+            List[str]: The list of unique transport modes, without the default one.
+        """
+        return list(dict.fromkeys(group.transport_mode for group in groups if group.transport_mode is not None))
@@ -0,0 +1,259 @@
+import numpy as np
+from functools import partial
+from math import ceil, exp
+from random import Random
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+from model.Group import Group
+from model.SolutionEvaluator import SolutionEvaluator
+
+if TYPE_CHECKING:
+    from model.DinnerInstance import DinnerInstance
+
+
+class HeuristicSolver:
+    """
+    Construction and local search heuristic for running dinner instances.
+
+    A greedy construction assigns the guests of each main event to hosts,
+    preferring short legs, hosts with fewer than three groups and groups that
+    have not met before. Simulated annealing with relocate and swap moves then
+    improves the assignment within a time budget, scoring each move by the
+    delta evaluation of a SolutionEvaluator. The objective and the feasible
+    set are the same as the ones of the mixed-integer program: every host has
+    two to four groups including itself, and the sum of the maximum travel
+    times between consecutive events plus the penalties for too few or too
+    many groups at a host and for repeated encounters is minimized.
+    """
+
+    # the number of groups at a host including itself allowed by the mixed-integer program
+    MIN_MEMBERS = 2
+    MAX_MEMBERS = 4
+
+    def __init__(self,
+                 instance: "DinnerInstance",
+                 penalty_too_few_guests: float = 600,
+                 penalty_too_many_guests: float = 600,
+                 penalty_multiple_encounters: float = 600,
+                 seed: Optional[int] = None) -> None:
+        """
+        Initializes the HeuristicSolver.
+
+        Args:
+            instance (DinnerInstance): The instance to solve.
+            penalty_too_few_guests (float): The penalty for each missing guest at a hosted event. Default is 600.
+            penalty_too_many_guests (float): The penalty for each additional guest at a hosted event. Default is 600.
+            penalty_multiple_encounters (float): The penalty for each repeated encounter of two groups. Default is 600.
+            seed (Optional[int]): The seed of the random number generator. Default is None.
+
+        Raises:
+            ValueError: If the groups cannot be split among the hosts of an event with two to four
+                groups at each host.
+        """
+        self.instance = instance
+        self.groups = instance.groups
+        self.penalty_too_few_guests = penalty_too_few_guests
+        self.penalty_too_many_guests = penalty_too_many_guests
+        self.penalty_multiple_encounters = penalty_multiple_encounters
+        self.random = Random(seed)
+        self.evaluator = SolutionEvaluator(instance, penalty_too_few_guests, penalty_too_many_guests,
+                                           penalty_multiple_encounters)
+
+        self.num_groups = len(self.groups)
+        self.num_events = len(instance.events) - 2
+        position = self.evaluator.position
+        self.host_event = [group.host_event_id for group in self.groups]
+        self.hosts = {e: [position[host] for host in instance.hosts_by_events[e]]
+                      for e in range(1, self.num_events+1)}
+        self.times = self.evaluator.times
+        self.profile = self.evaluator.profile
+        for e, hosts in self.hosts.items():
+            if not self.MIN_MEMBERS * len(hosts) <= self.num_groups <= self.MAX_MEMBERS * len(hosts):
+                raise ValueError(f"The {self.num_groups} groups cannot be split among the {len(hosts)} hosts "
+                                 f"of event {e} with {self.MIN_MEMBERS} to {self.MAX_MEMBERS} groups each.")
+
+    def _guest_penalty(self, count: int) -> float:
+        return self.penalty_too_few_guests * max(0, 3 - count) + self.penalty_too_many_guests * max(0, count - 3)
+
+    @property
+    def assign(self) -> np.ndarray:
+        """
+        np.ndarray: The host of each group (rows) at each main event (columns 1 to n).
+        """
+        return self.evaluator.assign
+
+    @property
+    def objective(self) -> float:
+        """
+        float: The objective value of the current assignment.
+        """
+        return self.evaluator.objective
+
+    def objective_components(self) -> Tuple[List[float], int, int, int]:
+        """
+        Returns the components of the objective of the current assignment.
+
+        Returns:
+            Tuple[List[float], int, int, int]: The maximum travel time between each pair of
+            consecutive events, the numbers of missing and of additional guests at hosts
+            and the number of repeated encounters.
+        """
+        return self.evaluator.objective_components()
+
+    def _construct(self, initial_solution: Optional[Dict[Group, List[Group]]] = None) -> None:
+        """
+        Builds a greedy initial assignment event by event, keeping the hosts of an
+        initial solution where they are still valid. Every host receives two to four
+        groups including itself.
+
+        Args:
+            initial_solution (Optional[Dict[Group, List[Group]]]): Optional solution to start from.
+        """
+        position = {group: g for g, group in enumerate(self.groups)}
+        kept = dict()
+        for group, hosts in (initial_solution or dict()).items():
+            for host in hosts:
+                if group in position and host in position and self.host_event[position[group]] != host.host_event_id:
+                    kept[position[group], host.host_event_id] = position[host]
+        G = self.num_groups
+        assign = np.empty((G, self.num_events + 1), dtype=np.int64)
+        assign[:, 0] = np.arange(G)
+        members = [set() for _ in range(G)]
+        meetings = np.zeros((G, G), dtype=np.int16)
+        for e in range(1, self.num_events+1):
+            hosts = self.hosts[e]
+            capacity = min(self.MAX_MEMBERS, max(3, ceil(G / len(hosts))))
+            for h in hosts:
+                assign[h, e] = h
+                members[h] = {h}
+            guests = list()
+            for g in range(G):
+                if self.host_event[g] == e:
+                    continue
+                if (g, e) in kept and len(members[kept[g, e]]) < self.MAX_MEMBERS:
+                    h = kept[g, e]
+                    for m in members[h]:
+                        meetings[g, m] += 1
+                        meetings[m, g] += 1
+                    members[h].add(g)
+                    assign[g, e] = h
+                else:
+                    guests.append(g)
+            # hardest groups first: those far away from every host
+            guests.sort(key=lambda g: -min(self.times[self.profile[g], assign[g, e-1], h] for h in hosts))
+            for i, g in enumerate(guests):
+                previous = assign[g, e-1]
+                best_host, best_cost = None, None
+                # the last guests go to hosts without any guest yet, so that no host stays alone
+                alone = [h for h in hosts if len(members[h]) < self.MIN_MEMBERS]
+                if len(alone) >= len(guests) - i:
+                    candidates = alone
+                else:
+                    candidates = [h for h in hosts if len(members[h]) < capacity] \
+                        or [h for h in hosts if len(members[h]) < self.MAX_MEMBERS]
+                for h in candidates:
+                    count = len(members[h])
+                    cost = self.times[self.profile[g], previous, h] \
+                        + self._guest_penalty(count + 1) - self._guest_penalty(count) \
+                        + self.penalty_multiple_encounters * sum(1 for m in members[h] if meetings[g, m] >= 1)
+                    if best_cost is None or cost < best_cost:
+                        best_host, best_cost = h, cost
+                for m in members[best_host]:
+                    meetings[g, m] += 1
+                    meetings[m, g] += 1
+                members[best_host].add(g)
+                assign[g, e] = best_host
+            # kept hosts of an initial solution may leave a host alone, which takes a guest of a full host
+            for h in hosts:
+                if len(members[h]) < self.MIN_MEMBERS:
+                    g = min((g for a in hosts if len(members[a]) > self.MIN_MEMBERS for g in members[a] if g != a),
+                            key=lambda g: self.times[self.profile[g], assign[g, e-1], h])
+                    for m in members[assign[g, e]] - {g}:
+                        meetings[g, m] -= 1
+                        meetings[m, g] -= 1
+                    members[assign[g, e]].discard(g)
+                    for m in members[h]:
+                        meetings[g, m] += 1
+                        meetings[m, g] += 1
+                    members[h].add(g)
+                    assign[g, e] = h
+
+        self.evaluator.load(assign)
+
+    def _random_move(self) -> Optional[Tuple[float, Callable[[], None]]]:
+        """
+        Draws a random relocate or swap move that keeps two to four groups at every host.
+
+        Returns:
+            Optional[Tuple[float, Callable[[], None]]]: The change of the objective and a function
+            applying the move, or None if no move was found.
+        """
+        e = self.random.randint(1, self.num_events)
+        g = self.random.randrange(self.num_groups)
+        if self.host_event[g] == e or len(self.hosts[e]) < 2:
+            return None
+        evaluator = self.evaluator
+        a = evaluator.assign[g, e]
+        b = self.random.choice(self.hosts[e])
+        if a == b:
+            return None
+        if self.random.random() < 0.5:
+            # relocations must keep two to four groups at both hosts
+            if len(evaluator.members[a]) <= self.MIN_MEMBERS or len(evaluator.members[b]) >= self.MAX_MEMBERS:
+                return None
+            return evaluator.delta_move(g, e, b), partial(evaluator.move, g, e, b)
+        guests = [m for m in evaluator.members[b] if m != b]
+        if not guests:
+            return None
+        other = self.random.choice(guests)
+        return evaluator.delta_swap(g, other, e), partial(evaluator.swap, g, other, e)
+
+    def solve(self,
+              time_limit: float = 10.0,
+              initial_solution: Optional[Dict[Group, List[Group]]] = None) -> Dict[Group, List[Group]]:
+        """
+        Constructs an assignment and improves it by simulated annealing until the time limit is reached.
+
+        Args:
+            time_limit (float): The time budget in seconds. Default is 10.0.
+            initial_solution (Optional[Dict[Group, List[Group]]]): Optional solution whose valid
+                assignments are kept by the construction. Default is None.
+
+        Returns:
+            Dict[Group, List[Group]]: A dictionary mapping each group to a sorted list
+            of the hosts that the group visits (including itself if it is hosting).
+        """
+        start = perf_counter()
+        self._construct(initial_solution)
+        evaluator = self.evaluator
+        best_objective = self.objective
+        best_assign = self.assign.copy()
+
+        current = best_objective
+        start_temperature = max(1.0, 0.05 * float(evaluator.max_legs.max()))
+        end_temperature = 0.01
+        temperature = start_temperature
+        iteration = 0
+        while True:
+            iteration += 1
+            if iteration % 256 == 0:
+                progress = (perf_counter() - start) / time_limit if time_limit > 0 else 1
+                if progress >= 1:
+                    break
+                temperature = start_temperature * (end_temperature / start_temperature) ** progress
+            move = self._random_move()
+            if move is None:
+                continue
+            delta, apply = move
+            if delta <= 0 or self.random.random() < exp(-delta / temperature):
+                apply()
+                current += delta
+                if current < best_objective - 1e-9:
+                    # recompute to avoid drifting through accumulated rounding
+                    current = self.objective
+                    best_objective = current
+                    best_assign = self.assign.copy()
+
+        evaluator.load(best_assign)
+        return {group: [self.groups[self.assign[g, e]] for e in range(1, self.num_events+1)]
+                for g, group in enumerate(self.groups)}
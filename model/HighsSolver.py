@@ -0,0 +1,197 @@
+import numpy as np
+import warnings
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Optional, Tuple
+from model.SolveStats import SolveProgress, SolveStats, relative_gap
+from model.SparseModel import SparseModel
+from pulp import LpStatusInfeasible, LpStatusNotSolved, LpStatusOptimal, LpStatusUnbounded
+
+try:
+    import highspy
+except ImportError:
+    highspy = None
+
+# HiGHS shares one task scheduler among all solves of a process, whose number of threads is
+# fixed by the first solve. Resetting it would break solves running on other threads.
+_scheduler_lock = Lock()
+_scheduler_threads: Optional[int] = None
+_scheduler_started = False
+
+
+class HighsSolver:
+    """
+    In-process solver backend that passes a SparseModel to HiGHS through highspy.
+
+    The constraint matrix is handed over as compressed sparse row arrays, so no
+    model or solution file is written and no PuLP objects are created. New
+    incumbents and, at most once per progress_interval, improved bounds are
+    reported to a progress callback while HiGHS is running.
+
+    The number of threads is shared by all HiGHS solves of a process and set by
+    the first one, later solves with another number of threads use the number
+    of the first one with a warning. Solves that need different numbers of
+    threads run in separate processes, e.g. in a process pool.
+    """
+
+    name = "HiGHS"
+
+    def __init__(self,
+                 time_limit: Optional[float] = None,
+                 gap_rel: Optional[float] = None,
+                 threads: Optional[int] = None,
+                 msg: bool = False,
+                 progress_interval: float = 1.0,
+                 **options: Any) -> None:
+        """
+        Initializes the HighsSolver.
+
+        Args:
+            time_limit (Optional[float]): The time limit in seconds. Default is None.
+            gap_rel (Optional[float]): The relative gap at which the solver stops. Default is None.
+            threads (Optional[int]): The number of threads, which only the first HiGHS solve of a
+                process can set. Default is None.
+            msg (bool): Whether HiGHS prints its log. Default is False.
+            progress_interval (float): The minimum time in seconds between two reports of an
+                improved bound. Default is 1.0.
+            **options (Any): Further HiGHS options, e.g. presolve.
+
+        Raises:
+            ImportError: If highspy is not installed.
+        """
+        if highspy is None:
+            raise ImportError("The HiGHS backend requires highspy, install it with pip install highspy.")
+        self.time_limit = time_limit
+        self.gap_rel = gap_rel
+        self.threads = threads
+        self.msg = msg
+        self.progress_interval = progress_interval
+        self.options = options
+
+    def _set_threads(self, h: "highspy.Highs") -> None:
+        """
+        Sets the number of threads of the first solve of the process and keeps it afterwards.
+        """
+        global _scheduler_threads, _scheduler_started
+        with _scheduler_lock:
+            if not _scheduler_started:
+                _scheduler_started = True
+                _scheduler_threads = self.threads
+            elif self.threads is not None and self.threads != _scheduler_threads:
+                warnings.warn(f"HiGHS already runs with {_scheduler_threads or 'the default number of'} threads "
+                              f"in this process, threads={self.threads} is ignored.", RuntimeWarning, stacklevel=3)
+        if _scheduler_threads is not None:
+            h.setOptionValue("threads", int(_scheduler_threads))
+
+    @staticmethod
+    def available() -> bool:
+        """
+        Checks whether highspy is installed.
+
+        Returns:
+            bool: True if the HiGHS backend can be used.
+        """
+        return highspy is not None
+
+    def solve(self,
+              sparse: SparseModel,
+              start: Optional[np.ndarray] = None,
+              stats: Optional[SolveStats] = None,
+              progress: Optional[Callable[[SolveProgress], None]] = None) -> Tuple[int, Optional[np.ndarray], Optional[float]]:
+        """
+        Solves a model.
+
+        Args:
+            sparse (SparseModel): The model with its cost vector.
+            start (Optional[np.ndarray]): Optional MIP start with one value per column,
+                NaN for columns without start value. Default is None.
+            stats (Optional[SolveStats]): Optional statistics to add the solver I/O and
+                solve time, the status, bound and gap to. Default is None.
+            progress (Optional[Callable[[SolveProgress], None]]): Optional callback for new
+                incumbents and bounds. Default is None.
+
+        Returns:
+            Tuple[int, Optional[np.ndarray], Optional[float]]: The PuLP status code, the value
+            of each column and the objective value, both None if no solution was found.
+        """
+        start_perf_counter = perf_counter()
+        h = highspy.Highs()
+        h.setOptionValue("output_flag", self.msg)
+        if self.time_limit is not None:
+            h.setOptionValue("time_limit", float(self.time_limit))
+        if self.gap_rel is not None:
+            h.setOptionValue("mip_rel_gap", float(self.gap_rel))
+        self._set_threads(h)
+        for option, value in self.options.items():
+            h.setOptionValue(option, value)
+
+        lower, upper, integer = sparse.column_bounds()
+        row_lower, row_upper = sparse.row_bounds()
+        starts, columns, coefficients = sparse.matrix()
+        infinity = highspy.kHighsInf
+        h.passModel(sparse.num_columns, sparse.num_rows, len(coefficients),
+                    int(highspy.MatrixFormat.kRowwise), int(highspy.ObjSense.kMinimize), 0.0,
+                    sparse.cost.astype(np.float64),
+                    np.clip(lower, -infinity, infinity), np.clip(upper, -infinity, infinity),
+                    np.clip(row_lower, -infinity, infinity), np.clip(row_upper, -infinity, infinity),
+                    starts.astype(np.int32), columns.astype(np.int32), coefficients.astype(np.float64),
+                    integer.astype(np.int32))
+        if start is not None:
+            known = np.flatnonzero(~np.isnan(start))
+            if len(known):
+                h.setSolution(len(known), known.astype(np.int32), start[known].astype(np.float64))
+        if progress is not None:
+            self._subscribe(h, progress)
+        io_time = perf_counter() - start_perf_counter
+
+        start_perf_counter = perf_counter()
+        h.run()
+        solve_time = perf_counter() - start_perf_counter
+
+        start_perf_counter = perf_counter()
+        model_status = h.getModelStatus()
+        values, objective = None, None
+        if h.getInfo().primal_solution_status == highspy.SolutionStatus.kSolutionStatusFeasible:
+            values = np.array(h.getSolution().col_value)
+            objective = h.getInfo().objective_function_value
+        if model_status == highspy.HighsModelStatus.kOptimal or values is not None:
+            status = LpStatusOptimal
+            solution_status = "Optimal" if model_status == highspy.HighsModelStatus.kOptimal else "Feasible"
+        elif model_status == highspy.HighsModelStatus.kInfeasible:
+            status, solution_status = LpStatusInfeasible, "Infeasible"
+        elif model_status in (highspy.HighsModelStatus.kUnbounded, highspy.HighsModelStatus.kUnboundedOrInfeasible):
+            status, solution_status = LpStatusUnbounded, "Unbounded"
+        else:
+            status, solution_status = LpStatusNotSolved, "Not Solved"
+        bound = h.getInfo().mip_dual_bound if sparse.integer.any() else objective
+        bound = bound if bound is not None and abs(bound) < highspy.kHighsInf else None
+        io_time += perf_counter() - start_perf_counter
+
+        if stats is not None:
+            stats.add_time("solver_io", io_time)
+            stats.add_time("solve", solve_time)
+            stats.solver = self.name
+            stats.status = solution_status
+            stats.bound = bound
+            stats.gap = relative_gap(objective, bound)
+        if progress is not None:
+            progress(SolveProgress(solve_time, objective, bound, relative_gap(objective, bound)))
+        return status, values, objective
+
+    def _subscribe(self, h: Any, progress: Callable[[SolveProgress], None]) -> None:
+        """
+        Reports new incumbents and improved bounds of a running MIP to a callback.
+        """
+        last = {"bound": None, "time": -self.progress_interval}
+
+        def report(event: Any, improved: bool) -> None:
+            data = event.data_out
+            bound = data.mip_dual_bound if abs(data.mip_dual_bound) < highspy.kHighsInf else None
+            if not improved and (bound == last["bound"] or data.running_time - last["time"] < self.progress_interval):
+                return
+            incumbent = data.mip_primal_bound if abs(data.mip_primal_bound) < highspy.kHighsInf else None
+            last["bound"], last["time"] = bound, data.running_time
+            progress(SolveProgress(data.running_time, incumbent, bound, relative_gap(incumbent, bound)))
+
+        h.cbMipImprovingSolution.subscribe(lambda event: report(event, True))
+        h.cbMipInterrupt.subscribe(lambda event: report(event, False))
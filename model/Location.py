@@ -1,8 +1,7 @@
-import requests
-import json
 from typing import Any, Optional
 from typing_extensions import Self
 from model.Coordinates import Coordinates
+from model.Geocoder import Geocoder, OrsGeocoder
 
 
 class Location:
@@ -48,7 +47,8 @@ class Location:
                      auth_key: str,
                      country_code: str,
                      address: str,
-                     focus: Optional[Coordinates] = None) -> Self:
+                     focus: Optional[Coordinates] = None,
+                     geocoder: Optional[Geocoder] = None) -> Self:
         """
         Creates a Location instance from an address using a geocoding service.
 
@@ -57,6 +57,8 @@ class Location:
             country_code (str): The country code.
             address (str): The address to geocode.
             focus (Optional[Coordinates]): Optional focus coordinates to bias the geocoding.
+            geocoder (Optional[Geocoder]): Optional geocoder to use instead of an uncached
+                OpenRouteService geocoder.
 
         Returns:
             Location: The created Location instance.
@@ -64,22 +66,6 @@ class Location:
         Raises:
             RuntimeError: If there is an error in the geocoding response.
         """
-        headers = {
-            'Accept': 'application/json, application/geo+json, application/gpx+xml, img/png; charset=utf-8'
-        }
-        call = requests.get(
-            'https://api.openrouteservice.org/geocode/search?'
-            f'api_key={auth_key}&'
-            f'text={address}&'
-            + (f'focus.point.lon={focus.lon}&' if focus else '')
-            + (f'focus.point.lat={focus.lat}&' if focus else '')
-            + f'boundary.country={country_code}&'
-            'size=1',
-            headers=headers
-        )
-        result = json.loads(call.text)
-        if "error" in result:
-            raise RuntimeError(f"Openrouteservice: {result['error']}")
-        lon_lat = result["features"][0]["geometry"]["coordinates"]
-        lat_lon = list(reversed(lon_lat))
-        return cls(Coordinates(*lat_lon))
\ No newline at end of file
+        if geocoder is None:
+            geocoder = OrsGeocoder(auth_key)
+        return cls(geocoder.geocode(address, country_code, focus))
\ No newline at end of file
@@ -0,0 +1,117 @@
+from time import sleep
+from typing import Any, Optional, TYPE_CHECKING
+from model.RateLimiter import RateLimiter
+
+# requests is only imported once a session is created, so that offline work starts quickly
+if TYPE_CHECKING:
+    import requests
+
+
+class OrsSession:
+    """
+    Pooled HTTP session for the OpenRouteService API with rate limiting and
+    retries with exponential backoff on rate limit and server errors.
+    """
+
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(self,
+                 auth_key: str,
+                 base_url: str = "https://api.openrouteservice.org",
+                 requests_per_minute: Optional[float] = None,
+                 max_retries: int = 5,
+                 backoff_factor: float = 1.0,
+                 pool_size: int = 10,
+                 timeout: float = 60) -> None:
+        """
+        Initializes the OrsSession.
+
+        Args:
+            auth_key (str): The authentication key for the OpenRouteService API.
+            base_url (str): The base URL of the API, e.g. of a local stub server.
+                Default is the public OpenRouteService API.
+            requests_per_minute (Optional[float]): The maximum number of requests per minute.
+                Default is None (unlimited).
+            max_retries (int): The maximum number of retries of a failed request. Default is 5.
+            backoff_factor (float): The delay in seconds before the first retry, doubled
+                for every further retry. Default is 1.0.
+            pool_size (int): The number of pooled connections. Default is 10.
+            timeout (float): The timeout of a single request in seconds. Default is 60.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.auth_key = auth_key
+        self.base_url = base_url.rstrip("/")
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            'Accept': 'application/json, application/geo+json, application/gpx+xml, img/png; charset=utf-8',
+            'Authorization': auth_key
+        })
+
+    def request(self, method: str, path: str, **kwargs: Any) -> "requests.Response":
+        """
+        Sends a request, waiting for the rate limiter and retrying on connection
+        errors, rate limit and server errors.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The path relative to the base URL.
+            **kwargs (Any): Further arguments for requests.Session.request.
+
+        Returns:
+            requests.Response: The last response.
+
+        Raises:
+            requests.ConnectionError: If the connection still fails after all retries.
+        """
+        import requests
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if response.status_code not in self.RETRY_STATUS_CODES or attempt == self.max_retries:
+                    return response
+                retry_after = response.headers.get("Retry-After")
+                if retry_after is not None and retry_after.isdigit():
+                    sleep(int(retry_after))
+                    continue
+            sleep(self.backoff_factor * 2 ** attempt)
+
+    def get(self, path: str, params: Optional[dict] = None) -> "requests.Response":
+        """
+        Sends a GET request.
+
+        Args:
+            path (str): The path relative to the base URL.
+            params (Optional[dict]): The query parameters.
+
+        Returns:
+            requests.Response: The response.
+        """
+        return self.request("GET", path, params=params)
+
+    def post(self, path: str, json: Any) -> "requests.Response":
+        """
+        Sends a POST request with a JSON body.
+
+        Args:
+            path (str): The path relative to the base URL.
+            json (Any): The JSON body.
+
+        Returns:
+            requests.Response: The response.
+        """
+        return self.request("POST", path, json=json)
@@ -0,0 +1,165 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from time import perf_counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+from model.DinnerModel import DinnerModel
+from model.HeuristicSolver import HeuristicSolver
+from model.HighsSolver import HighsSolver
+
+if TYPE_CHECKING:
+    from model.DinnerInstance import DinnerInstance
+
+
+class SweepResult(NamedTuple):
+    """
+    Result of one configuration of a parameter sweep.
+
+    Attributes:
+        penalty_too_few_guests (float): The penalty for too few guests.
+        penalty_too_many_guests (float): The penalty for too many guests.
+        penalty_multiple_encounters (float): The penalty for multiple encounters.
+        solver (str): The PuLP solver name, "HiGHS" or "heuristic".
+        status (str): The status reported by the solver, see ``SolveStats``. Heuristic runs
+            are "Feasible" like in ``DinnerInstance.solve``.
+        objective (Optional[float]): The objective value, None if no solution was found.
+        max_travel_times (Tuple[float, ...]): The maximum travel time between consecutive events.
+        missing_guests (int): The number of missing guests at hosts.
+        additional_guests (int): The number of additional guests at hosts.
+        multiple_encounters (int): The number of repeated encounters.
+        runtime (float): The runtime in seconds.
+    """
+    penalty_too_few_guests: float
+    penalty_too_many_guests: float
+    penalty_multiple_encounters: float
+    solver: str
+    status: str
+    objective: Optional[float]
+    max_travel_times: Tuple[float, ...]
+    missing_guests: int
+    additional_guests: int
+    multiple_encounters: int
+    runtime: float
+
+
+# state of a worker process, set once by _initialize_worker
+_worker_instance: Optional["DinnerInstance"] = None
+_worker_formulation: str = "compact"
+_worker_models: Dict[Optional[str], DinnerModel] = dict()
+
+
+def _initialize_worker(instance: "DinnerInstance", formulation: str) -> None:
+    global _worker_instance, _worker_formulation, _worker_models
+    _worker_instance = instance
+    _worker_formulation = formulation
+    _worker_models = dict()
+
+
+def _run_configuration(configuration: Tuple[float, float, float, Optional[str]], time_limit: Optional[float]) -> SweepResult:
+    """
+    Solves one configuration in a worker. The model of the instance is built once
+    per worker and solver, later configurations only replace its objective. The time
+    limit includes building the model, so the first run of a solver in a worker
+    leaves less time to the solver, but at least a second.
+    """
+    penalty_too_few_guests, penalty_too_many_guests, penalty_multiple_encounters, solver_str = configuration
+    penalties = (penalty_too_few_guests, penalty_too_many_guests, penalty_multiple_encounters)
+    start_perf_counter = perf_counter()
+    if solver_str == "heuristic":
+        heuristic = HeuristicSolver(_worker_instance, *penalties)
+        heuristic.solve(time_limit if time_limit is not None else 10.0)
+        max_travel_times, missing, additional, encounters = heuristic.objective_components()
+        return SweepResult(*penalties, "heuristic", "Feasible", heuristic.objective, tuple(max_travel_times),
+                           missing, additional, encounters, perf_counter() - start_perf_counter)
+
+    if solver_str not in _worker_models:
+        _worker_models[solver_str] = DinnerModel(_worker_instance, _worker_formulation)
+        if solver_str != "highs":
+            _worker_models[solver_str].prob  # creates the PuLP objects of the compact formulation
+    model = _worker_models[solver_str]
+    if time_limit is not None:
+        # PuLP ignores a time limit of 0, so the solver gets at least a second
+        time_limit = max(1.0, time_limit - (perf_counter() - start_perf_counter))
+    if solver_str == "highs":
+        solver = HighsSolver(time_limit=time_limit)
+    else:
+        options = {"timeLimit": time_limit} if time_limit is not None else dict()
+        solver = DinnerModel.get_solver(solver_str, **options)
+    model.set_objective(*penalties)
+    model.solve(solver)
+    max_travel_times, missing, additional, encounters = model.objective_components()
+    return SweepResult(*penalties, solver.name, model.stats.status, model.objective, tuple(max_travel_times),
+                       missing, additional, encounters, perf_counter() - start_perf_counter)
+
+
+class ParameterSweep:
+    """
+    Solves an instance for a grid of penalty settings and solvers in parallel.
+
+    The instance is sent once to every worker process of a process pool, and
+    each worker builds the model once per solver and only replaces the
+    objective for further penalty settings.
+    """
+
+    def __init__(self, instance: "DinnerInstance", formulation: str = "compact") -> None:
+        """
+        Initializes the ParameterSweep.
+
+        Args:
+            instance (DinnerInstance): The instance to solve.
+            formulation (str): The MIP formulation, see ``DinnerModel``. Default is "compact".
+        """
+        self.instance = instance
+        self.formulation = formulation
+
+    def run(self,
+            penalties_too_few_guests: Iterable[float] = (600,),
+            penalties_too_many_guests: Iterable[float] = (600,),
+            penalties_multiple_encounters: Iterable[float] = (600,),
+            solvers: Iterable[Optional[str]] = (None,),
+            time_limit: Optional[float] = None,
+            processes: Optional[int] = None) -> List[SweepResult]:
+        """
+        Solves every combination of the given penalties and solvers.
+
+        Args:
+            penalties_too_few_guests (Iterable[float]): The penalties for too few guests. Default is (600,).
+            penalties_too_many_guests (Iterable[float]): The penalties for too many guests. Default is (600,).
+            penalties_multiple_encounters (Iterable[float]): The penalties for multiple encounters. Default is (600,).
+            solvers (Iterable[Optional[str]]): PuLP solver names, None for the default PuLP solver,
+                "highs" for the in-process HighsSolver or "heuristic" for the HeuristicSolver.
+                Default is (None,).
+            time_limit (Optional[float]): The time limit of each run in seconds, which includes
+                building the model in the first run of a solver in a worker. Command line solvers
+                may exceed it, see ``DinnerInstance.solve``. Default is None.
+            processes (Optional[int]): The number of worker processes. Default is None (number of CPUs).
+
+        Returns:
+            List[SweepResult]: One result per configuration, in the order of the grid.
+        """
+        configurations = list(product(penalties_too_few_guests,
+                                      penalties_too_many_guests,
+                                      penalties_multiple_encounters,
+                                      solvers))
+        if processes == 1:
+            _initialize_worker(self.instance, self.formulation)
+            return [_run_configuration(configuration, time_limit) for configuration in configurations]
+        with ProcessPoolExecutor(max_workers=processes,
+                                 initializer=_initialize_worker,
+                                 initargs=(self.instance, self.formulation)) as executor:
+            return list(executor.map(_run_configuration, configurations, [time_limit] * len(configurations)))
+
+    @staticmethod
+    def save_csv(filename: str, results: List[SweepResult]) -> None:
+        """
+        Saves sweep results to a CSV file with one row per configuration.
+
+        Args:
+            filename (str): The name of the file to save the CSV to.
+            results (List[SweepResult]): The results of a sweep.
+        """
+        with open(filename, "w", newline="") as file:
+            writer = csv.writer(file, delimiter=";", quoting=csv.QUOTE_NONNUMERIC)
+            writer.writerow(SweepResult._fields)
+            for result in results:
+                writer.writerow(result._replace(max_travel_times=",".join(str(t) for t in result.max_travel_times)))
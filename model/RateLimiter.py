@@ -0,0 +1,35 @@
+import threading
+from time import monotonic, sleep
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces out calls to stay below a number of requests per minute.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None) -> None:
+        """
+        Initializes the RateLimiter.
+
+        Args:
+            requests_per_minute (Optional[float]): The maximum number of requests per minute.
+                Default is None (unlimited).
+        """
+        self.requests_per_minute = requests_per_minute
+        self._interval = 60 / requests_per_minute if requests_per_minute else 0
+        self._next_slot = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Blocks until the next request may be sent.
+        """
+        if not self._interval:
+            return
+        with self._lock:
+            now = monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            sleep(slot - now)
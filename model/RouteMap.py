@@ -0,0 +1,117 @@
+from html import escape
+from typing import Any, Dict, List, Optional
+from branca.element import MacroElement
+from jinja2 import Template
+from model.Group import Group
+from model.Location import Location
+
+
+class RouteMap(MacroElement):
+    """
+    Compact rendering of a solution on a folium map.
+
+    Every location is emitted once as point feature and the route of every
+    group as one line feature of a shared GeoJSON layer. Selecting a group in
+    a drop-down list shows its route and colors its hosts in the browser, so
+    the size of the map grows linearly with the number of groups.
+    """
+
+    _template = Template("""
+{% macro script(this, kwargs) %}
+(function() {
+    var map = {{ this._parent.get_name() }};
+    var data = {{ this.data|tojson }};
+    var colors = {group: "green", host: "orange", other: "gray", party: "red"};
+    var routesByGroup = {};
+    var selected = "";
+
+    var points = L.geoJSON(data, {
+        filter: function(feature) { return feature.geometry.type === "Point"; },
+        pointToLayer: function(feature, latlng) {
+            return L.circleMarker(latlng, {radius: 8, weight: 2, fillOpacity: 0.8});
+        },
+        onEachFeature: function(feature, layer) {
+            layer.bindPopup("<nobr>" + feature.properties.label + "</nobr>");
+            if (feature.properties.group !== undefined) {
+                layer.on("click", function() { select(feature.properties.group); });
+            }
+        }
+    }).addTo(map);
+
+    var routes = L.geoJSON(data, {
+        filter: function(feature) { return feature.geometry.type === "LineString"; },
+        style: function() { return {weight: 3, opacity: 0.7}; },
+        onEachFeature: function(feature, layer) { routesByGroup[feature.properties.group] = feature; }
+    }).addTo(map);
+
+    function role(properties) {
+        if (properties.group === undefined) { return "party"; }
+        if (selected === "" || properties.group === selected) { return "group"; }
+        return routesByGroup[selected].properties.hosts.indexOf(properties.group) >= 0 ? "host" : "other";
+    }
+
+    function select(group) {
+        selected = group;
+        control.value = group;
+        points.setStyle(function(feature) {
+            var color = colors[role(feature.properties)];
+            return {color: color, fillColor: color};
+        });
+        routes.clearLayers();
+        routes.addData(group === "" ? Object.values(routesByGroup) : [routesByGroup[group]]);
+    }
+
+    var control = L.DomUtil.create("select");
+    control.add(new Option("All groups", ""));
+    Object.keys(routesByGroup).forEach(function(group) { control.add(new Option(group, group)); });
+    L.DomEvent.disableClickPropagation(control);
+    L.DomEvent.on(control, "change", function() { select(control.value); });
+    var filter = L.control({position: "topleft"});
+    filter.onAdd = function() { return control; };
+    filter.addTo(map);
+    select("");
+})();
+{% endmacro %}
+""")
+
+    def __init__(self,
+                 events: List[str],
+                 solution: Dict[Group, List[Group]],
+                 groups: List[Group],
+                 after_party: Optional[Location] = None) -> None:
+        """
+        Initializes the RouteMap.
+
+        Args:
+            events (List[str]): The event names.
+            solution (Dict[Group, List[Group]]): The solution containing groups and their hosts.
+            groups (List[Group]): All groups of the instance.
+            after_party (Optional[Location]): Optional location of the after party. Default is None.
+        """
+        super().__init__()
+        self._name = "RouteMap"
+        features: List[Dict[str, Any]] = list()
+        for group in groups:
+            features.append(self._point(group.location,
+                                        label=escape(f"{group.name}: {events[group.host_event_id]}"),
+                                        group=group.name))
+        if after_party is not None:
+            features.append(self._point(after_party, label=escape(f"Party: {events[-1]}")))
+        for group, hosts in solution.items():
+            destination = after_party if after_party is not None else group.location
+            route = [group.location] + [host.location for host in hosts] + [destination]
+            features.append({
+                "type": "Feature",
+                "geometry": {"type": "LineString",
+                             "coordinates": [[location.coordinates.lon, location.coordinates.lat] for location in route]},
+                "properties": {"group": group.name, "hosts": [host.name for host in hosts if host != group]},
+            })
+        self.data = {"type": "FeatureCollection", "features": features}
+
+    @staticmethod
+    def _point(location: Location, **properties: Any) -> Dict[str, Any]:
+        return {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [location.coordinates.lon, location.coordinates.lat]},
+            "properties": properties,
+        }
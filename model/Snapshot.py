@@ -0,0 +1,87 @@
+import json
+import numpy as np
+from typing import Any, Dict, Tuple
+
+
+class Snapshot:
+    """
+    Binary container of a JSON header and named NumPy arrays.
+
+    The file starts with a magic number and the length of the header, which
+    lists the offset, data type and shape of every array. The arrays follow
+    as raw little-endian data aligned to 64 bytes, so that they can be read
+    without parsing or memory-mapped directly from the file.
+    """
+
+    MAGIC = b"RDSNAP01"
+    ALIGNMENT = 64
+
+    @classmethod
+    def save(cls, filename: str, header: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Saves a header and arrays to a file.
+
+        Args:
+            filename (str): The name of the file.
+            header (Dict[str, Any]): The JSON serializable header.
+            arrays (Dict[str, np.ndarray]): The arrays by name.
+        """
+        arrays = {name: np.ascontiguousarray(array, dtype=np.asarray(array).dtype.newbyteorder("<"))
+                  for name, array in arrays.items()}
+        table = dict()
+        header = dict(header, arrays=table)
+        # The offsets depend on the length of the header, which depends on the offsets.
+        data_start = 0
+        while True:
+            offset = data_start
+            for name, array in arrays.items():
+                table[name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+                offset = cls._align(offset + array.nbytes)
+            encoded = json.dumps(header).encode("utf-8")
+            required = cls._align(len(cls.MAGIC) + 8 + len(encoded))
+            if required <= data_start:
+                break
+            data_start = required
+
+        with open(filename, "wb") as file:
+            file.write(cls.MAGIC)
+            file.write(len(encoded).to_bytes(8, "little"))
+            file.write(encoded)
+            for name, array in arrays.items():
+                file.write(b"\0" * (table[name]["offset"] - file.tell()))
+                file.write(array.tobytes())
+
+    @classmethod
+    def load(cls, filename: str, mmap: bool = True) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """
+        Loads a header and arrays from a file written by ``save``.
+
+        Args:
+            filename (str): The name of the file.
+            mmap (bool): Whether to memory-map the arrays read-only instead of reading
+                them into memory. Default is True.
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, np.ndarray]]: The header and the arrays by name.
+
+        Raises:
+            ValueError: If the file is not a snapshot.
+        """
+        with open(filename, "rb") as file:
+            if file.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"{filename} is not a snapshot.")
+            length = int.from_bytes(file.read(8), "little")
+            header = json.loads(file.read(length).decode("utf-8"))
+            arrays = dict()
+            for name, entry in header.pop("arrays").items():
+                dtype, shape = np.dtype(entry["dtype"]), tuple(entry["shape"])
+                if mmap and np.prod(shape) > 0:
+                    arrays[name] = np.memmap(filename, dtype=dtype, mode="r", offset=entry["offset"], shape=shape)
+                else:
+                    file.seek(entry["offset"])
+                    arrays[name] = np.fromfile(file, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+        return header, arrays
+
+    @classmethod
+    def _align(cls, offset: int) -> int:
+        return -(-offset // cls.ALIGNMENT) * cls.ALIGNMENT
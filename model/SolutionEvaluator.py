@@ -0,0 +1,378 @@
+import numpy as np
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, TYPE_CHECKING
+from model.Group import Group
+from model.SparseModel import ragged_arange
+
+if TYPE_CHECKING:
+    from model.DinnerInstance import DinnerInstance
+
+
+class Evaluation(NamedTuple):
+    """
+    The objective of a solution and its components.
+
+    Attributes:
+        objective (float): The sum of the maximum travel times and the penalties.
+        max_travel_times (Tuple[float, ...]): The maximum travel time between each pair of
+            consecutive events, from the homes to the first main event up to the last main
+            event to the after party or back home.
+        missing_guests (int): The number of missing guests at hosts with fewer than two guests.
+        additional_guests (int): The number of additional guests at hosts with more than two guests.
+        multiple_encounters (int): The number of repeated encounters of two groups.
+    """
+    objective: float
+    max_travel_times: Tuple[float, ...]
+    missing_guests: int
+    additional_guests: int
+    multiple_encounters: int
+
+
+class SolutionEvaluator:
+    """
+    Scores solutions of an instance on the same objective as the mixed-integer
+    program, without solving anything.
+
+    ``evaluate`` computes the legs of all groups, the guest counts of all hosts
+    and the repeated encounters of a solution in vectorized form from the
+    travel time matrix. ``load`` keeps an assignment as state, for which
+    ``delta_move`` and ``delta_swap`` compute the change of the objective of
+    moving one group to another host or swapping the hosts of two groups in
+    time proportional to the number of groups at the hosts involved, and
+    ``move`` and ``swap`` apply them. Groups are addressed by their position
+    in ``instance.groups`` and events by their ID.
+    """
+
+    def __init__(self,
+                 instance: "DinnerInstance",
+                 penalty_too_few_guests: float = 600,
+                 penalty_too_many_guests: float = 600,
+                 penalty_multiple_encounters: float = 600) -> None:
+        """
+        Initializes the SolutionEvaluator.
+
+        Args:
+            instance (DinnerInstance): The instance whose solutions are evaluated.
+            penalty_too_few_guests (float): The penalty for each missing guest at a hosted event. Default is 600.
+            penalty_too_many_guests (float): The penalty for each additional guest at a hosted event. Default is 600.
+            penalty_multiple_encounters (float): The penalty for each repeated encounter of two groups. Default is 600.
+        """
+        self.instance = instance
+        self.groups = instance.groups
+        self.penalty_too_few_guests = penalty_too_few_guests
+        self.penalty_too_many_guests = penalty_too_many_guests
+        self.penalty_multiple_encounters = penalty_multiple_encounters
+
+        self.num_groups = len(self.groups)
+        self.num_events = len(instance.events) - 2
+        self.position = {group: g for g, group in enumerate(self.groups)}
+        self.host_event = np.array([group.host_event_id for group in self.groups], dtype=np.int64)
+        # the legs of each group are read from the travel times of its transport mode
+        self.profile, times, final_times = instance.group_travel_times()
+        self.times = times.astype(np.float64)
+        self.final_times = final_times.astype(np.float64) if final_times is not None else None
+        self.assign: Optional[np.ndarray] = None
+
+    def assignment(self, solution: Dict[Group, List[Group]]) -> np.ndarray:
+        """
+        Converts a solution to the positions of the host of each group at each event.
+
+        Args:
+            solution (Dict[Group, List[Group]]): The solution containing groups and their hosts.
+
+        Returns:
+            np.ndarray: The position of the host of each group (rows) at each main event
+            (columns 1 to n), column 0 holds the position of the group itself.
+
+        Raises:
+            ValueError: If a group is missing, a host is unknown or does not host any event,
+                or a group does not visit exactly one host per event or does not host its own event.
+        """
+        G, n = self.num_groups, self.num_events
+        assign = np.full((G, n + 1), -1, dtype=np.int64)
+        assign[:, 0] = np.arange(G)
+        for group, hosts in solution.items():
+            if group not in self.position:
+                raise ValueError(f"Unknown group {group.name}.")
+            g = self.position[group]
+            for host in hosts:
+                if host not in self.position:
+                    raise ValueError(f"Unknown host {host.name} of group {group.name}.")
+                if not 1 <= host.host_event_id <= n:
+                    raise ValueError(f"Host {host.name} of group {group.name} does not host a main event.")
+                if assign[g, host.host_event_id] >= 0:
+                    raise ValueError(f"Group {group.name} visits several hosts at {self.instance.events[host.host_event_id]}.")
+                assign[g, host.host_event_id] = self.position[host]
+        missing = np.argwhere(assign < 0)
+        if len(missing):
+            g, e = missing[0].tolist()
+            raise ValueError(f"Group {self.groups[g].name} has no host at {self.instance.events[e]}.")
+        own = assign[np.arange(G), self.host_event]
+        if (own != np.arange(G)).any():
+            g = int(np.flatnonzero(own != np.arange(G))[0])
+            raise ValueError(f"Group {self.groups[g].name} does not host its own event.")
+        return assign
+
+    def evaluate(self, solution: Dict[Group, List[Group]]) -> Evaluation:
+        """
+        Evaluates a solution from scratch, e.g. to check an imported or hand-edited plan.
+
+        Args:
+            solution (Dict[Group, List[Group]]): The solution containing groups and their hosts.
+
+        Returns:
+            Evaluation: The objective and its components.
+
+        Raises:
+            ValueError: If the solution is incomplete or invalid, see ``assignment``.
+        """
+        return self.evaluate_assignment(self.assignment(solution))
+
+    def evaluate_assignment(self, assign: np.ndarray) -> Evaluation:
+        """
+        Evaluates an assignment from scratch.
+
+        Args:
+            assign (np.ndarray): The host of each group at each event, see ``assignment``.
+
+        Returns:
+            Evaluation: The objective and its components.
+        """
+        max_legs = self._legs(assign).max(axis=1)
+        counts = self._counts(assign)
+        missing = int(np.maximum(3 - counts, 0).sum())
+        additional = int(np.maximum(counts - 3, 0).sum())
+        encounters = self._repeated_encounters(assign)
+        objective = float(max_legs.sum()) + self.penalty_too_few_guests * missing \
+            + self.penalty_too_many_guests * additional + self.penalty_multiple_encounters * encounters
+        return Evaluation(objective, tuple(max_legs.tolist()), missing, additional, encounters)
+
+    def _legs(self, assign: np.ndarray) -> np.ndarray:
+        # leg k leads from event k (the home for k = 0) to event k+1 (the final destination for k = n)
+        n = self.num_events
+        legs = np.empty((n + 1, self.num_groups))
+        profile = self.profile
+        for k in range(n):
+            legs[k] = self.times[profile, assign[:, k], assign[:, k+1]]
+        if self.final_times is None:
+            legs[n] = self.times[profile, assign[:, n], assign[:, 0]]
+        else:
+            legs[n] = self.final_times[profile, assign[:, n]]
+        return legs
+
+    def _counts(self, assign: np.ndarray) -> np.ndarray:
+        return np.bincount(assign[:, 1:].ravel(), minlength=self.num_groups)
+
+    def _repeated_encounters(self, assign: np.ndarray) -> int:
+        """
+        Counts the repeated encounters by enumerating the pairs of groups at each host.
+        """
+        G = self.num_groups
+        pairs = list()
+        for e in range(1, self.num_events + 1):
+            order = np.argsort(assign[:, e], kind="stable")
+            hosts = assign[order, e]
+            starts = np.flatnonzero(np.r_[True, hosts[1:] != hosts[:-1]])
+            ends = np.r_[starts[1:], G]
+            block_end = np.repeat(ends, ends - starts)
+            # pair every group with the groups after it at the same host
+            counts = block_end - np.arange(G) - 1
+            first = np.repeat(order, counts)
+            second = order[ragged_arange(np.arange(G) + 1, counts)]
+            pairs.append(np.minimum(first, second) * G + np.maximum(first, second))
+        if not pairs:
+            return 0
+        _, multiplicity = np.unique(np.concatenate(pairs), return_counts=True)
+        return int((multiplicity - 1).sum())
+
+    def load(self, assign: np.ndarray) -> None:
+        """
+        Sets the assignment whose moves are evaluated and computes all components from scratch.
+
+        Args:
+            assign (np.ndarray): The host of each group at each event, see ``assignment``.
+                It is modified in place by ``move`` and ``swap``.
+        """
+        G = self.num_groups
+        self.assign = assign
+        self.members = [set() for _ in range(G)]
+        for e in range(1, self.num_events + 1):
+            for g, h in enumerate(assign[:, e].tolist()):
+                self.members[h].add(g)
+        self.meetings = np.zeros((G, G), dtype=np.int16)
+        for members in self.members:
+            members = list(members)
+            self.meetings[np.ix_(members, members)] += 1
+        np.fill_diagonal(self.meetings, 0)
+        self.counts = self._counts(assign)
+        self.legs = self._legs(assign)
+        self.max_legs = self.legs.max(axis=1)
+        self.guest_penalty = float(sum(self._guest_penalty(count) for count in self.counts.tolist()))
+        upper = np.triu(self.meetings, k=1).astype(np.int64)
+        self.encounter_penalty = self.penalty_multiple_encounters * float(np.maximum(upper - 1, 0).sum())
+
+    def solution(self) -> Dict[Group, List[Group]]:
+        """
+        Returns the loaded assignment as solution.
+
+        Returns:
+            Dict[Group, List[Group]]: A dictionary mapping each group to a sorted list
+            of the hosts that the group visits (including itself if it is hosting).
+        """
+        return {group: [self.groups[h] for h in self.assign[g, 1:].tolist()] for g, group in enumerate(self.groups)}
+
+    @property
+    def objective(self) -> float:
+        """
+        float: The objective value of the loaded assignment.
+        """
+        return float(self.max_legs.sum()) + self.guest_penalty + self.encounter_penalty
+
+    def objective_components(self) -> Tuple[List[float], int, int, int]:
+        """
+        Returns the components of the objective of the loaded assignment.
+
+        Returns:
+            Tuple[List[float], int, int, int]: The maximum travel time between each pair of
+            consecutive events, the numbers of missing and of additional guests at hosts
+            and the number of repeated encounters.
+        """
+        upper = np.triu(self.meetings, k=1).astype(np.int64)
+        return (self.max_legs.tolist(),
+                int(np.maximum(3 - self.counts, 0).sum()),
+                int(np.maximum(self.counts - 3, 0).sum()),
+                int(np.maximum(upper - 1, 0).sum()))
+
+    def _guest_penalty(self, count: int) -> float:
+        return self.penalty_too_few_guests * max(0, 3 - count) + self.penalty_too_many_guests * max(0, count - 3)
+
+    def _leg(self, g: int, k: int, hosts: Dict[int, int]) -> float:
+        """
+        Returns leg k of group g if it visited the hosts given per event instead of the loaded ones.
+        """
+        origin = hosts.get(k, self.assign[g, k]) if k > 0 else g
+        profile = self.profile[g]
+        if k < self.num_events:
+            return self.times[profile, origin, hosts.get(k+1, self.assign[g, k+1])]
+        if self.final_times is None:
+            return self.times[profile, origin, g]
+        return self.final_times[profile, origin]
+
+    def _max_leg(self, k: int, changes: Sequence[Tuple[int, float]]) -> float:
+        """
+        Returns the maximum of leg k if the legs of some groups changed, scanning all
+        groups only if the current maximum could decrease.
+        """
+        maximum = self.max_legs[k]
+        if all(value >= maximum or self.legs[k, g] < maximum for g, value in changes):
+            return max([maximum] + [value for _, value in changes])
+        legs = self.legs[k].copy()
+        for g, value in changes:
+            legs[g] = value
+        return legs.max()
+
+    def _delta_legs(self, changes: Dict[int, Dict[int, int]], e: int) -> float:
+        """
+        Returns the change of the maximum legs before and after event e if groups
+        visited other hosts at event e, given as {group: {e: host}}.
+        """
+        delta = 0.0
+        for k in (e - 1, e):
+            new_legs = [(g, self._leg(g, k, hosts)) for g, hosts in changes.items()]
+            delta += self._max_leg(k, new_legs) - self.max_legs[k]
+        return delta
+
+    def delta_move(self, g: int, e: int, b: int) -> float:
+        """
+        Returns the change of the objective if group g visited host b at event e.
+
+        Args:
+            g (int): The position of the group.
+            e (int): The event ID.
+            b (int): The position of the new host, which hosts event e.
+
+        Returns:
+            float: The change of the objective.
+        """
+        a = self.assign[g, e]
+        if a == b:
+            return 0.0
+        counts = self.counts
+        delta = self._guest_penalty(counts[a] - 1) - self._guest_penalty(counts[a]) \
+            + self._guest_penalty(counts[b] + 1) - self._guest_penalty(counts[b])
+        meetings = self.meetings[g]
+        repeated = sum(1 for m in self.members[b] if meetings[m] >= 1) \
+            - sum(1 for m in self.members[a] if m != g and meetings[m] >= 2)
+        delta += self.penalty_multiple_encounters * repeated
+        return delta + self._delta_legs({g: {e: b}}, e)
+
+    def delta_swap(self, g1: int, g2: int, e: int) -> float:
+        """
+        Returns the change of the objective if groups g1 and g2 exchanged their hosts at event e.
+
+        Args:
+            g1 (int): The position of the first group.
+            g2 (int): The position of the second group.
+            e (int): The event ID.
+
+        Returns:
+            float: The change of the objective.
+        """
+        a, b = self.assign[g1, e], self.assign[g2, e]
+        if a == b:
+            return 0.0
+        meetings1, meetings2 = self.meetings[g1], self.meetings[g2]
+        repeated = sum(1 for m in self.members[b] if m != g2 and meetings1[m] >= 1) \
+            - sum(1 for m in self.members[a] if m != g1 and meetings1[m] >= 2) \
+            + sum(1 for m in self.members[a] if m != g1 and meetings2[m] >= 1) \
+            - sum(1 for m in self.members[b] if m != g2 and meetings2[m] >= 2)
+        delta = self.penalty_multiple_encounters * repeated
+        return delta + self._delta_legs({g1: {e: b}, g2: {e: a}}, e)
+
+    def move(self, g: int, e: int, b: int) -> None:
+        """
+        Moves group g to host b at event e and updates the objective components.
+
+        Args:
+            g (int): The position of the group.
+            e (int): The event ID.
+            b (int): The position of the new host, which hosts event e.
+        """
+        a = self.assign[g, e]
+        if a == b:
+            return
+        self.guest_penalty -= self._guest_penalty(self.counts[a]) + self._guest_penalty(self.counts[b])
+        self.counts[a] -= 1
+        self.counts[b] += 1
+        self.guest_penalty += self._guest_penalty(self.counts[a]) + self._guest_penalty(self.counts[b])
+
+        self.members[a].discard(g)
+        for m in self.members[a]:
+            if self.meetings[g, m] >= 2:
+                self.encounter_penalty -= self.penalty_multiple_encounters
+            self.meetings[g, m] -= 1
+            self.meetings[m, g] -= 1
+        for m in self.members[b]:
+            if self.meetings[g, m] >= 1:
+                self.encounter_penalty += self.penalty_multiple_encounters
+            self.meetings[g, m] += 1
+            self.meetings[m, g] += 1
+        self.members[b].add(g)
+
+        self.assign[g, e] = b
+        for k in (e - 1, e):
+            new_leg = self._leg(g, k, dict())
+            self.max_legs[k] = self._max_leg(k, [(g, new_leg)])
+            self.legs[k, g] = new_leg
+
+    def swap(self, g1: int, g2: int, e: int) -> None:
+        """
+        Exchanges the hosts of groups g1 and g2 at event e and updates the objective components.
+
+        Args:
+            g1 (int): The position of the first group.
+            g2 (int): The position of the second group.
+            e (int): The event ID.
+        """
+        a, b = self.assign[g1, e], self.assign[g2, e]
+        self.move(g1, e, b)
+        self.move(g2, e, a)
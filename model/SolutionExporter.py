@@ -0,0 +1,198 @@
+import csv
+import json
+from collections import defaultdict
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TYPE_CHECKING
+from model.Group import Group
+
+if TYPE_CHECKING:
+    from model.DinnerInstance import DinnerInstance
+
+
+class SolutionExporter:
+    """
+    Streams the itineraries of a solution, one row per leg of every group.
+
+    A group with n main events has n+1 legs: from its home to the host of the
+    first main event, between the hosts of consecutive main events and from
+    the host of the last main event to the after party, or back home if there
+    is none. Each row holds the origin and destination with their coordinates,
+    the transport mode of the group, its travel time and the guests met at the
+    destination. The rows are generated lazily and written in batches, so that
+    the memory does not grow with the number of groups beyond the solution
+    itself.
+    """
+
+    FORMATS = ("csv", "jsonl", "parquet")
+    COLUMNS = ("group", "leg", "event", "origin", "origin_lat", "origin_lon",
+               "destination", "destination_lat", "destination_lon", "transport_mode", "travel_time", "guests")
+
+    def __init__(self, instance: "DinnerInstance") -> None:
+        """
+        Initializes the SolutionExporter.
+
+        Args:
+            instance (DinnerInstance): The instance whose solutions are exported.
+        """
+        self.instance = instance
+
+    def legs(self, solution: Dict[Group, List[Group]]) -> Iterator[Dict[str, Any]]:
+        """
+        Generates the legs of all groups of a solution.
+
+        Args:
+            solution (Dict[Group, List[Group]]): The solution containing groups and their hosts.
+
+        Yields:
+            Dict[str, Any]: One row per leg with the keys in ``COLUMNS``, the guests
+            as list of group names.
+        """
+        events = self.instance.events
+        after_party = self.instance.after_party
+        travel_times = self.instance.travel_times
+        index = travel_times.index
+        visitors = defaultdict(list)
+        for group, hosts in solution.items():
+            for host in hosts:
+                visitors[host].append(group.name)
+
+        for group, hosts in solution.items():
+            hosts = sorted(hosts, key=lambda host: host.host_event_id)
+            transport_mode = group.transport_mode or travel_times.transport_mode
+            times = travel_times.profile(transport_mode)
+            stops = [(group.name, group.location, list())]
+            stops += [(host.name, host.location, [name for name in visitors[host] if name != group.name])
+                      for host in hosts]
+            if after_party is not None:
+                stops.append(("Party", after_party, list()))
+            else:
+                stops.append((group.name, group.location, list()))
+            for leg, ((origin, origin_location, _), (destination, destination_location, guests)) \
+                    in enumerate(zip(stops, stops[1:])):
+                yield {
+                    "group": group.name,
+                    "leg": leg,
+                    "event": events[leg + 1],
+                    "origin": origin,
+                    "origin_lat": origin_location.coordinates.lat,
+                    "origin_lon": origin_location.coordinates.lon,
+                    "destination": destination,
+                    "destination_lat": destination_location.coordinates.lat,
+                    "destination_lon": destination_location.coordinates.lon,
+                    "transport_mode": transport_mode,
+                    "travel_time": float(times[index[origin_location], index[destination_location]]),
+                    "guests": guests,
+                }
+
+    def export(self,
+               filename: str,
+               solution: Dict[Group, List[Group]],
+               format: Optional[str] = None,
+               batch_size: int = 4096) -> int:
+        """
+        Writes the legs of a solution to a file.
+
+        Args:
+            filename (str): The name of the file.
+            solution (Dict[Group, List[Group]]): The solution containing groups and their hosts.
+            format (Optional[str]): One of "csv", "jsonl" and "parquet". Defaults to the
+                extension of the filename.
+            batch_size (int): The number of rows per Parquet row group. Default is 4096.
+
+        Returns:
+            int: The number of written legs.
+
+        Raises:
+            ValueError: If the format is unknown.
+            ImportError: If the format is Parquet and pyarrow is not installed.
+        """
+        if format is None:
+            format = filename.rsplit(".", 1)[-1].lower()
+        if format == "csv":
+            return self.write_csv(filename, self.legs(solution))
+        if format == "jsonl":
+            return self.write_jsonl(filename, self.legs(solution))
+        if format == "parquet":
+            return self.write_parquet(filename, self.legs(solution), batch_size)
+        raise ValueError(f"Unknown format {format}, expected one of {', '.join(self.FORMATS)}.")
+
+    @classmethod
+    def write_csv(cls, filename: str, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Writes rows to a CSV file delimited by semicolons, with the guests joined by commas.
+
+        Args:
+            filename (str): The name of the file.
+            rows (Iterable[Dict[str, Any]]): The rows, e.g. generated by ``legs``.
+
+        Returns:
+            int: The number of written rows.
+        """
+        count = 0
+        with open(filename, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=cls.COLUMNS, delimiter=";", quoting=csv.QUOTE_NONNUMERIC)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({**row, "guests": ",".join(row["guests"])})
+                count += 1
+        return count
+
+    @staticmethod
+    def write_jsonl(filename: str, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Writes rows to a JSON Lines file, one JSON object per row.
+
+        Args:
+            filename (str): The name of the file.
+            rows (Iterable[Dict[str, Any]]): The rows, e.g. generated by ``legs``.
+
+        Returns:
+            int: The number of written rows.
+        """
+        count = 0
+        with open(filename, "w") as file:
+            for row in rows:
+                file.write(json.dumps(row, ensure_ascii=False))
+                file.write("\n")
+                count += 1
+        return count
+
+    @staticmethod
+    def write_parquet(filename: str, rows: Iterable[Dict[str, Any]], batch_size: int = 4096) -> int:
+        """
+        Writes rows to a Parquet file in row groups of batch_size rows.
+
+        Args:
+            filename (str): The name of the file.
+            rows (Iterable[Dict[str, Any]]): The rows, e.g. generated by ``legs``.
+            batch_size (int): The number of rows per row group. Default is 4096.
+
+        Returns:
+            int: The number of written rows.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Exporting to Parquet requires pyarrow, install it with pip install pyarrow.") from None
+        schema = pyarrow.schema([
+            ("group", pyarrow.string()), ("leg", pyarrow.int32()), ("event", pyarrow.string()),
+            ("origin", pyarrow.string()), ("origin_lat", pyarrow.float64()), ("origin_lon", pyarrow.float64()),
+            ("destination", pyarrow.string()), ("destination_lat", pyarrow.float64()),
+            ("destination_lon", pyarrow.float64()), ("transport_mode", pyarrow.string()),
+            ("travel_time", pyarrow.float64()),
+            ("guests", pyarrow.list_(pyarrow.string())),
+        ])
+        count = 0
+        rows = iter(rows)
+        with pyarrow.parquet.ParquetWriter(filename, schema) as writer:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                writer.write_batch(pyarrow.RecordBatch.from_pylist(batch, schema=schema))
+                count += len(batch)
+        return count
@@ -0,0 +1,106 @@
+from typing import Dict, NamedTuple, Optional
+
+
+def relative_gap(incumbent: Optional[float], bound: Optional[float]) -> Optional[float]:
+    """
+    Computes the relative gap between the objective of a solution and a lower bound.
+
+    Args:
+        incumbent (Optional[float]): The objective of the best known solution.
+        bound (Optional[float]): The lower bound of the objective.
+
+    Returns:
+        Optional[float]: The gap relative to the incumbent, None if either is unknown.
+    """
+    if incumbent is None or bound is None:
+        return None
+    return max(0.0, incumbent - bound) / max(abs(incumbent), 1e-9)
+
+
+class SolveProgress(NamedTuple):
+    """
+    Progress of a running solver, passed to progress callbacks.
+
+    Attributes:
+        elapsed (float): The time since the solver was started in seconds.
+        incumbent (Optional[float]): The objective of the best solution found so far.
+        bound (Optional[float]): The best lower bound of the objective found so far.
+        gap (Optional[float]): The gap between incumbent and bound relative to the incumbent.
+    """
+    elapsed: float
+    incumbent: Optional[float]
+    bound: Optional[float]
+    gap: Optional[float]
+
+
+class SolveStats:
+    """
+    Collects the size of a model and the time spent in each phase of solving it.
+
+    The phases are ``"variables"`` (variable creation), ``"constraints"``
+    (constraint generation), ``"solver_io"`` (passing the model to the solver
+    and reading the solution back), ``"solve"`` and ``"extraction"`` (reading
+    the assignment from the solved model).
+
+    The status is ``"Optimal"``, ``"Feasible"`` if a solution was found but a
+    time or gap limit stopped the solver before proving optimality,
+    ``"Infeasible"``, ``"Unbounded"`` or ``"Not Solved"``. The bound and gap
+    are known if the solver reports a lower bound.
+    """
+
+    PHASES = ("variables", "constraints", "solver_io", "solve", "extraction")
+
+    def __init__(self) -> None:
+        """
+        Initializes empty statistics.
+        """
+        self.timings: Dict[str, float] = {phase: 0.0 for phase in self.PHASES}
+        self.num_variables = 0
+        self.num_constraints = 0
+        self.num_nonzeros = 0
+        self.solver: Optional[str] = None
+        self.status: Optional[str] = None
+        self.objective: Optional[float] = None
+        self.bound: Optional[float] = None
+        self.gap: Optional[float] = None
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """
+        Adds time to a phase.
+
+        Args:
+            name (str): The name of the phase.
+            seconds (float): The time in seconds.
+        """
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    @property
+    def total_time(self) -> float:
+        """
+        float: The time spent in all phases in seconds.
+        """
+        return sum(self.timings.values())
+
+    def as_dict(self) -> Dict[str, object]:
+        """
+        Returns the statistics as flat dictionary, e.g. to write them as JSON or CSV row.
+
+        Returns:
+            Dict[str, object]: The statistics with one entry per phase.
+        """
+        stats = {"solver": self.solver,
+                 "status": self.status,
+                 "objective": self.objective,
+                 "bound": self.bound,
+                 "gap": self.gap,
+                 "num_variables": self.num_variables,
+                 "num_constraints": self.num_constraints,
+                 "num_nonzeros": self.num_nonzeros}
+        stats.update({f"time_{phase}": seconds for phase, seconds in self.timings.items()})
+        stats["time_total"] = self.total_time
+        return stats
+
+    def __str__(self) -> str:
+        timings = ", ".join(f"{phase} {round(seconds, 2)}s" for phase, seconds in self.timings.items())
+        return (f"{self.num_variables} variables, {self.num_constraints} constraints, "
+                f"{self.num_nonzeros} nonzeros; {timings}")
@@ -0,0 +1,224 @@
+import numpy as np
+from typing import List, Tuple, Union
+from pulp import LpAffineExpression, LpConstraint, LpConstraintEQ, LpConstraintGE, LpConstraintLE, \
+    LpContinuous, LpInteger, LpProblem, LpVariable
+
+
+def ragged_arange(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Concatenates the ranges ``arange(start, start + count)`` of all starts and counts without a Python loop.
+
+    Args:
+        starts (np.ndarray): The first value of each range.
+        counts (np.ndarray): The length of each range.
+
+    Returns:
+        np.ndarray: The concatenated ranges.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.cumsum(counts)
+    offsets = np.repeat(starts - (ends - counts), counts)
+    return offsets + np.arange(total, dtype=np.int64)
+
+
+class SparseModel:
+    """
+    Mixed-integer program stored as integer-indexed NumPy arrays.
+
+    Columns (variables) and rows (constraints) are added in blocks, each row
+    block given as coordinate lists of (row, column, coefficient) with lower and
+    upper bounds per row. The arrays can be handed to a solver directly or
+    turned into a PuLP problem by ``pulp_variables`` and ``add_pulp_constraints``.
+    The objective is kept as dense cost vector ``cost``.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty model.
+        """
+        self.num_columns = 0
+        self.num_rows = 0
+        self._column_blocks: List[Tuple[str, int, int]] = list()
+        self.lower = np.zeros(0)
+        self.upper = np.zeros(0)
+        self.integer = np.zeros(0, dtype=bool)
+        self._row_blocks: List[Tuple[str, int, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = list()
+        self.cost = np.zeros(0)
+
+    def add_columns(self,
+                    name: str,
+                    count: int,
+                    lower: Union[float, np.ndarray] = 0.0,
+                    upper: Union[float, np.ndarray] = np.inf,
+                    integer: bool = False) -> np.ndarray:
+        """
+        Adds a block of columns.
+
+        Args:
+            name (str): The name of the block, the columns are named ``{name}_{i}``.
+            count (int): The number of columns.
+            lower (Union[float, np.ndarray]): The lower bounds. Default is 0.
+            upper (Union[float, np.ndarray]): The upper bounds. Default is infinity.
+            integer (bool): Whether the columns are integer. Default is False.
+
+        Returns:
+            np.ndarray: The indices of the new columns.
+        """
+        self._column_blocks.append((name, self.num_columns, count))
+        self.lower = np.concatenate((self.lower, np.broadcast_to(np.asarray(lower, dtype=np.float64), (count,))))
+        self.upper = np.concatenate((self.upper, np.broadcast_to(np.asarray(upper, dtype=np.float64), (count,))))
+        self.integer = np.concatenate((self.integer, np.full(count, integer)))
+        indices = np.arange(self.num_columns, self.num_columns + count)
+        self.num_columns += count
+        self.cost = np.concatenate((self.cost, np.zeros(count)))
+        return indices
+
+    def add_rows(self,
+                 name: str,
+                 count: int,
+                 rows: np.ndarray,
+                 columns: np.ndarray,
+                 coefficients: np.ndarray,
+                 lower: Union[float, np.ndarray] = -np.inf,
+                 upper: Union[float, np.ndarray] = np.inf) -> np.ndarray:
+        """
+        Adds a block of rows given as coordinate lists.
+
+        Args:
+            name (str): The name of the block, the rows are named ``{name}_{i}``.
+            count (int): The number of rows.
+            rows (np.ndarray): The row of each entry within the block, from 0 to count-1.
+            columns (np.ndarray): The column of each entry.
+            coefficients (np.ndarray): The coefficient of each entry.
+            lower (Union[float, np.ndarray]): The lower bounds. Default is minus infinity.
+            upper (Union[float, np.ndarray]): The upper bounds. Default is infinity.
+
+        Returns:
+            np.ndarray: The indices of the new rows.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        order = np.argsort(rows, kind="stable")
+        lower = np.broadcast_to(np.asarray(lower, dtype=np.float64), (count,))
+        upper = np.broadcast_to(np.asarray(upper, dtype=np.float64), (count,))
+        self._row_blocks.append((name, count,
+                                 rows[order],
+                                 np.asarray(columns, dtype=np.int64)[order],
+                                 np.asarray(coefficients, dtype=np.float64)[order],
+                                 lower, upper))
+        indices = np.arange(self.num_rows, self.num_rows + count)
+        self.num_rows += count
+        return indices
+
+    @property
+    def num_nonzeros(self) -> int:
+        """
+        int: The number of entries of the constraint matrix.
+        """
+        return sum(len(block[2]) for block in self._row_blocks)
+
+    def column_bounds(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the bounds and integrality of all columns.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: The lower and upper bounds and
+            whether each column is integer.
+        """
+        return self.lower, self.upper, self.integer
+
+    def set_column_bounds(self,
+                          columns: np.ndarray,
+                          lower: Union[float, np.ndarray],
+                          upper: Union[float, np.ndarray]) -> None:
+        """
+        Changes the bounds of some columns, e.g. to fix them.
+
+        Args:
+            columns (np.ndarray): The indices of the columns.
+            lower (Union[float, np.ndarray]): The new lower bounds.
+            upper (Union[float, np.ndarray]): The new upper bounds.
+        """
+        self.lower[columns] = lower
+        self.upper[columns] = upper
+
+    def row_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the bounds of all rows.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The lower and upper bounds.
+        """
+        if not self._row_blocks:
+            return np.zeros(0), np.zeros(0)
+        return (np.concatenate([block[5] for block in self._row_blocks]),
+                np.concatenate([block[6] for block in self._row_blocks]))
+
+    def matrix(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the constraint matrix in compressed sparse row format.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: The start of each row and one past the
+            last row, the column of each entry and the coefficient of each entry.
+        """
+        counts = np.zeros(self.num_rows, dtype=np.int64)
+        offset = 0
+        for _, count, rows, _, _, _, _ in self._row_blocks:
+            counts[offset:offset+count] = np.bincount(rows, minlength=count)
+            offset += count
+        starts = np.concatenate(([0], np.cumsum(counts)))
+        if not self._row_blocks:
+            return starts, np.zeros(0, dtype=np.int64), np.zeros(0)
+        return (starts,
+                np.concatenate([block[3] for block in self._row_blocks]),
+                np.concatenate([block[4] for block in self._row_blocks]))
+
+    def pulp_variables(self) -> List[LpVariable]:
+        """
+        Creates the columns as PuLP variables.
+
+        Returns:
+            List[LpVariable]: The variables by column index.
+        """
+        variables = list()
+        for name, start, count in self._column_blocks:
+            category = LpInteger if count and self.integer[start] else LpContinuous
+            lower = self.lower[start:start+count].tolist()
+            upper = self.upper[start:start+count].tolist()
+            for i, (low, up) in enumerate(zip(lower, upper)):
+                variables.append(LpVariable(f"{name}_{i}",
+                                            lowBound=low if low > -np.inf else None,
+                                            upBound=up if up < np.inf else None,
+                                            cat=category))
+        return variables
+
+    def add_pulp_constraints(self, prob: LpProblem, variables: List[LpVariable]) -> None:
+        """
+        Adds the rows as constraints to a PuLP problem. PuLP has no ranged
+        constraints, so a row with different finite bounds on both sides becomes
+        two constraints named ``{name}_{i}_lower`` and ``{name}_{i}_upper``.
+
+        Args:
+            prob (LpProblem): The problem to add the constraints to.
+            variables (List[LpVariable]): The variables by column index, see ``pulp_variables``.
+        """
+        for name, count, rows, columns, coefficients, lower, upper in self._row_blocks:
+            starts = np.searchsorted(rows, np.arange(count + 1)).tolist()
+            columns = columns.tolist()
+            coefficients = coefficients.tolist()
+            for r, (low, up) in enumerate(zip(lower.tolist(), upper.tolist())):
+                expression = LpAffineExpression([(variables[c], a) for c, a in
+                                                 zip(columns[starts[r]:starts[r+1]], coefficients[starts[r]:starts[r+1]])])
+                if low == up:
+                    prob.addConstraint(LpConstraint(expression, LpConstraintEQ, f"{name}_{r}", up))
+                elif low == -np.inf:
+                    prob.addConstraint(LpConstraint(expression, LpConstraintLE, f"{name}_{r}", up))
+                elif up == np.inf:
+                    prob.addConstraint(LpConstraint(expression, LpConstraintGE, f"{name}_{r}", low))
+                else:
+                    prob.addConstraint(LpConstraint(expression, LpConstraintGE, f"{name}_{r}_lower", low))
+                    prob.addConstraint(LpConstraint(expression.copy(), LpConstraintLE, f"{name}_{r}_upper", up))
@@ -0,0 +1,112 @@
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List
+from model.Coordinates import Coordinates
+
+
+class TravelTimeCache(ABC):
+    """
+    Interface for caches of travel times between pairs of coordinates, keyed by
+    the transport mode, the metric and the coordinates of origin and destination.
+    """
+
+    @staticmethod
+    def make_key(transport_mode: str, measurement: str, origin: Coordinates, destination: Coordinates) -> str:
+        """
+        Builds the cache key of a travel time.
+
+        Args:
+            transport_mode (str): The transport mode, e.g. "foot-walking".
+            measurement (str): The metric, e.g. "duration".
+            origin (Coordinates): The coordinates of the origin.
+            destination (Coordinates): The coordinates of the destination.
+
+        Returns:
+            str: The cache key.
+        """
+        return (f"{transport_mode}|{measurement}|{origin.lat:.6f},{origin.lon:.6f}|"
+                f"{destination.lat:.6f},{destination.lon:.6f}")
+
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> Dict[str, float]:
+        """
+        Looks up the travel times for several keys.
+
+        Args:
+            keys (List[str]): The cache keys.
+
+        Returns:
+            Dict[str, float]: The cached travel times of the keys that are present.
+        """
+
+    @abstractmethod
+    def set_many(self, travel_times: Dict[str, float]) -> None:
+        """
+        Stores several travel times.
+
+        Args:
+            travel_times (Dict[str, float]): The travel times by cache key.
+        """
+
+
+class MemoryTravelTimeCache(TravelTimeCache):
+    """
+    Travel time cache that keeps its entries in memory.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty in-memory cache.
+        """
+        self._entries: Dict[str, float] = dict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> Dict[str, float]:
+        with self._lock:
+            return {key: self._entries[key] for key in keys if key in self._entries}
+
+    def set_many(self, travel_times: Dict[str, float]) -> None:
+        with self._lock:
+            self._entries.update(travel_times)
+
+
+class SQLiteTravelTimeCache(TravelTimeCache):
+    """
+    Persistent travel time cache stored in a local SQLite file.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+        Opens or creates the cache file.
+
+        Args:
+            filename (str): The name of the SQLite file.
+        """
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS travel_times (key TEXT PRIMARY KEY, value REAL NOT NULL)")
+
+    def get_many(self, keys: List[str]) -> Dict[str, float]:
+        result = dict()
+        with self._lock:
+            # stay below the maximum number of SQL variables
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i+500]
+                result.update(self._connection.execute(
+                    f"SELECT key, value FROM travel_times WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk).fetchall())
+        return result
+
+    def set_many(self, travel_times: Dict[str, float]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO travel_times VALUES (?, ?)", travel_times.items())
+
+    def close(self) -> None:
+        """
+        Closes the connection to the cache file.
+        """
+        self._connection.close()
@@ -0,0 +1,368 @@
+import csv
+import heapq
+import numpy as np
+from abc import ABC, abstractmethod
+from copy import copy
+from concurrent.futures import ThreadPoolExecutor
+from math import isqrt
+from time import sleep
+from typing import Dict, List, Optional, Tuple
+from typing_extensions import Self
+from model.Coordinates import Coordinates
+from model.OrsSession import OrsSession
+from model.TravelTimeCache import TravelTimeCache
+
+EARTH_RADIUS = 6371008.8
+
+
+def haversine(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """
+    Computes great-circle distances in meters, broadcasting over the arguments.
+
+    Args:
+        lat1 (np.ndarray): Latitudes of the origins in degrees.
+        lon1 (np.ndarray): Longitudes of the origins in degrees.
+        lat2 (np.ndarray): Latitudes of the destinations in degrees.
+        lon2 (np.ndarray): Longitudes of the destinations in degrees.
+
+    Returns:
+        np.ndarray: The distances in meters.
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class TravelTimeProvider(ABC):
+    """
+    Interface for sources of travel times between coordinates.
+    """
+
+    transport_mode = "foot-walking"
+    measurement = "duration"
+
+    @abstractmethod
+    def fill(self, matrix: np.ndarray, coords: List[Coordinates]) -> None:
+        """
+        Fills the missing cells of a travel time matrix in place.
+
+        Args:
+            matrix (np.ndarray): The square float32 matrix, missing cells are NaN.
+            coords (List[Coordinates]): The coordinates of the rows and columns.
+        """
+
+    def for_profile(self, transport_mode: str, measurement: str) -> "TravelTimeProvider":
+        """
+        Returns a provider of the same source for another transport mode or metric,
+        e.g. for groups that cycle while the others walk.
+
+        Args:
+            transport_mode (str): The transport mode.
+            measurement (str): The metric, either "duration" or "distance".
+
+        Returns:
+            TravelTimeProvider: The provider of the profile.
+
+        Raises:
+            ValueError: If the source cannot provide the profile.
+        """
+        if (transport_mode, measurement) == (self.transport_mode, self.measurement):
+            return self
+        raise ValueError(f"{type(self).__name__} cannot provide travel times for {transport_mode} ({measurement}).")
+
+
+class OrsTravelTimeProvider(TravelTimeProvider):
+    """
+    Travel times from the OpenRouteService matrix API.
+
+    The matrix is fetched in tiles of sources × destinations that stay below the
+    element limit of a single matrix request. Tiles are requested concurrently
+    and only rows and columns with missing cells, which are neither known nor
+    cached, are requested.
+    """
+
+    def __init__(self,
+                 auth_key: str,
+                 session: Optional[OrsSession] = None,
+                 cache: Optional[TravelTimeCache] = None,
+                 transport_mode: str = "foot-walking",
+                 measurement: str = "duration",
+                 max_elements: int = 3500,
+                 max_workers: int = 4,
+                 tile_retries: int = 3) -> None:
+        """
+        Initializes the OrsTravelTimeProvider.
+
+        Args:
+            auth_key (str): The authentication key for the OpenRouteService API.
+            session (Optional[OrsSession]): Optional session, e.g. with another base URL or rate
+                limit. Defaults to a session limited to the 40 requests per minute of the free plan.
+            cache (Optional[TravelTimeCache]): Optional cache for travel times. Default is None.
+            transport_mode (str): The OpenRouteService profile. Default is "foot-walking".
+            measurement (str): The metric, either "duration" or "distance". Default is "duration".
+            max_elements (int): The maximum number of matrix elements of a single request. Default is 3500.
+            max_workers (int): The number of concurrent tile requests. Default is 4.
+            tile_retries (int): The number of retries of a tile with an erroneous response. Default is 3.
+        """
+        self.session = session if session is not None else OrsSession(auth_key, requests_per_minute=40)
+        self.cache = cache
+        self.transport_mode = transport_mode
+        self.measurement = measurement
+        self.max_elements = max_elements
+        self.max_workers = max_workers
+        self.tile_retries = tile_retries
+
+    def for_profile(self, transport_mode: str, measurement: str) -> "OrsTravelTimeProvider":
+        # the profiles share the session, and thereby its rate limit, and the cache, whose keys include the profile
+        provider = copy(self)
+        provider.transport_mode = transport_mode
+        provider.measurement = measurement
+        return provider
+
+    def _cache_key(self, origin: Coordinates, destination: Coordinates) -> str:
+        return TravelTimeCache.make_key(self.transport_mode, self.measurement, origin, destination)
+
+    def fill(self, matrix: np.ndarray, coords: List[Coordinates]) -> None:
+        if self.cache is not None:
+            keys = {(i, j): self._cache_key(coords[i], coords[j]) for i, j in zip(*np.nonzero(np.isnan(matrix)))}
+            cached = self.cache.get_many(list(keys.values()))
+            for (i, j), key in keys.items():
+                if key in cached:
+                    matrix[i, j] = cached[key]
+
+        # only request the rows and columns of a tile that contain missing cells
+        missing = np.isnan(matrix)
+        tile_size = max(1, isqrt(self.max_elements))
+        tiles: List[Tuple[List[int], List[int]]] = list()
+        for row_start in range(0, len(coords), tile_size):
+            for col_start in range(0, len(coords), tile_size):
+                tile = missing[row_start:row_start+tile_size, col_start:col_start+tile_size]
+                rows = (row_start + np.nonzero(tile.any(axis=1))[0]).tolist()
+                cols = (col_start + np.nonzero(tile.any(axis=0))[0]).tolist()
+                if rows:
+                    tiles.append((rows, cols))
+        if not tiles:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda tile: self._get_travel_times(coords, *tile), tiles))
+        fetched = dict()
+        for (rows, cols), tile_times in zip(tiles, results):
+            tile_matrix = np.array(tile_times, dtype=np.float32)  # unreachable pairs (None) become NaN
+            tile_missing = missing[np.ix_(rows, cols)]
+            matrix[np.ix_(rows, cols)] = np.where(tile_missing, tile_matrix, matrix[np.ix_(rows, cols)])
+            if self.cache is not None:
+                for a, b in zip(*np.nonzero(tile_missing & ~np.isnan(tile_matrix))):
+                    fetched[self._cache_key(coords[rows[a]], coords[cols[b]])] = float(tile_matrix[a, b])
+        if self.cache is not None and fetched:
+            self.cache.set_many(fetched)
+
+    def _get_travel_times(self, coords: List[Coordinates], sources: List[int], destinations: List[int]) -> List[List[float]]:
+        """
+        Gets the travel times of one tile using the OpenRouteService API.
+
+        Args:
+            coords (List[Coordinates]): The list of coordinates.
+            sources (List[int]): The indices of the origins of the tile.
+            destinations (List[int]): The indices of the destinations of the tile.
+
+        Returns:
+            List[List[float]]: A matrix of travel times from the sources to the destinations.
+
+        Raises:
+            RuntimeError: If there is still an error in the response after all retries.
+        """
+        body = {
+            "locations": [(coords[i].lon, coords[i].lat) for i in sources + destinations],
+            "sources": list(range(len(sources))),
+            "destinations": list(range(len(sources), len(sources) + len(destinations))),
+            "metrics": [self.measurement]
+        }
+        for attempt in range(self.tile_retries + 1):
+            result = self.session.post(f"/v2/matrix/{self.transport_mode}", json=body).json()
+            if self.measurement + 's' in result:
+                return result[self.measurement + 's']
+            if attempt < self.tile_retries:
+                sleep(self.session.backoff_factor * 2 ** attempt)
+        raise RuntimeError(f"Openrouteservice: {result.get('error', result)}")
+
+
+class HaversineTravelTimeProvider(TravelTimeProvider):
+    """
+    Offline estimate of travel times from great-circle distances, a detour
+    factor for the road network and a constant speed.
+    """
+
+    SPEEDS = {"foot-walking": 5.0, "cycling-regular": 15.0, "driving-car": 30.0}
+
+    def __init__(self,
+                 transport_mode: str = "foot-walking",
+                 measurement: str = "duration",
+                 speed: Optional[float] = None,
+                 detour_factor: float = 1.3) -> None:
+        """
+        Initializes the HaversineTravelTimeProvider.
+
+        Args:
+            transport_mode (str): The transport mode, used to look up the default speed. Default is "foot-walking".
+            measurement (str): Either "duration" in seconds or "distance" in meters. Default is "duration".
+            speed (Optional[float]): The speed in km/h. Defaults to the speed of the transport mode.
+            detour_factor (float): The ratio of road distance to great-circle distance. Default is 1.3.
+        """
+        self.transport_mode = transport_mode
+        self.measurement = measurement
+        self.speed = speed if speed is not None else self.SPEEDS[transport_mode]
+        self.detour_factor = detour_factor
+
+    def for_profile(self, transport_mode: str, measurement: str) -> "HaversineTravelTimeProvider":
+        if transport_mode != self.transport_mode and transport_mode not in self.SPEEDS:
+            raise ValueError(f"There is no default speed for {transport_mode}.")
+        speed = self.speed if transport_mode == self.transport_mode else None
+        return type(self)(transport_mode, measurement, speed=speed, detour_factor=self.detour_factor)
+
+    def fill(self, matrix: np.ndarray, coords: List[Coordinates]) -> None:
+        rows = np.nonzero(np.isnan(matrix).any(axis=1))[0]
+        if not len(rows):
+            return
+        lat = np.fromiter((c.lat for c in coords), dtype=np.float64, count=len(coords))
+        lon = np.fromiter((c.lon for c in coords), dtype=np.float64, count=len(coords))
+        estimate = haversine(lat[rows, None], lon[rows, None], lat[None, :], lon[None, :]) * self.detour_factor
+        if self.measurement == "duration":
+            estimate /= self.speed / 3.6
+        matrix[rows] = np.where(np.isnan(matrix[rows]), estimate, matrix[rows])
+
+
+class GraphTravelTimeProvider(TravelTimeProvider):
+    """
+    Offline travel times from shortest paths in a locally stored road graph.
+
+    Every location is snapped to its nearest graph node, reached at the access
+    speed along the great-circle distance. Shortest paths from all origin nodes
+    are computed by a multi-source Dijkstra, using scipy if available.
+    """
+
+    def __init__(self,
+                 nodes: List[Coordinates],
+                 edges: List[Tuple[int, int, float]],
+                 directed: bool = False,
+                 access_speed: float = 5.0,
+                 transport_mode: str = "foot-walking",
+                 measurement: str = "duration") -> None:
+        """
+        Initializes the GraphTravelTimeProvider.
+
+        Args:
+            nodes (List[Coordinates]): The coordinates of the graph nodes.
+            edges (List[Tuple[int, int, float]]): The edges as node indices and travel time (or length).
+            directed (bool): Whether edges are one-way. Default is False.
+            access_speed (float): The speed in km/h between a location and its nearest node. Default is 5.0.
+            transport_mode (str): The transport mode the edge weights refer to. Default is "foot-walking".
+            measurement (str): The metric of the edge weights. Default is "duration".
+        """
+        self.nodes = nodes
+        self.node_lat = np.fromiter((c.lat for c in nodes), dtype=np.float64, count=len(nodes))
+        self.node_lon = np.fromiter((c.lon for c in nodes), dtype=np.float64, count=len(nodes))
+        self.directed = directed
+        self.access_speed = access_speed
+        self.transport_mode = transport_mode
+        self.measurement = measurement
+        sources = np.fromiter((edge[0] for edge in edges), dtype=np.int64, count=len(edges))
+        targets = np.fromiter((edge[1] for edge in edges), dtype=np.int64, count=len(edges))
+        weights = np.fromiter((edge[2] for edge in edges), dtype=np.float64, count=len(edges))
+        if not directed:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate((targets, sources))
+            weights = np.concatenate((weights, weights))
+        self.edges = sources, targets, weights
+
+    @classmethod
+    def from_csv(cls, filename: str, delimiter: str = ",", **kwargs) -> Self:
+        """
+        Creates the provider from a CSV edge list with a header and the columns
+        from_lat, from_lon, to_lat, to_lon and weight, e.g. exported from an OSM extract.
+        Nodes with identical coordinates are merged.
+
+        Args:
+            filename (str): The name of the CSV file.
+            delimiter (str): The column delimiter. Default is ",".
+            **kwargs: Further arguments of the constructor.
+
+        Returns:
+            GraphTravelTimeProvider: The created provider.
+        """
+        node_ids: Dict[Tuple[float, float], int] = dict()
+        edges = list()
+        with open(filename, newline="") as file:
+            for row in csv.DictReader(file, delimiter=delimiter):
+                endpoints = list()
+                for prefix in ("from", "to"):
+                    key = (float(row[f"{prefix}_lat"]), float(row[f"{prefix}_lon"]))
+                    endpoints.append(node_ids.setdefault(key, len(node_ids)))
+                edges.append((endpoints[0], endpoints[1], float(row["weight"])))
+        return cls([Coordinates(*key) for key in node_ids], edges, **kwargs)
+
+    def _snap(self, coords: List[Coordinates]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the nearest graph node of each coordinate.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The node indices and the distances to them in meters.
+        """
+        nearest = np.empty(len(coords), dtype=np.int64)
+        distance = np.empty(len(coords), dtype=np.float64)
+        for i, c in enumerate(coords):
+            distances = haversine(c.lat, c.lon, self.node_lat, self.node_lon)
+            nearest[i] = np.argmin(distances)
+            distance[i] = distances[nearest[i]]
+        return nearest, distance
+
+    def _shortest_paths(self, origins: np.ndarray) -> np.ndarray:
+        """
+        Computes the shortest path lengths from some nodes to all nodes.
+
+        Args:
+            origins (np.ndarray): The indices of the origin nodes.
+
+        Returns:
+            np.ndarray: One row of path lengths per origin, unreachable nodes are inf.
+        """
+        sources, targets, weights = self.edges
+        # scipy is optional and slow to import, so it is only imported for graph providers
+        try:
+            from scipy.sparse import csr_matrix
+            from scipy.sparse.csgraph import dijkstra
+        except ImportError:  # pragma: no cover - scipy is optional
+            dijkstra = None
+        if dijkstra is not None:
+            graph = csr_matrix((weights, (sources, targets)), shape=(len(self.nodes), len(self.nodes)))
+            return dijkstra(graph, directed=True, indices=origins)
+        adjacency: List[List[Tuple[int, float]]] = [list() for _ in self.nodes]
+        for u, v, w in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+            adjacency[u].append((v, w))
+        result = np.full((len(origins), len(self.nodes)), np.inf)
+        for row, origin in enumerate(origins.tolist()):
+            lengths = result[row]
+            lengths[origin] = 0
+            queue = [(0.0, origin)]
+            while queue:
+                length, u = heapq.heappop(queue)
+                if length > lengths[u]:
+                    continue
+                for v, w in adjacency[u]:
+                    if length + w < lengths[v]:
+                        lengths[v] = length + w
+                        heapq.heappush(queue, (length + w, v))
+        return result
+
+    def fill(self, matrix: np.ndarray, coords: List[Coordinates]) -> None:
+        rows = np.nonzero(np.isnan(matrix).any(axis=1))[0]
+        if not len(rows):
+            return
+        nearest, access = self._snap(coords)
+        if self.measurement == "duration":
+            access = access / (self.access_speed / 3.6)
+        origin_nodes, inverse = np.unique(nearest[rows], return_inverse=True)
+        lengths = self._shortest_paths(origin_nodes)[inverse][:, nearest]
+        estimate = access[rows, None] + lengths + access[None, :]
+        estimate[rows[:, None] == np.arange(len(coords))[None, :]] = 0
+        estimate[np.isinf(estimate)] = np.nan
+        matrix[rows] = np.where(np.isnan(matrix[rows]), estimate, matrix[rows])
@@ -1,61 +1,359 @@
-import requests
-import json
-from typing import List
+import mmap
+import numpy as np
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from typing_extensions import Self
 from model.Location import Location
-from model.Coordinates import Coordinates
+from model.TravelTimeCache import TravelTimeCache
+from model.TravelTimeProvider import TravelTimeProvider, OrsTravelTimeProvider
+
+
+class _TravelTimesRow(Mapping):
+    """
+    Read-only view of the travel times from one location, indexed by destination.
+    """
+
+    def __init__(self, index: Dict[Location, int], row: np.ndarray) -> None:
+        self._index = index
+        self._row = row
+
+    def __getitem__(self, destination: Location) -> float:
+        return float(self._row[self._index[destination]])
+
+    def __iter__(self) -> Iterator[Location]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class _TravelTimesView(Mapping):
+    """
+    Read-only view of a travel time matrix as nested mapping, indexed by origin and destination.
+    """
+
+    def __init__(self, index: Dict[Location, int], matrix: np.ndarray) -> None:
+        self._index = index
+        self._matrix = matrix
+
+    def __getitem__(self, origin: Location) -> _TravelTimesRow:
+        return _TravelTimesRow(self._index, self._matrix[self._index[origin]])
+
+    def __iter__(self) -> Iterator[Location]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
 
 
 class TravelTimes:
     """
-    Stores travel times between locations, using OpenRouteService data.
+    Stores travel times between locations, by default using OpenRouteService data.
+
+    The travel times are kept in a dense float32 matrix whose rows and columns
+    are indexed by ``index``, i.e. ``matrix[index[origin], index[destination]]``.
+    The nested mapping ``travel_times[origin][destination]`` is a view of it.
+    The travel times themselves come from a TravelTimeProvider, e.g. the
+    OpenRouteService matrix API or an offline estimate.
+
+    ``matrix`` is the default profile, i.e. the transport mode and metric of the
+    provider. The matrices of other transport modes, e.g. for groups that cycle,
+    are kept in ``profiles`` by (transport mode, measurement). They are only
+    fetched when requested and then kept up to date when locations are added.
     """
 
-    def __init__(self, auth_key: str, locations: List[Location]):
+    def __init__(self,
+                 auth_key: str,
+                 locations: List[Location],
+                 cache: Optional[TravelTimeCache] = None,
+                 provider: Optional[TravelTimeProvider] = None,
+                 transport_modes: Iterable[str] = ()):
         """
         Initializes the TravelTimes with travel times between all pairs of locations.
 
         Args:
             auth_key (str): The authentication key for the travel time service.
             locations (List[Location]): The list of locations.
+            cache (Optional[TravelTimeCache]): Optional cache for travel times of the default
+                OpenRouteService provider. Default is None.
+            provider (Optional[TravelTimeProvider]): Optional source of the travel times, e.g. a
+                HaversineTravelTimeProvider to work offline. Defaults to an OrsTravelTimeProvider.
+            transport_modes (Iterable[str]): Further transport modes whose profiles are fetched
+                concurrently with the default profile. Default is none.
         """
-        travel_times = self._get_travel_times(auth_key, [loc.coordinates for loc in locations])
-        self.travel_times = {}
-        self.max_travel_time = travel_times[0][0]
-        self.max_pair = locations[0], locations[0]
-        
-        for i, loc1 in enumerate(locations):
-            self.travel_times[loc1] = {}
-            for j, loc2 in enumerate(locations):
-                self.travel_times[loc1][loc2] = travel_times[i][j]
-                if travel_times[i][j] > self.max_travel_time:
-                    self.max_travel_time = travel_times[i][j]
-                    self.max_pair = loc1, loc2
+        self.provider = provider if provider is not None else OrsTravelTimeProvider(auth_key, cache=cache)
+        self._init_profiles(self.provider.transport_mode, self.provider.measurement)
+        for transport_mode in transport_modes:
+            self.profiles.setdefault((transport_mode, self.measurement), np.zeros((0, 0), dtype=np.float32))
+        self.add_locations(locations)
 
-    def _get_travel_times(self, auth_key: str, coords: List[Coordinates]) -> List[List[float]]:
+    @classmethod
+    def from_matrix(cls,
+                    locations: List[Location],
+                    matrix: Iterable[Iterable[float]],
+                    transport_mode: str = TravelTimeProvider.transport_mode,
+                    measurement: str = TravelTimeProvider.measurement) -> Self:
         """
-        Gets travel times between locations using the OpenRouteService API.
+        Creates a TravelTimes instance from a known matrix without any requests,
+        e.g. for tests, benchmarks or travel times from other sources. A float32
+        matrix, e.g. memory-mapped from a snapshot, is used without copying it.
 
         Args:
-            auth_key (str): The authentication key for the travel time service.
-            coords (List[Coordinates]): The list of coordinates.
-
-        Returns:
-            List[List[float]]: A matrix of travel times between the locations.
-        """
-        measurement = ["distance", "duration"][1]
-        transport_mode = ["foot-walking", "cycling-regular", "driving-car"][0]
-        body = {
-            "locations": [(c.lon, c.lat) for c in coords],
-            "destinations": list(range(len(coords))),
-            "metrics": [measurement]
-        }
-        headers = {
-            'Accept': 'application/json, application/geo+json, application/gpx+xml, img/png; charset=utf-8',
-            'Authorization': auth_key
-        }
-        call = requests.post(
-            f"https://api.openrouteservice.org/v2/matrix/{transport_mode}",
-            json=body,
-            headers=headers
-        )
-        return call.json()[measurement + 's']
\ No newline at end of file
+            locations (List[Location]): The list of distinct locations.
+            matrix (Iterable[Iterable[float]]): The travel times between the locations.
+            transport_mode (str): The transport mode of the matrix. Default is "foot-walking".
+            measurement (str): The metric of the matrix. Default is "duration".
+
+        Returns:
+            TravelTimes: The created TravelTimes instance.
+
+        Raises:
+            ValueError: If the matrix does not match the locations.
+        """
+        travel_times = cls.__new__(cls)
+        travel_times.provider = None
+        travel_times._init_profiles(transport_mode, measurement)
+        travel_times.locations = list(locations)
+        travel_times.set_profile(transport_mode, matrix)
+        return travel_times
+
+    def _init_profiles(self, transport_mode: str, measurement: str) -> None:
+        self.transport_mode = transport_mode
+        self.measurement = measurement
+        self.profiles: Dict[Tuple[str, str], np.ndarray] = dict()
+        self._providers: Dict[Tuple[str, str], TravelTimeProvider] = dict()
+        self._lock = Lock()
+        self._set_matrix(list(), np.zeros((0, 0), dtype=np.float32))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Pickles memory-mapped matrices by reference to their file, so that worker
+        processes map the same file instead of receiving a copy of the matrices.
+        """
+        profiles = dict()
+        for key, matrix in self.profiles.items():
+            if isinstance(matrix, np.memmap) and isinstance(matrix.base, mmap.mmap) and matrix.filename is not None:
+                profiles[key] = (matrix.filename, matrix.offset, matrix.shape)
+            else:
+                profiles[key] = matrix
+        return {"provider": self.provider, "transport_mode": self.transport_mode, "measurement": self.measurement,
+                "locations": self.locations, "max_travel_time": self.max_travel_time, "max_pair": self.max_pair,
+                "profiles": profiles}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.provider = state["provider"]
+        self.transport_mode = state["transport_mode"]
+        self.measurement = state["measurement"]
+        self._providers = dict()
+        self._lock = Lock()
+        self.profiles = dict()
+        for key, matrix in state["profiles"].items():
+            if isinstance(matrix, tuple):
+                filename, offset, shape = matrix
+                matrix = np.memmap(filename, dtype=np.float32, mode="r", offset=offset, shape=shape)
+            self.profiles[key] = matrix
+        self.locations = state["locations"]
+        self.index = {location: i for i, location in enumerate(self.locations)}
+        self.matrix = self.profiles[self.transport_mode, self.measurement]
+        self.travel_times = _TravelTimesView(self.index, self.matrix)
+        self.max_travel_time = state["max_travel_time"]
+        self.max_pair = state["max_pair"]
+
+    def _set_matrix(self, locations: List[Location], matrix: np.ndarray) -> None:
+        self.locations = locations
+        self.index = {location: i for i, location in enumerate(locations)}
+        self.matrix = self.profiles[self.transport_mode, self.measurement] = matrix
+        self.travel_times = _TravelTimesView(self.index, self.matrix)
+        if matrix.size and not np.isnan(matrix).all():
+            i, j = np.unravel_index(np.nanargmax(matrix), matrix.shape)
+            self.max_travel_time = float(matrix[i, j])
+            self.max_pair = locations[i], locations[j]
+        else:
+            self.max_travel_time = 0.0
+            self.max_pair = (locations[0], locations[0]) if locations else None
+
+    def _profile_key(self, transport_mode: Optional[str], measurement: Optional[str]) -> Tuple[str, str]:
+        return (transport_mode if transport_mode is not None else self.transport_mode,
+                measurement if measurement is not None else self.measurement)
+
+    def _fill(self, matrices: Dict[Tuple[str, str], np.ndarray], locations: List[Location]) -> None:
+        """
+        Fills the missing cells of the matrices of several profiles, one profile per thread.
+        """
+        if self.provider is None:
+            raise ValueError(f"Travel times without a provider cannot fetch the profiles {', '.join(map(str, matrices))}.")
+        for key in matrices:
+            if key not in self._providers:
+                self._providers[key] = self.provider.for_profile(*key)
+        coords = [location.coordinates for location in locations]
+        with ThreadPoolExecutor(max_workers=len(matrices)) as executor:
+            list(executor.map(lambda key: self._providers[key].fill(matrices[key], coords), matrices))
+
+    def load_profiles(self,
+                      transport_modes: Iterable[Optional[str]],
+                      measurement: Optional[str] = None) -> List[np.ndarray]:
+        """
+        Returns the matrices of several transport modes and fetches the missing
+        ones concurrently, e.g. the modes of all groups of an instance.
+
+        Args:
+            transport_modes (Iterable[Optional[str]]): The transport modes, None for the default one.
+            measurement (Optional[str]): The metric. Defaults to the metric of the default profile.
+
+        Returns:
+            List[np.ndarray]: The travel time matrices in the order of the transport modes.
+
+        Raises:
+            ValueError: If a profile is missing but there is no provider or the provider cannot
+                provide it.
+        """
+        keys = [self._profile_key(transport_mode, measurement) for transport_mode in transport_modes]
+        with self._lock:
+            size = len(self.locations)
+            missing = {key: np.full((size, size), np.nan, dtype=np.float32)
+                       for key in dict.fromkeys(keys) if key not in self.profiles}
+            if missing:
+                self._fill(missing, self.locations)
+                self.profiles.update(missing)
+        return [self.profiles[key] for key in keys]
+
+    def profile(self, transport_mode: Optional[str] = None, measurement: Optional[str] = None) -> np.ndarray:
+        """
+        Returns the matrix of a transport mode and fetches it if it is missing.
+
+        Args:
+            transport_mode (Optional[str]): The transport mode. Defaults to the default profile.
+            measurement (Optional[str]): The metric. Defaults to the metric of the default profile.
+
+        Returns:
+            np.ndarray: The travel time matrix, indexed like ``matrix``.
+        """
+        return self.load_profiles([transport_mode], measurement)[0]
+
+    def set_profile(self,
+                    transport_mode: str,
+                    matrix: Iterable[Iterable[float]],
+                    measurement: Optional[str] = None) -> None:
+        """
+        Sets the matrix of a profile from another source, e.g. a snapshot. A float32
+        matrix is used without copying it.
+
+        Args:
+            transport_mode (str): The transport mode.
+            matrix (Iterable[Iterable[float]]): The travel times between the locations.
+            measurement (Optional[str]): The metric. Defaults to the metric of the default profile.
+
+        Raises:
+            ValueError: If the matrix does not match the locations.
+        """
+        matrix = np.asanyarray(matrix, dtype=np.float32)
+        if matrix.shape != (len(self.locations), len(self.locations)):
+            raise ValueError(f"Expected a {len(self.locations)}x{len(self.locations)} matrix, got shape {matrix.shape}.")
+        key = self._profile_key(transport_mode, measurement)
+        with self._lock:
+            if key == (self.transport_mode, self.measurement):
+                self._set_matrix(self.locations, matrix)
+            else:
+                self.profiles[key] = matrix
+
+    def time(self, origin: Location, destination: Location, transport_mode: Optional[str] = None) -> float:
+        """
+        Returns the travel time between two locations.
+
+        Args:
+            origin (Location): The origin.
+            destination (Location): The destination.
+            transport_mode (Optional[str]): The transport mode. Defaults to the default profile.
+
+        Returns:
+            float: The travel time.
+        """
+        return float(self.profile(transport_mode)[self.index[origin], self.index[destination]])
+
+    def indices(self, locations: Iterable[Location]) -> np.ndarray:
+        """
+        Returns the matrix indices of locations.
+
+        Args:
+            locations (Iterable[Location]): The locations.
+
+        Returns:
+            np.ndarray: The indices in the order of the locations.
+        """
+        return np.fromiter((self.index[location] for location in locations), dtype=np.intp)
+
+    def submatrix(self,
+                  origins: Iterable[Location],
+                  destinations: Iterable[Location],
+                  transport_mode: Optional[str] = None) -> np.ndarray:
+        """
+        Returns the travel times from some origins to some destinations, e.g.
+        from the hosts of one event to the hosts of the next event.
+
+        Args:
+            origins (Iterable[Location]): The origins, one row each.
+            destinations (Iterable[Location]): The destinations, one column each.
+            transport_mode (Optional[str]): The transport mode. Defaults to the default profile.
+
+        Returns:
+            np.ndarray: The travel times as matrix.
+        """
+        return self.profile(transport_mode)[np.ix_(self.indices(origins), self.indices(destinations))]
+
+    def row(self, origin: Location) -> np.ndarray:
+        """
+        Returns the travel times from one location to all locations, ordered like ``locations``.
+
+        Args:
+            origin (Location): The origin.
+
+        Returns:
+            np.ndarray: The travel times.
+        """
+        return self.matrix[self.index[origin]]
+
+    def column(self, destination: Location) -> np.ndarray:
+        """
+        Returns the travel times from all locations to one location, ordered like ``locations``.
+
+        Args:
+            destination (Location): The destination.
+
+        Returns:
+            np.ndarray: The travel times.
+        """
+        return self.matrix[:, self.index[destination]]
+
+    def add_locations(self, locations: List[Location]) -> None:
+        """
+        Adds locations and fetches only the travel times from and to the new locations,
+        in every profile that has been fetched so far.
+
+        Args:
+            locations (List[Location]): The locations to add. Known locations are ignored.
+
+        Raises:
+            ValueError: If there are new locations but no provider, e.g. for travel times
+                created by ``from_matrix``.
+        """
+        new_locations = list()
+        for location in locations:
+            if location not in self.index and location not in new_locations:
+                new_locations.append(location)
+        if not new_locations:
+            return
+        if self.provider is None:
+            raise ValueError("Travel times without a provider cannot fetch travel times of new locations.")
+        with self._lock:
+            known = len(self.locations)
+            size = known + len(new_locations)
+            matrices = dict()
+            for key, profile in self.profiles.items():
+                matrix = matrices[key] = np.full((size, size), np.nan, dtype=np.float32)
+                matrix[:known, :known] = profile
+            all_locations = self.locations + new_locations
+            self._fill(matrices, all_locations)
+            self.profiles.update(matrices)
+            self._set_matrix(all_locations, matrices[self.transport_mode, self.measurement])
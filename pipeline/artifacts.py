@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+from typing import Any, Callable, Tuple
+
+
+class ArtifactStore:
+    """
+    Directory of intermediate artifacts named by the hash of their inputs.
+
+    An artifact is only produced if no artifact with the same inputs exists,
+    so that stages whose inputs did not change are skipped. Artifacts that a
+    stage is built from are part of its inputs by the hash of their content,
+    see ``digest``, so that a changed artifact invalidates all later stages. Artifacts are
+    written to a temporary file first and then renamed, so that an interrupted
+    stage never leaves a partial artifact behind.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Initializes the ArtifactStore and creates its directory if necessary.
+
+        Args:
+            directory (str): The directory of the artifacts.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(*inputs: Any) -> str:
+        """
+        Returns the hash of JSON serializable inputs, e.g. the key of the previous
+        stage and the options of a stage.
+
+        Args:
+            *inputs (Any): The inputs, with artifacts given by their ``digest``.
+
+        Returns:
+            str: The first 16 hex digits of the SHA-256 hash of the inputs.
+        """
+        encoded = json.dumps(inputs, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+    @staticmethod
+    def digest(path: str) -> str:
+        """
+        Returns the hash of the content of an artifact, e.g. as input of a later stage.
+
+        Args:
+            path (str): The path of the artifact.
+
+        Returns:
+            str: The first 16 hex digits of the SHA-256 hash of the content.
+        """
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(2**20), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()[:16]
+
+    def path(self, stage: str, key: str, extension: str) -> str:
+        """
+        Returns the path of an artifact.
+
+        Args:
+            stage (str): The stage that produces the artifact.
+            key (str): The hash of the inputs of the stage.
+            extension (str): The file extension, e.g. "json".
+
+        Returns:
+            str: The path of the artifact.
+        """
+        return os.path.join(self.directory, f"{stage}-{key}.{extension}")
+
+    def produce(self, path: str, write: Callable[[str], Any], force: bool = False) -> Tuple[str, bool]:
+        """
+        Produces an artifact unless it exists already.
+
+        Args:
+            path (str): The path of the artifact, see ``path``.
+            write (Callable[[str], Any]): Writes the artifact to the given file name, which has
+                the extension of the artifact.
+            force (bool): Whether to produce the artifact even if it exists. Default is False.
+
+        Returns:
+            Tuple[str, bool]: The path and whether the existing artifact was reused.
+        """
+        if os.path.exists(path) and not force:
+            return path, True
+        directory, name = os.path.split(path)
+        temporary = os.path.join(directory, f".tmp-{os.getpid()}-{name}")
+        try:
+            write(temporary)
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        return path, False
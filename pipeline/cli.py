@@ -0,0 +1,248 @@
+"""
+Plans a running dinner in separate stages with cached artifacts.
+
+The instance is defined in a JSON file with the keys of the job service, i.e.
+"country_code", "city_address", "events", "addresses", optionally
+"party_address" and the options of ``DinnerInstance.solve`` under "solve".
+Every subcommand runs the stages it depends on:
+
+    geocode  addresses to coordinates                -> geocode-<hash>.json
+    matrix   travel times between the coordinates    -> matrix-<hash>.snapshot
+    solve    assignment of the groups to hosts       -> solve-<hash>.csv
+    export   itineraries as CSV, JSON Lines, Parquet -> export-<hash>.<format>
+    render   map of the solution                     -> render-<hash>.html
+
+The artifacts are named by the hash of their inputs, i.e. the options of the
+stage and the content of the artifacts it is built from, so a stage is skipped
+if its artifact exists, e.g. re-rendering a map neither geocodes nor solves
+again, while a changed artifact, e.g. after ``--force matrix``, is followed by
+all later stages.
+Libraries are imported by the stages that need them, e.g. folium only for
+``render`` and PuLP only for ``solve``::
+
+    python -m pipeline.cli solve dinner.json --time-limit 60
+    python -m pipeline.cli render dinner.json --compact --output map.html
+"""
+import argparse
+import json
+import os
+import shutil
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pipeline.artifacts import ArtifactStore
+
+PUBLIC_API = "https://api.openrouteservice.org"
+DEFINITION_KEYS = ("country_code", "city_address", "events", "addresses", "party_address")
+
+
+def _run(args: argparse.Namespace,
+         store: ArtifactStore,
+         stage: str,
+         key: str,
+         extension: str,
+         write: Callable[[str], Any]) -> Tuple[str, str]:
+    """
+    Produces the artifact of a stage unless it exists and reports it. A stage that
+    several later stages depend on is only run once per command.
+
+    Returns:
+        Tuple[str, str]: The hash of the content and the path of the artifact.
+    """
+    if stage in args.produced:
+        return args.produced[stage]
+    start = perf_counter()
+    path, cached = store.produce(store.path(stage, key, extension), write, force=args.force == stage)
+    print(f"{stage:<8} {'cached' if cached else 'done  '} {path} ({perf_counter() - start:.2f}s)", flush=True)
+    args.produced[stage] = store.digest(path), path
+    return args.produced[stage]
+
+
+def _session(args: argparse.Namespace) -> Optional[Any]:
+    """
+    Returns a session for another base URL or rate limit, None for the default sessions
+    limited to the free plan of the public API.
+    """
+    if args.base_url == PUBLIC_API and args.requests_per_minute is None:
+        return None
+    from model.OrsSession import OrsSession
+
+    return OrsSession(args.auth_key, base_url=args.base_url, requests_per_minute=args.requests_per_minute)
+
+
+def geocode(args: argparse.Namespace, store: ArtifactStore) -> Tuple[str, str]:
+    definition = args.definition
+    key = store.key("geocode", {name: definition.get(name) for name in DEFINITION_KEYS}, args.base_url)
+
+    def write(filename: str) -> None:
+        from model.DinnerInstance import DinnerInstance
+        from model.Geocoder import OrsGeocoder
+        from model.GeocodingCache import SQLiteGeocodingCache
+
+        cache = SQLiteGeocodingCache(args.geocoding_cache) if args.geocoding_cache else None
+        geocoder = OrsGeocoder(args.auth_key, cache=cache, session=_session(args))
+        instance = DinnerInstance(args.auth_key, definition["country_code"], definition["city_address"],
+                                  list(definition["events"]), [tuple(address) for address in definition["addresses"]],
+                                  definition.get("party_address"), geocoder=geocoder, defer_travel_times=True)
+        geocoded = {
+            "events": instance.events,
+            "country_code": instance.country_code,
+            "city_address": instance.city_address,
+            "city_location": list(instance.city_location.coordinates),
+            "after_party": list(instance.after_party.coordinates) if instance.after_party is not None else None,
+            "groups": [[group.name, *group.location.coordinates, group.host_event_id, group.transport_mode]
+                       for group in instance.groups],
+        }
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(geocoded, file, ensure_ascii=False, indent=1)
+
+    return _run(args, store, "geocode", key, "json", write)
+
+
+def matrix(args: argparse.Namespace, store: ArtifactStore) -> Tuple[str, str]:
+    geocoded_digest, geocode_path = geocode(args, store)
+    key = store.key("matrix", geocoded_digest, "haversine" if args.offline else args.base_url)
+
+    def write(filename: str) -> None:
+        from model.Coordinates import Coordinates
+        from model.DinnerInstance import DinnerInstance
+        from model.Group import Group
+        from model.Location import Location
+        from model.TravelTimeCache import SQLiteTravelTimeCache
+        from model.TravelTimeProvider import HaversineTravelTimeProvider, OrsTravelTimeProvider
+        from model.TravelTimes import TravelTimes
+
+        with open(geocode_path, encoding="utf-8") as file:
+            geocoded = json.load(file)
+        locations: Dict[Coordinates, Location] = dict()
+
+        def location(lat: float, lon: float) -> Location:
+            coordinates = Coordinates(lat, lon)
+            return locations.setdefault(coordinates, Location(coordinates))
+
+        groups = [Group(name, location(lat, lon), host_event_id, transport_mode)
+                  for name, lat, lon, host_event_id, transport_mode in geocoded["groups"]]
+        after_party = location(*geocoded["after_party"]) if geocoded["after_party"] is not None else None
+        if args.offline:
+            provider = HaversineTravelTimeProvider()
+        else:
+            cache = SQLiteTravelTimeCache(args.travel_time_cache) if args.travel_time_cache else None
+            provider = OrsTravelTimeProvider(args.auth_key, session=_session(args), cache=cache)
+        travel_times = TravelTimes(args.auth_key, list(locations.values()), provider=provider,
+                                   transport_modes=Group.get_transport_modes(groups))
+        instance = DinnerInstance.from_data(geocoded["events"], groups, travel_times, after_party)
+        instance.country_code = geocoded["country_code"]
+        instance.city_address = geocoded["city_address"]
+        instance.city_location = Location(Coordinates(*geocoded["city_location"]))
+        instance.save_snapshot(filename)
+
+    return _run(args, store, "matrix", key, "snapshot", write)
+
+
+def _solve_options(args: argparse.Namespace) -> Dict[str, Any]:
+    options = dict(args.definition.get("solve", dict()))
+    for option in ("method", "formulation", "backend", "time_limit", "gap_rel"):
+        if getattr(args, option, None) is not None:
+            options[option] = getattr(args, option)
+    return options
+
+
+def solve(args: argparse.Namespace, store: ArtifactStore) -> Tuple[str, str]:
+    matrix_digest, matrix_path = matrix(args, store)
+    options = _solve_options(args)
+    key = store.key("solve", matrix_digest, options)
+
+    def write(filename: str) -> None:
+        from model.DinnerInstance import DinnerInstance
+
+        instance = DinnerInstance.load_snapshot(matrix_path)
+        instance.save_csv(filename, instance.solve(**options))
+
+    return _run(args, store, "solve", key, "csv", write)
+
+
+def _load(args: argparse.Namespace, store: ArtifactStore) -> Tuple[str, Callable[[], Tuple[Any, Any]]]:
+    """
+    Runs the stages up to the solution and returns the hash of the content of the instance
+    and the solution and a function that loads them.
+    """
+    matrix_digest, matrix_path = matrix(args, store)
+    solution_digest, solution_path = solve(args, store)
+
+    def load() -> Tuple[Any, Any]:
+        from model.DinnerInstance import DinnerInstance
+
+        instance = DinnerInstance.load_snapshot(matrix_path)
+        return instance, instance.load_csv(solution_path)
+
+    return store.key(matrix_digest, solution_digest), load
+
+
+def export(args: argparse.Namespace, store: ArtifactStore) -> Tuple[str, str]:
+    solved_digest, load = _load(args, store)
+    key = store.key("export", solved_digest, args.format)
+
+    def write(filename: str) -> None:
+        instance, solution = load()
+        instance.export(filename, solution, args.format)
+
+    return _run(args, store, "export", key, args.format, write)
+
+
+def render(args: argparse.Namespace, store: ArtifactStore) -> Tuple[str, str]:
+    solved_digest, load = _load(args, store)
+    key = store.key("render", solved_digest, args.compact)
+
+    def write(filename: str) -> None:
+        instance, solution = load()
+        instance.save_map(filename, solution, compact=args.compact)
+
+    return _run(args, store, "render", key, "html", write)
+
+
+STAGES = {"geocode": geocode, "matrix": matrix, "solve": solve, "export": export, "render": render}
+
+
+def main(arguments: Optional[List[str]] = None) -> str:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("definition", help="JSON file with the instance definition")
+    common.add_argument("--artifacts", default=".artifacts", help="directory of the cached artifacts")
+    common.add_argument("--force", choices=tuple(STAGES), default=None,
+                        help="produce the artifact of this stage again even if it is cached")
+    common.add_argument("--output", default=None, help="copy the artifact of the subcommand to this file")
+    common.add_argument("--auth-key", default=os.environ.get("ORS_API_KEY", ""),
+                        help="OpenRouteService key, defaults to the ORS_API_KEY environment variable")
+    common.add_argument("--base-url", default=PUBLIC_API, help="OpenRouteService base URL, e.g. of a local stub")
+    common.add_argument("--requests-per-minute", type=float, default=None, help="rate limit of the API")
+    common.add_argument("--geocoding-cache", default=None, help="SQLite file of the geocoding cache")
+    common.add_argument("--travel-time-cache", default=None, help="SQLite file of the travel time cache")
+    common.add_argument("--offline", action="store_true", help="estimate the travel times instead of requesting them")
+
+    solving = argparse.ArgumentParser(add_help=False)
+    solving.add_argument("--method", choices=("mip", "heuristic"), default=None, help="solution method")
+    solving.add_argument("--formulation", choices=("full", "compact"), default=None, help="MIP formulation")
+    solving.add_argument("--backend", choices=("highs", "pulp"), default=None, help="MIP backend")
+    solving.add_argument("--time-limit", type=float, default=None, help="time limit of the solver in seconds")
+    solving.add_argument("--gap", dest="gap_rel", type=float, default=None, help="relative MIP gap to stop at")
+
+    parser = argparse.ArgumentParser(description="Plan a running dinner in stages with cached artifacts.")
+    subparsers = parser.add_subparsers(dest="stage", required=True)
+    subparsers.add_parser("geocode", parents=[common], help="geocode the addresses")
+    subparsers.add_parser("matrix", parents=[common], help="fetch the travel times")
+    subparsers.add_parser("solve", parents=[common, solving], help="assign the groups to hosts")
+    export_parser = subparsers.add_parser("export", parents=[common, solving], help="export the itineraries")
+    export_parser.add_argument("--format", choices=("csv", "jsonl", "parquet"), default="csv", help="file format")
+    render_parser = subparsers.add_parser("render", parents=[common, solving], help="render the map")
+    render_parser.add_argument("--compact", action="store_true", help="render the compact map for large instances")
+    args = parser.parse_args(arguments)
+
+    with open(args.definition, encoding="utf-8") as file:
+        args.definition = json.load(file)
+    args.produced = dict()
+    _, path = STAGES[args.stage](args, ArtifactStore(args.artifacts))
+    if args.output is not None:
+        shutil.copyfile(path, args.output)
+    return path
+
+
+if __name__ == "__main__":
+    main()
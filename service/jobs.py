@@ -0,0 +1,311 @@
+"""
+Plans many running dinners concurrently.
+
+A job takes an instance definition through the stages geocode, matrix,
+solve and output. The I/O-bound stages run on a thread pool that shares one
+rate limited OpenRouteService session, while the CPU-bound solves run on a
+bounded pool of worker processes. An instance is handed to its solver process
+as snapshot file, which the worker memory-maps instead of receiving a copy.
+"""
+import os
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from threading import Event, Lock
+from time import perf_counter, time
+from typing import Any, Callable, Dict, List, Optional
+from model.DinnerInstance import DinnerInstance
+from model.GeocodingCache import GeocodingCache
+from model.Geocoder import OrsGeocoder
+from model.OrsSession import OrsSession
+from model.TravelTimeCache import TravelTimeCache
+from model.TravelTimeProvider import OrsTravelTimeProvider, TravelTimeProvider
+
+SOLVE_OPTIONS = ("penalty_too_few_guests", "penalty_too_many_guests", "penalty_multiple_encounters",
+                 "prioritized_solver_str", "formulation", "method", "time_limit", "backend", "gap_rel", "threads")
+OUTPUTS = ("csv", "jsonl", "parquet", "map")
+
+
+def _solve(snapshot: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Solves an instance saved as snapshot in a worker process.
+
+    Returns:
+        Dict[str, Any]: The hosts of each group by name, the solve statistics and the
+        start and duration of the solve.
+    """
+    started = time()
+    start = perf_counter()
+    instance = DinnerInstance.load_snapshot(snapshot)
+    solution, stats = instance.solve(**options, return_stats=True)
+    return {"solution": {group.name: [host.name for host in hosts] for group, hosts in solution.items()},
+            "stats": stats.as_dict(), "started": started, "time": perf_counter() - start}
+
+
+class Job:
+    """
+    State of one planned running dinner.
+
+    The status is "queued", "running", "done" or "failed", and ``stage`` is the
+    current or last stage. ``timings`` holds the seconds spent in each stage,
+    "queue" being the wait for a free solver process.
+    """
+
+    STAGES = ("geocode", "matrix", "queue", "solve", "output")
+
+    def __init__(self, job_id: str, definition: Dict[str, Any]) -> None:
+        """
+        Initializes the Job.
+
+        Args:
+            job_id (str): The ID of the job.
+            definition (Dict[str, Any]): The instance definition, see ``JobService.submit``.
+        """
+        self.id = job_id
+        self.name = definition.get("name", job_id)
+        self.definition = definition
+        self.status = "queued"
+        self.stage: Optional[str] = None
+        self.timings: Dict[str, float] = dict()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created = time()
+        self.finished: Optional[float] = None
+        self.instance: Optional[DinnerInstance] = None
+        self._done = Event()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns the JSON serializable state of the job.
+
+        Returns:
+            Dict[str, Any]: The ID, name, status, stage, timings, result and error.
+        """
+        return {"id": self.id, "name": self.name, "status": self.status, "stage": self.stage,
+                "timings": dict(self.timings), "result": self.result, "error": self.error,
+                "created": self.created, "finished": self.finished}
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until the job is done or failed.
+
+        Args:
+            timeout (Optional[float]): The maximum time to wait in seconds. Default is None (no limit).
+
+        Returns:
+            bool: Whether the job is finished.
+        """
+        return self._done.wait(timeout)
+
+
+class JobService:
+    """
+    Runs jobs through the stages geocode, matrix, solve and output.
+
+    A job is submitted as instance definition, i.e. a JSON serializable dict
+    with the arguments of a DinnerInstance, the options of its ``solve`` and the
+    requested output files, which are written to a directory per job.
+    """
+
+    def __init__(self,
+                 ors_auth_key: str,
+                 base_url: str = "https://api.openrouteservice.org",
+                 work_dir: str = "jobs",
+                 io_workers: int = 4,
+                 solve_workers: Optional[int] = None,
+                 requests_per_minute: Optional[float] = None,
+                 geocoding_cache: Optional[GeocodingCache] = None,
+                 travel_time_cache: Optional[TravelTimeCache] = None,
+                 travel_time_provider: Optional[TravelTimeProvider] = None) -> None:
+        """
+        Initializes the JobService and starts its pools.
+
+        Args:
+            ors_auth_key (str): The authentication key for the OpenRouteService API.
+            base_url (str): The base URL of the API, e.g. of a local stub server. Default is
+                the public OpenRouteService API.
+            work_dir (str): The directory of the snapshots and outputs, one subdirectory per job.
+                Default is "jobs".
+            io_workers (int): The number of threads of the geocoding, matrix and output stages. Default is 4.
+            solve_workers (Optional[int]): The number of solver processes. Default is None (number of CPUs).
+            requests_per_minute (Optional[float]): The rate limit of the session shared by all jobs.
+                Default is None (unlimited).
+            geocoding_cache (Optional[GeocodingCache]): Optional cache for geocoding results. Default is None.
+            travel_time_cache (Optional[TravelTimeCache]): Optional cache for travel times. Default is None.
+            travel_time_provider (Optional[TravelTimeProvider]): Optional source of travel times. Defaults to
+                the OpenRouteService matrix API over the shared session.
+        """
+        self.ors_auth_key = ors_auth_key
+        self.work_dir = work_dir
+        self.session = OrsSession(ors_auth_key, base_url=base_url, requests_per_minute=requests_per_minute)
+        self.geocoder = OrsGeocoder(ors_auth_key, cache=geocoding_cache, session=self.session)
+        self.travel_time_provider = travel_time_provider if travel_time_provider is not None \
+            else OrsTravelTimeProvider(ors_auth_key, session=self.session, cache=travel_time_cache)
+        self.jobs: Dict[str, Job] = dict()
+        self._lock = Lock()
+        self._io = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="dinner-io")
+        # spawned workers do not inherit the threads and sockets of the service
+        self._solvers = ProcessPoolExecutor(max_workers=solve_workers, mp_context=get_context("spawn"))
+
+    def __enter__(self) -> "JobService":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops the pools after the running jobs.
+
+        Args:
+            wait (bool): Whether to wait for the running jobs. Default is True.
+        """
+        self._io.shutdown(wait=wait)
+        self._solvers.shutdown(wait=wait)
+
+    def submit(self, definition: Dict[str, Any]) -> Job:
+        """
+        Submits a job. The definition has the keys
+
+        - "country_code", "city_address", "events" and "addresses" as for a DinnerInstance,
+          the addresses as lists of name, address, event ID and optionally the transport mode,
+        - optionally "name", "party_address",
+        - optionally "solve" with options of ``DinnerInstance.solve``, e.g. "time_limit",
+        - optionally "outputs", a list of "csv", "jsonl", "parquet" and "map". Default is ["csv"].
+
+        Args:
+            definition (Dict[str, Any]): The instance definition.
+
+        Returns:
+            Job: The queued job.
+
+        Raises:
+            ValueError: If the definition lacks a key or has unknown solve options or outputs.
+        """
+        missing = [key for key in ("country_code", "city_address", "events", "addresses") if key not in definition]
+        if missing:
+            raise ValueError(f"The definition lacks {', '.join(missing)}.")
+        unknown = set(definition.get("solve", dict())) - set(SOLVE_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown solve options {', '.join(sorted(unknown))}.")
+        unknown = set(definition.get("outputs", ["csv"])) - set(OUTPUTS)
+        if unknown:
+            raise ValueError(f"Unknown outputs {', '.join(sorted(unknown))}.")
+        job = Job(uuid.uuid4().hex[:12], definition)
+        with self._lock:
+            self.jobs[job.id] = job
+        self._io.submit(self._run_stage, job, self._prepare)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """
+        Returns a job.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            Job: The job.
+
+        Raises:
+            KeyError: If there is no such job.
+        """
+        with self._lock:
+            return self.jobs[job_id]
+
+    def list(self) -> List[Job]:
+        """
+        Returns all jobs in the order of submission.
+
+        Returns:
+            List[Job]: The jobs.
+        """
+        with self._lock:
+            return list(self.jobs.values())
+
+    def _run_stage(self, job: Job, stage: Callable[..., None], *args: Any) -> None:
+        """
+        Runs a stage of a job and marks the job as failed if it raises.
+        """
+        try:
+            stage(job, *args)
+        except Exception as error:
+            self._fail(job, error)
+
+    def _fail(self, job: Job, error: BaseException) -> None:
+        job.status = "failed"
+        job.error = f"{type(error).__name__}: {error}"
+        job.finished = time()
+        job._done.set()
+
+    def _timed(self, job: Job, stage: str, function: Callable[[], Any]) -> Any:
+        job.stage = stage
+        start = perf_counter()
+        result = function()
+        job.timings[stage] = perf_counter() - start
+        return result
+
+    def _prepare(self, job: Job) -> None:
+        """
+        Geocodes the addresses, fetches the travel times and hands the snapshot to a solver process.
+        """
+        definition = job.definition
+        job.status = "running"
+        instance = job.instance = self._timed(job, "geocode", lambda: DinnerInstance(
+            self.ors_auth_key, definition["country_code"], definition["city_address"], list(definition["events"]),
+            [tuple(address) for address in definition["addresses"]], definition.get("party_address"),
+            geocoder=self.geocoder, defer_travel_times=True))
+        self._timed(job, "matrix", lambda: instance.fetch_travel_times(
+            self.ors_auth_key, travel_time_provider=self.travel_time_provider))
+
+        directory = os.path.join(self.work_dir, job.id)
+        os.makedirs(directory, exist_ok=True)
+        snapshot = os.path.join(directory, "instance.snapshot")
+        instance.save_snapshot(snapshot)
+        job.stage = "solve"
+        submitted = time()
+        future = self._solvers.submit(_solve, snapshot, definition.get("solve", dict()))
+        future.add_done_callback(lambda future: self._solved(job, future, submitted))
+
+    def _solved(self, job: Job, future: Future, submitted: float) -> None:
+        error = future.exception()
+        if error is not None:
+            job.stage = "solve"
+            self._fail(job, error)
+            return
+        result = future.result()
+        job.timings["queue"] = max(result["started"] - submitted, 0.0)
+        job.timings["solve"] = result["time"]
+        self._io.submit(self._run_stage, job, self._output, result)
+
+    def _output(self, job: Job, result: Dict[str, Any]) -> None:
+        """
+        Writes the requested files and finishes the job.
+        """
+        instance = job.instance
+        groups = {group.name: group for group in instance.groups}
+        solution = {groups[name]: [groups[host] for host in hosts] for name, hosts in result["solution"].items()}
+        directory = os.path.join(self.work_dir, job.id)
+
+        def write() -> Dict[str, str]:
+            files = dict()
+            for output in job.definition.get("outputs", ["csv"]):
+                if output == "csv":
+                    files[output] = os.path.join(directory, "solution.csv")
+                    instance.save_csv(files[output], solution)
+                elif output == "map":
+                    files[output] = os.path.join(directory, "map.html")
+                    instance.save_map(files[output], solution, compact=True)
+                else:
+                    files[output] = os.path.join(directory, f"itineraries.{output}")
+                    instance.export(files[output], solution, output)
+            return files
+
+        files = self._timed(job, "output", write)
+        stats = result["stats"]
+        job.result = {"status": stats["status"], "objective": stats["objective"], "gap": stats["gap"],
+                      "solution": result["solution"], "files": files, "stats": stats}
+        job.status = "done"
+        job.finished = time()
+        job.instance = None
+        job._done.set()
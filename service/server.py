@@ -0,0 +1,118 @@
+"""
+HTTP front end of the JobService.
+
+    POST /jobs        submits an instance definition and returns the queued job (202)
+    GET  /jobs        lists all jobs
+    GET  /jobs/<id>   returns the status, stage timings and, when done, the result of a job
+
+Run it against the public OpenRouteService API or a local stub server, e.g.::
+
+    python -m service.stub --port 8081 &
+    python -m service.server --port 8080 --base-url http://127.0.0.1:8081 --solve-workers 2
+"""
+import argparse
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List, Optional
+from model.GeocodingCache import SQLiteGeocodingCache
+from model.TravelTimeCache import SQLiteTravelTimeCache
+from service.jobs import JobService
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """
+    Maps the HTTP requests to the JobService of the server.
+    """
+
+    server: "JobServer"
+
+    def _send(self, status: int, body: Any) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        if parts == ["jobs"]:
+            self._send(200, [job.as_dict() for job in self.server.service.list()])
+        elif len(parts) == 2 and parts[0] == "jobs":
+            try:
+                self._send(200, self.server.service.get(parts[1]).as_dict())
+            except KeyError:
+                self._send(404, {"error": f"There is no job {parts[1]}."})
+        else:
+            self._send(404, {"error": f"Unknown path {self.path}."})
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/jobs":
+            self._send(404, {"error": f"Unknown path {self.path}."})
+            return
+        try:
+            definition = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            job = self.server.service.submit(definition)
+        except (ValueError, TypeError, AttributeError) as error:
+            self._send(400, {"error": str(error)})
+            return
+        self._send(202, job.as_dict())
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class JobServer(ThreadingHTTPServer):
+    """
+    Threading HTTP server that holds the JobService.
+    """
+
+    request_queue_size = 128
+
+    def __init__(self, address: Any, service: JobService, quiet: bool = False) -> None:
+        """
+        Initializes the JobServer.
+
+        Args:
+            address (Any): The host and port to listen on.
+            service (JobService): The service that runs the jobs.
+            quiet (bool): Whether to suppress the request log. Default is False.
+        """
+        super().__init__(address, JobRequestHandler)
+        self.service = service
+        self.quiet = quiet
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a local job service for planning running dinners.")
+    parser.add_argument("--host", default="127.0.0.1", help="host to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--auth-key", default=os.environ.get("ORS_API_KEY", ""),
+                        help="OpenRouteService key, defaults to the ORS_API_KEY environment variable")
+    parser.add_argument("--base-url", default="https://api.openrouteservice.org", help="OpenRouteService base URL")
+    parser.add_argument("--work-dir", default="jobs", help="directory of the snapshots and outputs")
+    parser.add_argument("--io-workers", type=int, default=4, help="threads of the geocoding, matrix and output stages")
+    parser.add_argument("--solve-workers", type=int, default=None, help="solver processes")
+    parser.add_argument("--requests-per-minute", type=float, default=None, help="rate limit of the API")
+    parser.add_argument("--geocoding-cache", default=None, help="SQLite file of the geocoding cache")
+    parser.add_argument("--travel-time-cache", default=None, help="SQLite file of the travel time cache")
+    parser.add_argument("--quiet", action="store_true", help="do not log requests")
+    args = parser.parse_args(arguments)
+
+    service = JobService(args.auth_key, base_url=args.base_url, work_dir=args.work_dir,
+                         io_workers=args.io_workers, solve_workers=args.solve_workers,
+                         requests_per_minute=args.requests_per_minute,
+                         geocoding_cache=SQLiteGeocodingCache(args.geocoding_cache) if args.geocoding_cache else None,
+                         travel_time_cache=SQLiteTravelTimeCache(args.travel_time_cache) if args.travel_time_cache else None)
+    with service, JobServer((args.host, args.port), service, args.quiet) as server:
+        print(f"Serving jobs on http://{args.host}:{server.server_port}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
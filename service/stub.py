@@ -0,0 +1,116 @@
+"""
+Local stub of the OpenRouteService geocoding and matrix APIs, e.g. to run the
+job service or the examples offline. Addresses are geocoded to deterministic
+coordinates near the focus point, and travel times are estimated from
+great-circle distances like the HaversineTravelTimeProvider::
+
+    python -m service.stub --port 8081
+"""
+import argparse
+import hashlib
+import json
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from model.TravelTimeProvider import HaversineTravelTimeProvider, haversine
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answers /geocode/search and /v2/matrix/<profile> requests.
+    """
+
+    server: "StubServer"
+
+    def _send(self, status: int, body: Any) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path != "/geocode/search":
+            self._send(404, {"error": f"Unknown path {url.path}."})
+            return
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        digest = hashlib.sha256(query.get("text", "").encode("utf-8")).digest()
+        # up to about 2 km around the focus point
+        lat = float(query.get("focus.point.lat", self.server.center[0])) + (digest[0] / 255 - 0.5) * 0.036
+        lon = float(query.get("focus.point.lon", self.server.center[1])) + (digest[1] / 255 - 0.5) * 0.058
+        self._send(200, {"features": [{"geometry": {"type": "Point", "coordinates": [lon, lat]}}]})
+
+    def do_POST(self) -> None:
+        parts = [part for part in self.path.split("/") if part]
+        if parts[:2] != ["v2", "matrix"] or len(parts) != 3:
+            self._send(404, {"error": f"Unknown path {self.path}."})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        profile, metrics = parts[2], body.get("metrics", ["duration"])
+        if profile not in HaversineTravelTimeProvider.SPEEDS:
+            self._send(400, {"error": f"Unknown profile {profile}."})
+            return
+        locations = np.array(body["locations"], dtype=np.float64)
+        sources = locations[body.get("sources", list(range(len(locations))))]
+        destinations = locations[body.get("destinations", list(range(len(locations))))]
+        distances = haversine(sources[:, None, 1], sources[:, None, 0], destinations[None, :, 1], destinations[None, :, 0]) * 1.3
+        result = dict()
+        if "distance" in metrics:
+            result["distances"] = distances.round(1).tolist()
+        if "duration" in metrics:
+            result["durations"] = (distances / (HaversineTravelTimeProvider.SPEEDS[profile] / 3.6)).round(1).tolist()
+        self.server.matrix_requests += 1
+        self._send(200, result)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Threading HTTP server of the OpenRouteService stub.
+    """
+
+    # concurrent geocoding and matrix requests exceed the default backlog of 5 connections
+    request_queue_size = 128
+
+    def __init__(self, address: Any, center: Tuple[float, float] = (52.02, 8.53)) -> None:
+        """
+        Initializes the StubServer.
+
+        Args:
+            address (Any): The host and port to listen on, port 0 for any free port.
+            center (Tuple[float, float]): The latitude and longitude of addresses geocoded without focus point.
+                Default is Bielefeld.
+        """
+        super().__init__(address, StubRequestHandler)
+        self.center = center
+        self.matrix_requests = 0
+
+    @property
+    def url(self) -> str:
+        """
+        The base URL of the stub, e.g. for an OrsSession.
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a local stub of the OpenRouteService API.")
+    parser.add_argument("--host", default="127.0.0.1", help="host to listen on")
+    parser.add_argument("--port", type=int, default=8081, help="port to listen on")
+    args = parser.parse_args(arguments)
+    with StubServer((args.host, args.port)) as server:
+        print(f"Serving an OpenRouteService stub on {server.url}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
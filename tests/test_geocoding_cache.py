@@ -0,0 +1,79 @@
+import pytest
+import model.GeocodingCache
+from model.Coordinates import Coordinates
+from model.GeocodingCache import GeocodingCache, MemoryGeocodingCache, SQLiteGeocodingCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(model.GeocodingCache, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    caches = list()
+
+    def make_cache(**kwargs):
+        if request.param == "memory":
+            cache = MemoryGeocodingCache(**kwargs)
+        else:
+            cache = SQLiteGeocodingCache(str(tmp_path / "geocodes.sqlite"), **kwargs)
+        caches.append(cache)
+        return cache
+
+    yield make_cache
+    for cache in caches:
+        if isinstance(cache, SQLiteGeocodingCache):
+            cache.close()
+
+
+def test_make_key_normalizes_the_address():
+    focus = Coordinates(52.02, 8.53)
+    assert GeocodingCache.make_key("  Main  Street 1,Bielefeld ", "DE", focus) == \
+        GeocodingCache.make_key("main street 1, bielefeld", "de", focus)
+    assert GeocodingCache.make_key("Main Street 1", "DE") != GeocodingCache.make_key("Main Street 1", "DE", focus)
+
+
+def test_entries_expire_after_the_ttl(make_cache, clock):
+    cache = make_cache(ttl=60, max_entries=None)
+    cache.set("a", Coordinates(1.0, 2.0))
+    clock.now += 59
+    assert cache.get("a") == Coordinates(1.0, 2.0)
+    clock.now += 2
+    assert cache.get("a") is None
+
+
+def test_least_recently_used_entries_are_evicted(make_cache, clock):
+    cache = make_cache(ttl=None, max_entries=2)
+    cache.set("a", Coordinates(1.0, 1.0))
+    clock.now += 1
+    cache.set("b", Coordinates(2.0, 2.0))
+    clock.now += 1
+    assert cache.get("a") == Coordinates(1.0, 1.0)
+    clock.now += 1
+    cache.set("c", Coordinates(3.0, 3.0))
+    assert cache.get("b") is None
+    assert cache.get("a") == Coordinates(1.0, 1.0)
+    assert cache.get("c") == Coordinates(3.0, 3.0)
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_persists(tmp_path, clock):
+    filename = str(tmp_path / "geocodes.sqlite")
+    cache = SQLiteGeocodingCache(filename)
+    cache.set("a", Coordinates(1.0, 2.0))
+    cache.close()
+    cache = SQLiteGeocodingCache(filename)
+    assert cache.get("a") == Coordinates(1.0, 2.0)
+    cache.close()
@@ -0,0 +1,34 @@
+from collections import Counter
+import pytest
+from benchmarks.instances import synthetic_instance
+from model.HeuristicSolver import HeuristicSolver
+from model.SolutionEvaluator import SolutionEvaluator
+
+
+@pytest.mark.parametrize("num_groups, num_events, after_party", [(9, 3, True), (20, 3, False), (28, 4, True)])
+def test_hosts_have_two_to_four_groups(num_groups, num_events, after_party):
+    instance = synthetic_instance(num_groups, num_events, after_party, seed=3)
+    solver = HeuristicSolver(instance, seed=0)
+    solution = solver.solve(time_limit=0.2)
+
+    # the evaluator checks that every group visits one host per event and hosts its own event
+    evaluation = SolutionEvaluator(instance).evaluate(solution)
+    assert evaluation.objective == pytest.approx(solver.objective)
+    counts = Counter(host for hosts in solution.values() for host in hosts)
+    hosts = [group for group in instance.groups if 1 <= group.host_event_id <= num_events]
+    assert all(HeuristicSolver.MIN_MEMBERS <= counts[host] <= HeuristicSolver.MAX_MEMBERS for host in hosts)
+
+
+def test_warm_start_is_not_worse_than_the_initial_solution():
+    instance = synthetic_instance(12, 3, True, seed=4)
+    solution = HeuristicSolver(instance, seed=0).solve(time_limit=0.5)
+    objective = SolutionEvaluator(instance).evaluate(solution).objective
+    warm = HeuristicSolver(instance, seed=1).solve(time_limit=0.0, initial_solution=solution)
+    assert SolutionEvaluator(instance).evaluate(warm).objective <= objective + 1e-6
+
+
+def test_too_few_hosts_are_rejected():
+    instance = synthetic_instance(12, 3, True, seed=5)
+    instance.hosts_by_events[1] = instance.hosts_by_events[1][:1]
+    with pytest.raises(ValueError):
+        HeuristicSolver(instance)
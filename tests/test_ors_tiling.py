@@ -0,0 +1,95 @@
+import threading
+import numpy as np
+import pytest
+from model.Coordinates import Coordinates
+from model.TravelTimeCache import MemoryTravelTimeCache
+from model.TravelTimeProvider import OrsTravelTimeProvider
+
+
+class Response:
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class MatrixSession:
+    """
+    Answers matrix requests like the OpenRouteService API with the travel time i + j/100
+    from location i to location j and records the requested tiles.
+    """
+
+    backoff_factor = 0.0
+
+    def __init__(self, coords, errors=0):
+        self.index = {(coordinates.lon, coordinates.lat): i for i, coordinates in enumerate(coords)}
+        self.errors = errors
+        self.tiles = list()
+        self.lock = threading.Lock()
+
+    def post(self, path, json):
+        with self.lock:
+            if self.errors:
+                self.errors -= 1
+                return Response({"error": "rate limit exceeded"})
+            locations = [self.index[tuple(location)] for location in json["locations"]]
+            sources = [locations[i] for i in json["sources"]]
+            destinations = [locations[i] for i in json["destinations"]]
+            self.tiles.append((sources, destinations))
+        return Response({"durations": [[i + j / 100 for j in destinations] for i in sources]})
+
+
+def _expected(n):
+    return np.arange(n)[:, None] + np.arange(n)[None, :] / 100
+
+
+@pytest.fixture
+def coords():
+    return [Coordinates(52.0 + i / 1000, 8.5) for i in range(25)]
+
+
+def test_matrix_is_fetched_in_tiles_below_the_element_limit(coords):
+    session = MatrixSession(coords)
+    provider = OrsTravelTimeProvider("", session=session, max_elements=100)
+    matrix = np.full((len(coords), len(coords)), np.nan, dtype=np.float32)
+    provider.fill(matrix, coords)
+    np.testing.assert_allclose(matrix, _expected(len(coords)), rtol=1e-6)
+    assert len(session.tiles) == 9
+    assert all(len(sources) * len(destinations) <= 100 for sources, destinations in session.tiles)
+
+
+def test_only_missing_rows_and_columns_are_requested(coords):
+    session = MatrixSession(coords)
+    provider = OrsTravelTimeProvider("", session=session, max_elements=100)
+    matrix = _expected(len(coords)).astype(np.float32)
+    matrix[3, 20] = matrix[20, 3] = np.nan
+    provider.fill(matrix, coords)
+    np.testing.assert_allclose(matrix, _expected(len(coords)), rtol=1e-6)
+    assert sorted(session.tiles) == [([3], [20]), ([20], [3])]
+
+
+def test_cached_cells_are_not_requested(coords):
+    cache = MemoryTravelTimeCache()
+    provider = OrsTravelTimeProvider("", session=MatrixSession(coords), cache=cache, max_elements=100)
+    provider.fill(np.full((len(coords), len(coords)), np.nan, dtype=np.float32), coords)
+
+    session = MatrixSession(coords)
+    provider = OrsTravelTimeProvider("", session=session, cache=cache, max_elements=100)
+    matrix = np.full((len(coords), len(coords)), np.nan, dtype=np.float32)
+    provider.fill(matrix, coords)
+    np.testing.assert_allclose(matrix, _expected(len(coords)), rtol=1e-6)
+    assert session.tiles == list()
+
+
+def test_erroneous_tiles_are_retried(coords):
+    session = MatrixSession(coords[:5], errors=2)
+    provider = OrsTravelTimeProvider("", session=session, max_workers=1, tile_retries=2)
+    matrix = np.full((5, 5), np.nan, dtype=np.float32)
+    provider.fill(matrix, coords[:5])
+    np.testing.assert_allclose(matrix, _expected(5), rtol=1e-6)
+
+    session = MatrixSession(coords[:5], errors=3)
+    provider = OrsTravelTimeProvider("", session=session, max_workers=1, tile_retries=2)
+    with pytest.raises(RuntimeError):
+        provider.fill(np.full((5, 5), np.nan, dtype=np.float32), coords[:5])
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from benchmarks.instances import synthetic_instance
+from model.DinnerInstance import DinnerInstance
+from model.HeuristicSolver import HeuristicSolver
+from model.SolutionEvaluator import SolutionEvaluator
+
+
+@pytest.fixture
+def instance():
+    instance = synthetic_instance(12, 3, True, seed=2)
+    instance.groups[0].transport_mode = "cycling-regular"
+    instance.travel_times.set_profile("cycling-regular", np.asarray(instance.travel_times.matrix) * 0.3)
+    return instance
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(instance, tmp_path, mmap):
+    filename = str(tmp_path / "instance.snapshot")
+    instance.save_snapshot(filename)
+    loaded = DinnerInstance.load_snapshot(filename, mmap=mmap)
+
+    assert loaded.events == instance.events
+    assert [(group.name, group.location.coordinates, group.host_event_id, group.transport_mode)
+            for group in loaded.groups] == \
+        [(group.name, group.location.coordinates, group.host_event_id, group.transport_mode)
+         for group in instance.groups]
+    assert loaded.after_party.coordinates == instance.after_party.coordinates
+    assert loaded.country_code == instance.country_code
+    assert loaded.city_address == instance.city_address
+    np.testing.assert_array_equal(loaded.travel_times.matrix, instance.travel_times.matrix)
+    np.testing.assert_array_equal(loaded.travel_times.profile("cycling-regular"),
+                                  instance.travel_times.profile("cycling-regular"))
+
+    solution = HeuristicSolver(instance, seed=0).solve(time_limit=0.1)
+    names = {group.name: group for group in loaded.groups}
+    loaded_solution = {names[group.name]: [names[host.name] for host in hosts] for group, hosts in solution.items()}
+    assert SolutionEvaluator(loaded).evaluate(loaded_solution) == SolutionEvaluator(instance).evaluate(solution)
+
+
+def test_load_rejects_other_files(tmp_path):
+    filename = tmp_path / "solution.csv"
+    filename.write_text('"Group";"Course 1"\n')
+    with pytest.raises(ValueError):
+        DinnerInstance.load_snapshot(str(filename))
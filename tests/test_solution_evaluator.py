@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from benchmarks.instances import synthetic_instance
+from model.HeuristicSolver import HeuristicSolver
+from model.SolutionEvaluator import SolutionEvaluator
+
+
+@pytest.fixture(params=[True, False], ids=["after party", "back home"])
+def evaluator(request):
+    instance = synthetic_instance(18, 3, request.param, seed=1)
+    evaluator = SolutionEvaluator(instance)
+    solution = HeuristicSolver(instance, seed=0).solve(time_limit=0.1)
+    evaluator.load(evaluator.assignment(solution))
+    return evaluator
+
+
+def _moves(evaluator, count, seed=0):
+    random = np.random.default_rng(seed)
+    for _ in range(count):
+        e = int(random.integers(1, evaluator.num_events + 1))
+        guests = np.flatnonzero(evaluator.host_event != e)
+        hosts = np.flatnonzero(evaluator.host_event == e)
+        yield e, guests, hosts, random
+
+
+def test_evaluate_matches_loaded_objective(evaluator):
+    evaluation = evaluator.evaluate(evaluator.solution())
+    assert evaluation.objective == pytest.approx(evaluator.objective)
+    assert evaluation.max_travel_times == pytest.approx(tuple(evaluator.max_legs.tolist()))
+
+
+def test_delta_move_matches_full_evaluation(evaluator):
+    for e, guests, hosts, random in _moves(evaluator, 200):
+        g, b = int(random.choice(guests)), int(random.choice(hosts))
+        before = evaluator.evaluate_assignment(evaluator.assign).objective
+        delta = evaluator.delta_move(g, e, b)
+        evaluator.move(g, e, b)
+        after = evaluator.evaluate_assignment(evaluator.assign).objective
+        assert delta == pytest.approx(after - before)
+        assert evaluator.objective == pytest.approx(after)
+
+
+def test_delta_swap_matches_full_evaluation(evaluator):
+    for e, guests, _, random in _moves(evaluator, 200, seed=1):
+        g1, g2 = random.choice(guests, 2, replace=False).tolist()
+        before = evaluator.evaluate_assignment(evaluator.assign).objective
+        delta = evaluator.delta_swap(g1, g2, e)
+        evaluator.swap(g1, g2, e)
+        after = evaluator.evaluate_assignment(evaluator.assign).objective
+        assert delta == pytest.approx(after - before)
+        assert evaluator.objective == pytest.approx(after)
+
+
+def test_assignment_rejects_incomplete_solution(evaluator):
+    solution = evaluator.solution()
+    group = evaluator.groups[0]
+    solution[group] = solution[group][:-1]
+    with pytest.raises(ValueError):
+        evaluator.assignment(solution)
@@ -0,0 +1,49 @@
+import numpy as np
+from pulp import LpConstraintEQ, LpConstraintGE, LpConstraintLE, LpProblem
+from model.SparseModel import SparseModel, ragged_arange
+
+
+def _model():
+    sparse = SparseModel()
+    x = sparse.add_columns("x", 3, upper=1, integer=True)
+    t = sparse.add_columns("t", 1)
+    # rows are given out of order to check that the entries are sorted by row
+    sparse.add_rows("ranged", 2, [1, 0, 1, 0], [x[1], x[0], t[0], x[1]], [2.0, 1.0, -1.0, 1.0], lower=1, upper=3)
+    sparse.add_rows("mixed", 3, [0, 1, 2], x, [1.0, 1.0, 1.0],
+                    lower=np.array([2.0, -np.inf, 0.0]), upper=np.array([2.0, 1.0, np.inf]))
+    return sparse, x, t
+
+
+def test_ragged_arange():
+    np.testing.assert_array_equal(ragged_arange(np.array([0, 5, 2]), np.array([2, 0, 3])), [0, 1, 2, 3, 4])
+
+
+def test_matrix_and_bounds():
+    sparse, x, t = _model()
+    assert (sparse.num_columns, sparse.num_rows, sparse.num_nonzeros) == (4, 5, 7)
+    starts, columns, coefficients = sparse.matrix()
+    np.testing.assert_array_equal(starts, [0, 2, 4, 5, 6, 7])
+    np.testing.assert_array_equal(columns, [x[0], x[1], x[1], t[0], x[0], x[1], x[2]])
+    np.testing.assert_array_equal(coefficients, [1, 1, 2, -1, 1, 1, 1])
+    lower, upper = sparse.row_bounds()
+    np.testing.assert_array_equal(lower, [1, 1, 2, -np.inf, 0])
+    np.testing.assert_array_equal(upper, [3, 3, 2, 1, np.inf])
+
+
+def test_pulp_constraints_split_ranged_rows():
+    sparse, x, t = _model()
+    prob = LpProblem()
+    variables = sparse.pulp_variables()
+    sparse.add_pulp_constraints(prob, variables)
+    constraints = {constraint.name: constraint for constraint in prob.constraints()}
+    assert sorted(constraints) == ["mixed_0", "mixed_1", "mixed_2",
+                                   "ranged_0_lower", "ranged_0_upper", "ranged_1_lower", "ranged_1_upper"]
+    for r in range(2):
+        lower, upper = constraints[f"ranged_{r}_lower"], constraints[f"ranged_{r}_upper"]
+        assert (lower.sense, -lower.constant) == (LpConstraintGE, 1)
+        assert (upper.sense, -upper.constant) == (LpConstraintLE, 3)
+        assert dict(lower) == dict(upper)
+    assert dict(constraints["ranged_1_lower"]) == {variables[x[1]]: 2.0, variables[t[0]]: -1.0}
+    assert [constraints[f"mixed_{r}"].sense for r in range(3)] == [LpConstraintEQ, LpConstraintLE, LpConstraintGE]
+    assert [-constraints[f"mixed_{r}"].constant for r in range(3)] == [2, 1, 0]
+    assert variables[x[0]].cat == "Integer" and variables[t[0]].upBound is None